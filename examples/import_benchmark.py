@@ -0,0 +1,71 @@
+"""
+Benchmark of the time needed to import trnorm and to normalize a first sentence.
+
+Each measurement runs in a fresh interpreter, as a short-lived command line
+invocation or a test worker would. The startup time of the interpreter itself
+is measured separately and subtracted.
+
+Usage:
+    python examples/import_benchmark.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Run the benchmarks against this checkout of the trnorm package
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Statements to time, each in a fresh interpreter
+BENCHMARKS = [
+    ("python startup", "pass"),
+    ("import trnorm", "import trnorm"),
+    ("from trnorm import wer", "from trnorm import wer"),
+    ("from trnorm import normalize", "from trnorm import normalize"),
+    ("first normalize()", "from trnorm import normalize; normalize('Masa 75x120cm, %25 indirimli.')"),
+    ("trnorm.warmup()", "import trnorm; trnorm.warmup()"),
+]
+
+
+def time_statement(statement, runs):
+    """
+    Time a statement in fresh interpreters.
+
+    Args:
+        statement (str): Python code to run
+        runs (int): Number of interpreters to start
+
+    Returns:
+        float: Median wall time in milliseconds
+    """
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True, env=env)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Interpreters started per statement")
+    args = parser.parse_args()
+
+    # Compile the bytecode once so that the first run is not slower than the others
+    time_statement("import trnorm; trnorm.warmup()", 1)
+
+    startup = None
+    print(f"{'Statement':<32}{'median ms':>12}{'over startup':>14}")
+    for name, statement in BENCHMARKS:
+        elapsed = time_statement(statement, args.runs)
+        if startup is None:
+            startup = elapsed
+        print(f"{name:<32}{elapsed:>12.1f}{elapsed - startup:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ We don't need duration and time for this task.
 """
 
 from pathlib import Path
-from trnorm.metrics import wer, cer, levenshtein_distance, normalized_levenshtein_distance
+from trnorm.metrics import score_pair
 from trnorm import normalize
 from trnorm.legacy_normalizer import normalize_text, replace_hatted_characters, turkish_lower
 from trnorm.dimension_utils import preprocess_dimensions, normalize_dimensions
@@ -97,9 +97,11 @@ with open(input_file, "r", encoding="utf-8") as f:
             ref = normalize(row_data["r"], normalization_functions)
             hyp = normalize(row_data["p"], normalization_functions)
 
-            our_wer = wer(ref, hyp)
-            our_cer = cer(ref, hyp)
-            our_lev_dist = normalized_levenshtein_distance(ref, hyp)
+            # One pass computes the word and character distances shared by all metrics
+            scores = score_pair(ref, hyp)
+            our_wer = scores.wer
+            our_cer = scores.cer
+            our_lev_dist = scores.normalized_levenshtein
 
             our_total_wer += our_wer
             our_total_cer += our_cer
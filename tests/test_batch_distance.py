@@ -0,0 +1,74 @@
+"""
+Tests for the NumPy batched edit distance backend.
+"""
+
+import random
+
+import pytest
+
+from trnorm import batch_distance
+from trnorm.metrics import _calculate_levenshtein, cer, levenshtein_distance, wer
+
+np = pytest.importorskip("numpy")
+
+
+def _random_strings(count, alphabet, max_length, seed):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        for _ in range(count)
+    ]
+
+
+def test_char_distances_match_python():
+    strings1 = _random_strings(500, "abcçğış İ", 30, seed=1)
+    strings2 = _random_strings(500, "abcçğış İ", 30, seed=2)
+    expected = [_calculate_levenshtein(s1, s2) for s1, s2 in zip(strings1, strings2)]
+
+    assert batch_distance.char_distances(strings1, strings2) == expected
+
+
+def test_token_distances_match_python():
+    strings1 = _random_strings(300, "ab c", 40, seed=3)
+    strings2 = _random_strings(300, "ab c", 40, seed=4)
+    tokens1 = [s.split() for s in strings1]
+    tokens2 = [s.split() for s in strings2]
+    expected = [_calculate_levenshtein(t1, t2) for t1, t2 in zip(tokens1, tokens2)]
+
+    assert batch_distance.token_distances(tokens1, tokens2) == expected
+
+
+def test_edge_cases():
+    strings1 = ["", "", "abc", "kitten", "şöğüıçİ", "😀a"]
+    strings2 = ["", "abc", "", "sitting", "soguici", "a😀"]
+
+    assert batch_distance.char_distances(strings1, strings2) == [0, 3, 3, 3, 7, 2]
+
+
+def test_buckets_larger_than_batch_size(monkeypatch):
+    monkeypatch.setattr(batch_distance, "BATCH_SIZE", 7)
+    strings1 = _random_strings(50, "abc", 12, seed=5)
+    strings2 = _random_strings(50, "abc", 12, seed=6)
+    expected = [_calculate_levenshtein(s1, s2) for s1, s2 in zip(strings1, strings2)]
+
+    assert batch_distance.char_distances(strings1, strings2) == expected
+
+
+def test_metrics_use_same_results_with_and_without_numpy(monkeypatch):
+    references = _random_strings(100, "abc de", 25, seed=7)
+    hypotheses = _random_strings(100, "abc de", 25, seed=8)
+
+    vectorized = (
+        wer(references, hypotheses),
+        cer(references, hypotheses),
+        levenshtein_distance(references, hypotheses),
+    )
+
+    monkeypatch.setattr(batch_distance, "HAS_NUMPY", False)
+    fallback = (
+        wer(references, hypotheses),
+        cer(references, hypotheses),
+        levenshtein_distance(references, hypotheses),
+    )
+
+    assert vectorized == fallback
@@ -0,0 +1,133 @@
+"""
+Unit tests for the trnorm command-line interface.
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from unittest import mock
+
+# Add the parent directory to the path to import the trnorm package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trnorm
+
+from trnorm.cli import main
+from trnorm.normalizer import normalize
+from trnorm.transformer import transform
+
+# Directory of the trnorm package under test, for the fresh interpreters
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(trnorm.__file__)))
+
+
+def run_main(argv, stdin=""):
+    """Run the command with the given arguments and return its exit status, output and errors."""
+    output = io.StringIO()
+    errors = io.StringIO()
+    stdin = io.TextIOWrapper(io.BytesIO(stdin.encode("utf-8")), encoding="utf-8")
+    with mock.patch.object(sys, "stdin", stdin), \
+            contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+        status = main(argv)
+    return status, output.getvalue(), errors.getvalue()
+
+
+class TestCli(unittest.TestCase):
+    """Test the normalize and score commands."""
+
+    TEXTS = ["Bugün 15 kişi geldi.", "Saat 14:30'da 3. kata çıktı", "", "Masa 75x120cm."]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_normalize_text(self):
+        """Test that lines from standard input are normalized in order, with and without workers."""
+        expected = "".join(normalize(text) + "\n" for text in self.TEXTS)
+        stdin = "\n".join(self.TEXTS) + "\n"
+        self.assertEqual(run_main(["normalize"], stdin), (0, expected, ""))
+        self.assertEqual(run_main(["normalize", "--workers", "2", "--batch-size", "1"], stdin)[1], expected)
+
+        status, output, errors = run_main(["normalize", "--profile"], stdin)
+        self.assertEqual(output, expected)
+        self.assertIn("normalize_ordinals", errors)
+
+    def test_normalize_tsv_and_jsonl(self):
+        """Test that only the selected column or field is replaced."""
+        rows = [("1", "II. Dünya Savaşı", "ikinci dünya savaşı"), ("2", "Bugün 15 kişi", "bugün on beş kişi")]
+        tsv = self.write("log.tsv", "id\tr\tp\n" + "".join("\t".join(row) + "\n" for row in rows))
+        status, output, _ = run_main(["normalize", "--column", "r", "--context-column", "p", tsv])
+        expected = ["id\tr\tp"] + [f"{i}\t{normalize(r, None, p)}\t{p}" for i, r, p in rows]
+        self.assertEqual(output.splitlines(), expected)
+
+        # Two files are written as one table with a single header
+        status, output, _ = run_main(["normalize", "--column", "1", tsv, tsv])
+        self.assertEqual(len(output.splitlines()), 1 + 2 * len(rows))
+
+        jsonl = self.write("log.jsonl", "".join(json.dumps({"id": i, "r": r}) + "\n" for i, r, _ in rows))
+        status, output, _ = run_main(["normalize", "--column", "r", "--pipeline", "convert_numbers,lowercase", jsonl])
+        records = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(records, [{"id": i, "r": transform(r, ["convert_numbers", "lowercase"])} for i, r, _ in rows])
+
+    def test_normalize_cache(self):
+        """Test that cached results are reused across runs."""
+        cache = os.path.join(self.directory.name, "cache.sqlite")
+        stdin = "\n".join(self.TEXTS) + "\n"
+        first = run_main(["normalize", "--cache", cache, "--profile"], stdin)
+        second = run_main(["normalize", "--cache", cache, "--profile"], stdin)
+        self.assertEqual(first[1], second[1])
+        self.assertIn(f"cache: 0 hits, {len(self.TEXTS)} misses", first[2])
+        self.assertIn(f"cache: {len(self.TEXTS)} hits, 0 misses", second[2])
+
+        # Results of other code are not reused, even with the same version number
+        with mock.patch("trnorm.cli._code_fingerprint", return_value="changed"):
+            third = run_main(["normalize", "--cache", cache, "--profile"], stdin)
+        self.assertEqual(third[1], first[1])
+        self.assertIn(f"cache: 0 hits, {len(self.TEXTS)} misses", third[2])
+
+    def test_score(self):
+        """Test that the score command prints the summary of evaluate_log."""
+        log = self.write("log.tsv", "r\tp\nBugün 15 kişi geldi.\tbugün on beş kişi geldi\nbir iki\tbir üç\n")
+        status, output, _ = run_main(["score", "--metrics", "wer", log])
+        summary = json.loads(output)
+        self.assertEqual(status, 0)
+        self.assertEqual(summary["rows"], 2)
+        self.assertEqual(summary["metrics"]["wer"]["edits"], 1)
+
+        with open(log, encoding="utf-8") as file:
+            status, output, _ = run_main(["score", "-r", "0", "-p", "1", "--no-header"], file.read())
+        self.assertEqual(json.loads(output)["rows"], 3)
+
+    def test_errors(self):
+        """Test that invalid arguments are reported."""
+        self.assertEqual(run_main(["normalize", "--pipeline", "unknown"], "a\n")[0], 1)
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main(["normalize", "--format", "tsv"])
+
+    def test_startup_imports(self):
+        """Test that running the command imports no normalization module before it is needed."""
+        env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+        code = "import sys, trnorm.cli; print(sorted(name for name in sys.modules if name.startswith('trnorm.')))"
+        result = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), "['trnorm.cli']")
+
+        result = subprocess.run([sys.executable, "-m", "trnorm", "normalize"], env=env, input="Bugün 15 kişi\n",
+                                check=True, capture_output=True, text=True, encoding="utf-8")
+        self.assertEqual(result.stdout, "bugün on beş kişi\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
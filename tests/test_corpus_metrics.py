@@ -0,0 +1,84 @@
+"""
+Tests for the corpus_metrics module in trnorm package.
+"""
+
+import pytest
+
+from trnorm.corpus_metrics import _make_shards, score_corpus
+from trnorm.metrics import cer, levenshtein_distance, wer
+
+REFERENCES = [
+    "bu bir test cümlesidir",
+    "otomatik konuşma tanıma",
+    "",
+    "Kafkas göçmenleriyse günlük tartışmalardan uzak.",
+    "kısa",
+    "this is a test " * 20,
+]
+
+HYPOTHESES = [
+    "bu bir test cümlesi",
+    "otomotik konuşma tanımla",
+    "boş referans",
+    "Kafkas göçmenleri ise günlük tartışmalardan uzak.",
+    "",
+    "this is test " * 20,
+]
+
+
+def test_per_utterance_matches_metrics():
+    scores = score_corpus(REFERENCES, HYPOTHESES, metrics=["wer", "cer", "levenshtein"])
+
+    assert scores["wer"].rates == wer(REFERENCES, HYPOTHESES)
+    assert scores["cer"].rates == cer(REFERENCES, HYPOTHESES)
+    assert list(scores["levenshtein"].edits) == levenshtein_distance(REFERENCES, HYPOTHESES)
+    assert list(scores["cer"].lengths) == [len(ref) for ref in REFERENCES]
+    assert list(scores["wer"].lengths) == [len(ref.split()) for ref in REFERENCES]
+
+
+def test_corpus_totals():
+    scores = score_corpus(["bu bir test", "merhaba dünya"], ["bu test", "merhaba dünya"], metrics=["wer"])
+    totals = scores.totals()["wer"]
+
+    assert totals["edits"] == 1
+    assert totals["length"] == 5
+    assert totals["rate"] == 0.2
+    assert scores["wer"].corpus_rate == 0.2
+
+
+def test_parallel_matches_serial():
+    refs = REFERENCES * 5
+    hyps = HYPOTHESES * 5
+
+    serial = score_corpus(refs, hyps, metrics=["wer", "cer"], workers=1)
+    parallel = score_corpus(refs, hyps, metrics=["wer", "cer"], workers=2)
+
+    for name in ("wer", "cer"):
+        assert list(parallel[name].edits) == list(serial[name].edits)
+        assert list(parallel[name].lengths) == list(serial[name].lengths)
+    assert parallel.totals() == serial.totals()
+
+
+def test_shards_are_balanced_by_cost():
+    costs = [100, 1, 1, 1, 50, 50, 1, 1]
+    shards = _make_shards(costs, 2)
+
+    assert sorted(i for shard in shards for i in shard) == list(range(len(costs)))
+    # The most expensive pair is alone with the cheap ones, the two mid-sized pairs share a shard
+    assert shards[0][0] == 0
+    assert sorted(shards[1][:2]) == [4, 5]
+
+
+def test_empty_corpus():
+    scores = score_corpus([], [], metrics=["wer"])
+
+    assert len(scores) == 0
+    assert scores["wer"].corpus_rate == 1.0
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        score_corpus(["a"], [], metrics=["wer"])
+
+    with pytest.raises(ValueError):
+        score_corpus(["a"], ["b"], metrics=["bleu"])
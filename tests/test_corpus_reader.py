@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path to allow imports from parent directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from trnorm.corpus_reader import (
+    MappedCorpus,
+    _scan_offsets,
+    normalize_mapped_corpus,
+    read_shard,
+    score_mapped_corpus,
+)
+from trnorm.evaluate import evaluate_log
+from trnorm.normalizer import normalize
+
+ROWS = [
+    ("0.5", "Bugün 15 kişi geldi.", "bugün on beş kişi geldi", "1.2"),
+    ("0.0", "II. Dünya Savaşı", "ikinci dünya savaşı", "0.8"),
+    ("1.0", "Saat 14:30'da geldi", "saat on dört otuzda", "2.0"),
+    ("0.3", "Masa 75x120cm.", "masa yetmiş beş çarpı yüz yirmi santimetre", "0.4"),
+]
+
+
+def expected_row(line):
+    """Get the r and p columns of a line, or None if it does not have them."""
+    fields = line.split("\t")
+    return (fields[1], fields[2]) if len(fields) > 2 else None
+
+
+class TestCorpusReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "log.tsv")
+        lines = ["wer\tr\tp\tdur"]
+        for i in range(50):
+            lines.append("\t".join(ROWS[i % len(ROWS)]))
+            if i % 13 == 5:
+                lines.append("")
+            if i % 17 == 3:
+                lines.append("eksik satır")
+        with open(self.path, "w", encoding="utf-8", newline="") as file:
+            file.write("\r\n".join(lines) + "\r\n")
+        # Blank lines are ignored, lines without the columns read as None
+        self.lines = lines[1:]
+        self.expected = [expected_row(line) for line in self.lines if line]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_scan_offsets(self):
+        """Test the sparse index against a direct scan of the line starts."""
+        data = b"a\n\nbc\nd\te\nf"
+        starts = [0, 2, 3, 6, 10]
+        for stride in (1, 2, 3, 10):
+            for chunk_size in (1, 4, 100):
+                offsets, lines = _scan_offsets(data, 0, stride, chunk_size)
+                self.assertEqual(lines, len(starts))
+                self.assertEqual(list(offsets), starts[::stride] + [len(data)])
+        self.assertEqual(_scan_offsets(data + b"\n", 0, 2)[1], len(starts))
+        self.assertEqual(list(_scan_offsets(b"", 0, 2)[0]), [0])
+
+    def test_rows_and_shards(self):
+        """Test that rows, random access and shards read the same lines."""
+        with MappedCorpus(self.path, columns=("r", "p"), stride=4) as corpus:
+            self.assertEqual(list(corpus.rows()), self.expected)
+            self.assertEqual(len(corpus), len(self.lines))
+            self.assertEqual(corpus[1], self.expected[1])
+            self.assertEqual(corpus[-1], self.expected[-1])
+            self.assertEqual(list(corpus.rows(10, 20)), [expected_row(line) for line in self.lines[10:20] if line])
+            for n_shards in (1, 3, 7, 100):
+                shards = corpus.shards(n_shards)
+                self.assertLessEqual(len(shards), n_shards)
+                self.assertEqual(sum(shard.lines for shard in shards), len(corpus))
+                self.assertEqual([row for shard in shards for row in read_shard(shard)], self.expected)
+            # Lines of a shard are decoded like the lines of the same range
+            shard = corpus.shards(3)[1]
+            self.assertEqual(list(read_shard(shard)), list(corpus.rows(shard.first_line,
+                                                                       shard.first_line + shard.lines)))
+
+        with MappedCorpus(self.path, columns=(3,), header=False) as corpus:
+            self.assertEqual(next(corpus.rows()), ("dur",))
+        with self.assertRaises(ValueError):
+            MappedCorpus(self.path, columns=("ref",))
+
+    def test_index_sidecar(self):
+        """Test that the index is persisted, reused and rebuilt when the corpus changes."""
+        index_path = self.path + ".idx"
+        with MappedCorpus(self.path, stride=8) as corpus:
+            lines = len(corpus)
+        self.assertTrue(os.path.exists(index_path))
+        # The stride of the saved index is used
+        with MappedCorpus(self.path, stride=2) as corpus:
+            self.assertEqual(corpus.stride, 8)
+            self.assertEqual(len(corpus), lines)
+
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("0.1\tbir\tiki\t0.5\n")
+        with MappedCorpus(self.path, stride=2) as corpus:
+            self.assertEqual(corpus.stride, 2)
+            self.assertEqual(len(corpus), lines + 1)
+            self.assertEqual(list(corpus.rows())[-1], ("bir", "iki"))
+
+    def test_normalize_and_score(self):
+        """Test batch normalization and scoring against evaluate_log."""
+        with MappedCorpus(self.path, stride=4) as corpus:
+            expected = [None if row is None else normalize(row[0], None, row[1]) for row in self.expected]
+            self.assertEqual(list(normalize_mapped_corpus(corpus)), expected)
+            self.assertEqual(list(normalize_mapped_corpus(corpus, workers=2, shards_per_worker=3)), expected)
+
+            reference = evaluate_log(self.path, metrics=("wer", "cer"))
+            for workers in (1, 2):
+                summary = score_mapped_corpus(corpus, workers=workers)
+                self.assertEqual((summary.rows, summary.skipped), (reference.rows, reference.skipped))
+                for name in ("wer", "cer"):
+                    self.assertEqual(summary.metrics[name]["edits"], reference.metrics[name]["edits"])
+                    self.assertEqual(summary.metrics[name]["length"], reference.metrics[name]["length"])
+                    self.assertAlmostEqual(summary.metrics[name]["mean"], reference.metrics[name]["mean"])
+
+
+if __name__ == "__main__":
+    unittest.main()
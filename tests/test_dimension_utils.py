@@ -10,7 +10,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from trnorm.dimension_utils import preprocess_dimensions, normalize_dimensions
-from trnorm.unit_utils import normalize_units
+from trnorm import unit_utils
+from trnorm.unit_utils import add_unit_translation, get_unit_patterns, longest_match_pattern, normalize_units
 from trnorm.num_to_text import convert_numbers_to_words_wrapper
 from trnorm.legacy_normalizer import turkish_lower
 from trnorm import normalize
@@ -167,6 +168,49 @@ class TestDimensionUtils(unittest.TestCase):
                 result = normalize(input_text, converters)
                 self.assertEqual(result, expected_output)
 
+    def test_longest_match_pattern(self):
+        """Test that the unit trie prefers the longest unit."""
+        import re
+        pattern = re.compile(longest_match_pattern(["m", "km", "km/h", "kg", "mm3", "mm"]))
+        for text, expected in [("km/h", "km/h"), ("km/s", "km"), ("kg", "kg"), ("mm3", "mm3"), ("mm", "mm"), ("m", "m")]:
+            self.assertEqual(pattern.match(text).group(), expected)
+        self.assertIsNone(pattern.match("k"))
+        self.assertIsNone(re.match(longest_match_pattern([]), "m"))
+
+    def test_unit_patterns_follow_translations(self):
+        """Test that unit patterns are compiled once per snapshot of the translations."""
+        saved = unit_utils.unit_registry._snapshot
+        try:
+            patterns = get_unit_patterns()
+            self.assertIs(get_unit_patterns(), patterns)
+            self.assertEqual(preprocess_dimensions("5nm"), "5nm")
+
+            add_unit_translation("nm", "nanometre")
+            self.assertIsNot(get_unit_patterns(), patterns)
+            self.assertEqual(preprocess_dimensions("5nm"), "5 nm")
+            self.assertEqual(normalize_units("5nm"), "5 nanometre")
+            self.assertEqual(normalize_dimensions("2x3nm"), "2 çarpı 3 nm")
+        finally:
+            unit_utils.unit_registry._snapshot = saved
+
+    def test_dimension_chains(self):
+        """Test chains parsed in a single pass, with or without preprocessing."""
+        test_cases = [
+            ("2x5x6x3", "2 çarpı 5 çarpı 6 çarpı 3"),
+            ("1.5 x 2.25x3cm", "1.5 çarpı 2.25 çarpı 3 cm"),
+            ("5cm x 10cm x 2 cm", "5 cm çarpı 10 cm çarpı 2 cm"),
+            ("5mm3x4", "5 mm3 çarpı 4"),
+            ("2 x3 ve 4x 5", "2 x3 ve 4x 5"),
+            ("x 3 x", "x 3 x"),
+        ]
+        for input_text, expected_output in test_cases:
+            with self.subTest(input_text=input_text):
+                self.assertEqual(normalize_dimensions(input_text), expected_output)
+                self.assertEqual(normalize_dimensions(preprocess_dimensions(input_text)), expected_output)
+
+        chain = "x".join(["12"] * 2000)
+        self.assertEqual(normalize_dimensions(chain), " çarpı ".join(["12"] * 2000))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for the error_analysis module in trnorm package.
+"""
+
+import pickle
+
+import pytest
+
+from trnorm.error_analysis import ErrorAnalyzer, SpaceSavingCounter
+from trnorm.metrics import align, levenshtein_distance
+from trnorm.text_utils import turkish_lower
+
+
+def test_align():
+    assert align("bu bir test".split(), "bu test".split()) == [
+        ("match", "bu", "bu"),
+        ("deletion", "bir", None),
+        ("match", "test", "test"),
+    ]
+    assert align("", "ab") == [("insertion", None, "a"), ("insertion", None, "b")]
+    assert align([], []) == []
+
+    for s1, s2 in [("kitten", "sitting"), ("sunday", "saturday"), ("şöğüıçİ", "soguici")]:
+        errors = [op for op, _, _ in align(s1, s2) if op != "match"]
+        assert len(errors) == levenshtein_distance(s1, s2)
+
+
+def test_space_saving_exact_below_capacity():
+    counter = SpaceSavingCounter(capacity=10)
+    words = "a b a c a b d".split()
+    for word in words:
+        counter.update(word)
+
+    assert counter.most_common(2) == [("a", 3), ("b", 2)]
+    assert counter.total == len(words)
+    assert counter.error("a") == 0
+
+
+def test_space_saving_bounded_and_keeps_heavy_hitters():
+    counter = SpaceSavingCounter(capacity=5)
+    stream = ["heavy"] * 50 + [f"rare{i}" for i in range(100)] + ["heavy"] * 50 + ["second"] * 30
+
+    for key in stream:
+        counter.update(key)
+
+    assert len(counter) == 5
+    top = counter.most_common(2)
+    assert top[0][0] == "heavy"
+    assert top[0][1] >= 100
+    assert top[1][0] == "second"
+    # Counts never underestimate, and the error bounds the overestimation
+    assert counter.count("heavy") - counter.error("heavy") <= 100 <= counter.count("heavy")
+
+
+def test_space_saving_merge():
+    left = SpaceSavingCounter(capacity=10)
+    right = SpaceSavingCounter(capacity=10)
+    for key in "a a b c".split():
+        left.update(key)
+    for key in "a b b d".split():
+        right.update(key)
+
+    left.merge(right)
+
+    assert dict(left.most_common()) == {"a": 3, "b": 3, "c": 1, "d": 1}
+    assert left.total == 8
+
+
+def test_error_analyzer():
+    analyzer = ErrorAnalyzer()
+    analyzer.update_many(
+        ["bu bir test cümlesidir", "merhaba dünya", "bir iki üç"],
+        ["bu bi test cümlesi", "merhaba", "bir iki üç dört"],
+    )
+
+    report = analyzer.report(k=5)
+    assert report["utterances"] == 3
+    assert report["operations"] == {"match": 6, "substitution": 2, "deletion": 1, "insertion": 1}
+    assert dict(report["substitutions"]) == {("bir", "bi"): 1, ("cümlesidir", "cümlesi"): 1}
+    assert report["deletions"] == [("dünya", 1)]
+    assert report["insertions"] == [("dört", 1)]
+    assert analyzer.confusion_matrix()["r"][""] == 2
+
+
+def test_error_analyzer_merge_matches_single_pass():
+    references = ["bu bir test", "merhaba dünya", "bir iki üç", "bu bir test"]
+    hypotheses = ["bu bi test", "merhaba", "bir iki üç dört", "bu bi test"]
+
+    single = ErrorAnalyzer()
+    single.update_many(references, hypotheses)
+
+    first = ErrorAnalyzer()
+    first.update_many(references[:2], hypotheses[:2])
+    second = ErrorAnalyzer()
+    second.update_many(references[2:], hypotheses[2:])
+    # Analyzers can be sent between worker processes
+    merged = pickle.loads(pickle.dumps(first)).merge(pickle.loads(pickle.dumps(second)))
+
+    assert merged.report() == single.report()
+
+
+def test_error_analyzer_normalizer():
+    analyzer = ErrorAnalyzer(normalizer=turkish_lower)
+    analyzer.update("İstanbul ANKARA", "istanbul ankra")
+
+    assert analyzer.operations["match"] == 1
+    assert analyzer.substitutions.most_common() == [(("ankara", "ankra"), 1)]
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        SpaceSavingCounter(capacity=0)
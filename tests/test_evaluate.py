@@ -0,0 +1,211 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from unittest import mock
+
+# Add parent directory to path to allow imports from parent directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from trnorm.corpus_metrics import score_corpus
+from trnorm.evaluate import (
+    ColumnMapping,
+    LogReader,
+    _iter_json_array,
+    _RowWriter,
+    evaluate_log,
+)
+from trnorm.normalizer import normalize
+
+PAIRS = [
+    ("Masa 75x120cm.", "masa 75 çarpı 120 santimetre"),
+    ("Saat 14:30'da geldi", "saat on dört otuzda geldi"),
+    ("II. Dünya Savaşı", "ikinci dünya savaşı"),
+    ('Ali "geldi"', "ali geldi mi"),
+    ("", "boş referans"),
+]
+
+
+class TestEvaluate(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_tsv(self, name, rows, header="id\tr\tp"):
+        path = self.path(name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(header + "\n")
+            for row in rows:
+                file.write("\t".join(row) + "\n")
+        return path
+
+    def test_read_formats(self):
+        """Test that TSV, JSON and JSON lines logs give the same rows."""
+        tsv = self.write_tsv("log.tsv", [(str(i), r, p) for i, (r, p) in enumerate(PAIRS)])
+        records = [{"id": i, "r": r, "p": p} for i, (r, p) in enumerate(PAIRS)]
+        json_path = self.path("log.json")
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(records, file, ensure_ascii=False, indent=1)
+        jsonl_path = self.path("log.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+        columns = ColumnMapping(id="id")
+        expected = [(str(i), r, p) for i, (r, p) in enumerate(PAIRS)]
+        for path in (tsv, json_path, jsonl_path):
+            rows = list(LogReader(path, columns=columns))
+            self.assertEqual([(row.id, row.reference, row.hypothesis) for row in rows], expected, path)
+            self.assertEqual([row.line for row in rows], list(range(1, len(PAIRS) + 1)))
+
+    def test_column_mapping_and_skipped_rows(self):
+        """Test columns given by position and rows missing a column."""
+        path = self.path("log.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("0.1\tbir\tiki\n0.2\tüç\n\n0.3\tdört\tbeş\n")
+        reader = LogReader(path, columns=ColumnMapping(1, 2), header=False)
+        self.assertEqual([(row.line, row.reference) for row in reader], [(1, "bir"), (3, "dört")])
+        self.assertEqual(reader.skipped, 1)
+
+        with self.assertRaises(ValueError):
+            LogReader(path, header=False)
+        with self.assertRaises(ValueError):
+            list(LogReader(self.write_tsv("other.tsv", [], header="ref\thyp")))
+
+        jsonl_path = self.path("log.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as file:
+            file.write('{"r": "a", "p": "b"}\n{"r": "a"}\nnot json\n["x", "y"]\n')
+        reader = LogReader(jsonl_path)
+        self.assertEqual(len(list(reader)), 1)
+        self.assertEqual(reader.skipped, 3)
+
+    def test_json_array_streaming(self):
+        """Test that JSON arrays are parsed correctly across chunk boundaries."""
+        items = [{"r": "ağaç " * i, "p": i} for i in range(50)] + [12345, [1.5e3, None], "son"]
+        text = json.dumps(items, ensure_ascii=False, indent=2)
+        data = text.encode("utf-8")
+        for chunk_size in (1, 3, 7, 1000):
+            parsed = list(_iter_json_array(io.StringIO(text), chunk_size))
+            self.assertEqual([item for item, _ in parsed], items)
+            # Offsets are the byte offsets of the item ends, from which the array can be resumed
+            for _, end in parsed:
+                self.assertIn(data[end - 1:end], b'}]0123456789"elsn')
+            end = parsed[10][1]
+            resumed = _iter_json_array(io.StringIO(data[end:].decode("utf-8")), chunk_size, offset=end, resume=True)
+            self.assertEqual(list(resumed), parsed[11:])
+        self.assertEqual(list(_iter_json_array(io.StringIO(" [ ] "), 2)), [])
+        for invalid in ("{}", "[1, 2", "[1 2]", "[1,]"):
+            with self.assertRaises(ValueError):
+                list(_iter_json_array(io.StringIO(invalid), 2))
+
+    def test_evaluate_log(self):
+        """Test scores and per-row output against normalizing and scoring the corpus directly."""
+        path = self.write_tsv("log.tsv", [(str(i), r, p) for i, (r, p) in enumerate(PAIRS)])
+        output = self.path("rows.tsv")
+        summary_output = self.path("summary.json")
+        summary = evaluate_log(path, output, summary_output, columns=ColumnMapping(id="id"),
+                               metrics=("wer", "cer", "levenshtein"), batch_size=2)
+
+        references = [normalize(r, None, p) for r, p in PAIRS]
+        hypotheses = [normalize(p, None, r) for r, p in PAIRS]
+        expected = score_corpus(references, hypotheses, ("wer", "cer", "levenshtein"))
+        self.assertEqual(summary.rows, len(PAIRS))
+        self.assertEqual(summary.skipped, 0)
+        for name in ("wer", "cer", "levenshtein"):
+            totals = expected.totals()[name]
+            self.assertEqual(summary.metrics[name]["edits"], totals["edits"])
+            self.assertEqual(summary.metrics[name]["length"], totals["length"])
+            self.assertAlmostEqual(summary.metrics[name]["rate"], totals["rate"])
+            self.assertAlmostEqual(summary.metrics[name]["mean"],
+                                   sum(expected[name].rates) / len(PAIRS))
+
+        with open(output, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual(len(lines), len(PAIRS) + 1)
+        fields = lines[0].split("\t")
+        self.assertEqual(fields[:6], ["line", "id", "reference", "hypothesis",
+                                      "normalized_reference", "normalized_hypothesis"])
+        first = dict(zip(fields, lines[1].split("\t")))
+        self.assertEqual(first["normalized_reference"], references[0])
+        self.assertEqual(first["wer_edits"], str(expected["wer"].edits[0]))
+
+        with open(summary_output, encoding="utf-8") as file:
+            written = json.load(file)
+        self.assertTrue(written["complete"])
+        self.assertEqual(written["rows"], len(PAIRS))
+        self.assertEqual(written["metrics"], json.loads(json.dumps(summary.metrics)))
+
+    def test_jsonl_output_and_workers(self):
+        """Test JSON lines output and that worker processes give the same results."""
+        path = self.write_tsv("log.tsv", [(str(i), r, p) for i, (r, p) in enumerate(PAIRS * 5)])
+        single_output = self.path("single.jsonl")
+        parallel_output = self.path("parallel.jsonl")
+        single = evaluate_log(path, single_output, context_aware=False, batch_size=3)
+        parallel = evaluate_log(path, parallel_output, context_aware=False, batch_size=3, workers=2)
+        self.assertEqual(single, parallel)
+        with open(single_output, encoding="utf-8") as a, open(parallel_output, encoding="utf-8") as b:
+            self.assertEqual(a.read(), b.read())
+        with open(single_output, encoding="utf-8") as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(len(rows), len(PAIRS) * 5)
+        self.assertEqual(rows[3]["reference"], PAIRS[3][0])
+
+        with self.assertRaises(ValueError):
+            evaluate_log(path, metrics=("bleu",))
+        with self.assertRaises(ValueError):
+            evaluate_log(path, batch_size=0)
+
+    def test_checkpoint_resume(self):
+        """Test that a job interrupted after a checkpoint resumes to the same results."""
+        pairs = [(f"{i}. satır {i * 7} kişi", f"{i}. satır {i * 7} kişiler") for i in range(23)]
+        records = [{"r": r, "p": p} for r, p in pairs]
+        records[5] = {"r": "eksik"}
+        tsv = self.write_tsv("log.tsv", [(str(i), r["r"], r.get("p", "")) for i, r in enumerate(records)])
+        json_path = self.path("log.json")
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(records, file, ensure_ascii=False, indent=1)
+
+        for path, output_name in ((tsv, "rows.tsv"), (json_path, "rows.jsonl")):
+            with self.subTest(path=path):
+                expected_output = self.path("expected_" + output_name)
+                expected = evaluate_log(path, expected_output, batch_size=4)
+                output = self.path(output_name)
+                checkpoint = self.path("checkpoint.json")
+                original_flush = _RowWriter.flush
+                flushes = []
+
+                def crashing_flush(writer, flushes=flushes, original_flush=original_flush):
+                    flushes.append(writer)
+                    if len(flushes) == 4:
+                        raise RuntimeError("crash")
+                    return original_flush(writer)
+
+                with mock.patch.object(_RowWriter, "flush", crashing_flush), self.assertRaises(RuntimeError):
+                    evaluate_log(path, output, batch_size=3, workers=2, checkpoint=checkpoint, checkpoint_interval=0)
+                with open(checkpoint, encoding="utf-8") as file:
+                    state = json.load(file)
+                self.assertFalse(state["complete"])
+                self.assertEqual(state["rows"], 9)
+
+                summary_output = self.path("summary.json")
+                resumed = evaluate_log(path, output, summary_output, batch_size=5, checkpoint=checkpoint,
+                                       checkpoint_interval=0)
+                self.assertEqual(resumed, expected)
+                with open(output, encoding="utf-8") as a, open(expected_output, encoding="utf-8") as b:
+                    self.assertEqual(a.read(), b.read())
+
+                # A completed job is not evaluated again
+                self.assertEqual(evaluate_log(path, output, checkpoint=checkpoint), expected)
+                with self.assertRaises(ValueError):
+                    evaluate_log(path, output, metrics=("wer",), checkpoint=checkpoint)
+                os.remove(checkpoint)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests for the vowel harmony exception lexicon.
+"""
+
+import unittest
+
+from trnorm import istisnalar
+from trnorm.istisnalar import (
+    add_exceptions,
+    all_exceptions,
+    get_exception,
+    get_exceptions,
+    is_exception,
+    load_exceptions,
+    suffix_tuple,
+)
+from trnorm.test_strings import istisnalar_test_words
+from trnorm.text_utils import ekle
+
+
+class TestIstisnalar(unittest.TestCase):
+    """Test cases for the istisnalar module."""
+
+    def setUp(self):
+        # Runtime additions must not leak into other tests
+        istisnalar._ensure_loaded()
+        self._saved_lexicon = istisnalar._lexicon
+
+    def tearDown(self):
+        istisnalar._lexicon = self._saved_lexicon
+
+    def test_packaged_lexicon(self):
+        """Test lookups in the packaged lexicon."""
+        self.assertEqual(get_exception("alkol"), suffix_tuple)
+        self.assertEqual(get_exception("ALKOL"), suffix_tuple)
+        self.assertEqual(get_exception("Gol"), suffix_tuple)
+        self.assertIsNone(get_exception("kalem"))
+        self.assertTrue(is_exception("rol"))
+        self.assertFalse(is_exception("yol"))
+        self.assertEqual(len(all_exceptions()), 200)
+
+    def test_compatibility_mapping(self):
+        """Test that the old module-level dictionary is still available."""
+        self.assertEqual(istisnalar.ek_istisnalar_unlu_uyumu, all_exceptions())
+        self.assertEqual(istisnalar.ek_istisnalar_unlu_uyumu["alkol"], suffix_tuple)
+        self.assertFalse(hasattr(istisnalar, "missing_attribute"))
+
+    def test_bulk_lookup(self):
+        """Test looking up many words at once."""
+        self.assertEqual(
+            get_exceptions(["Alkol", "kalem", "gol", "yol"]),
+            {"Alkol": suffix_tuple, "gol": suffix_tuple},
+        )
+        self.assertEqual(get_exceptions([]), {})
+
+    def test_add_exceptions(self):
+        """Test adding domain-specific words at runtime."""
+        self.assertEqual(ekle("Glikozamidal", "ile"), "Glikozamidalla")
+        add_exceptions(["Glikozamidal", "nöral"])
+        self.assertEqual(ekle("Glikozamidal", "ile"), "Glikozamidalle")
+        self.assertEqual(ekle("Glikozamidal", "ise"), "Glikozamidalse")
+        self.assertTrue(is_exception("nöral"))
+
+        # A single word and custom endings
+        add_exceptions("kalp", ("le", "se"))
+        self.assertEqual(ekle("kalp", "ile"), "kalple")
+        add_exceptions("kalp", ("la", "sa"))
+        self.assertEqual(get_exception("kalp"), ("la", "sa"))
+        self.assertEqual(ekle("kalp", "ise"), "kalpsa")
+
+        with self.assertRaises(ValueError):
+            add_exceptions(["kalp"], ("le",))
+
+        # Packaged words are still there
+        for kelime, beklenen in istisnalar_test_words.items():
+            self.assertEqual(ekle(kelime, "ile"), beklenen[0])
+
+    def test_load_exceptions(self):
+        """Test loading a lexicon file."""
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lexicon.tsv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# Medical loanwords\n\nİntrakranial\nkardiyovasküler\tle\tse\n")
+            load_exceptions(path)
+            self.assertEqual(get_exception("intrakranial"), suffix_tuple)
+            self.assertEqual(get_exception("kardiyovasküler"), ("le", "se"))
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("kelime\tle\n")
+            with self.assertRaises(ValueError):
+                load_exceptions(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Unit tests for the lazy loading of the trnorm submodules.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+# Add the parent directory to the path to import the trnorm package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trnorm
+
+# Directory of the trnorm package under test, for the fresh interpreters
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(trnorm.__file__)))
+
+
+def run_python(code):
+    """Run code in a fresh interpreter and return its output."""
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    result = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test the lazy loading of the trnorm submodules."""
+
+    def test_import_loads_no_submodules(self):
+        """Test that importing trnorm imports none of its submodules."""
+        output = run_python(
+            "import sys, trnorm\n"
+            "print(sorted(name for name in sys.modules if name.startswith('trnorm.')))"
+        )
+        self.assertEqual(output, "[]")
+
+    def test_name_loads_its_submodule(self):
+        """Test that a public name only imports the submodules it needs."""
+        output = run_python(
+            "import sys\n"
+            "from trnorm import roman_to_arabic\n"
+            "print(roman_to_arabic('XIV'), 'trnorm.symbols' in sys.modules, 'trnorm.metrics' in sys.modules)"
+        )
+        self.assertEqual(output, "14 False False")
+
+    def test_public_names(self):
+        """Test that every public name resolves to the object of its submodule."""
+        from trnorm import legacy_normalizer, symbols, text_utils
+
+        for name in trnorm.__all__:
+            with self.subTest(name=name):
+                self.assertIsNotNone(getattr(trnorm, name))
+                self.assertIn(name, dir(trnorm))
+        self.assertIs(trnorm.legacy_turkish_lower, legacy_normalizer.turkish_lower)
+        self.assertIs(trnorm.turkish_lower, text_utils.turkish_lower)
+        self.assertIs(trnorm.default_converter, symbols.get_default_converter())
+        self.assertEqual(trnorm.unit_utils.__name__, "trnorm.unit_utils")
+        self.assertFalse(hasattr(trnorm, "does_not_exist"))
+
+    def test_patterns_compiled_on_access(self):
+        """Test that module-level patterns are compiled when they are first accessed."""
+        from trnorm import ordinals, roman_numerals
+
+        self.assertEqual(roman_numerals.ROMAN_PATTERN.match("XIV").group(), "XIV")
+        self.assertIs(roman_numerals.ROMAN_ORDINAL_PATTERN, roman_numerals.ROMAN_ORDINAL_PATTERN)
+        self.assertIsNotNone(ordinals.bullet_point_pattern.match("1. Madde"))
+        self.assertFalse(hasattr(ordinals, "missing_pattern"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,19 @@
 Tests for the metrics module in trnorm package.
 """
 
+import copy
+import pickle
+
 import pytest
-from trnorm.metrics import wer, cer, levenshtein_distance
+
+from trnorm.metrics import (
+    cer,
+    levenshtein_distance,
+    normalized_levenshtein_distance,
+    score_pair,
+    score_pairs,
+    wer,
+)
 
 
 def test_levenshtein_distance_strings():
@@ -61,4 +72,39 @@ def test_turkish_examples():
     assert levenshtein_distance("şöğüıçİ", "soguici") == 7  # Each Turkish character is different from its ASCII counterpart
 
     assert wer("Kafkas göçmenleriyse günlük tartışmalardan uzak.", "Kafkas göçmenleri ise günlük tartışmalardan uzak.") == 0.4
-    assert cer("Kafkas göçmenleriyse günlük tartışmalardan uzak.", "Kafkas göçmenleri ise günlük tartışmalardan uzak.") == 0.041666666666666664
\ No newline at end of file
+    assert cer("Kafkas göçmenleriyse günlük tartışmalardan uzak.", "Kafkas göçmenleri ise günlük tartışmalardan uzak.") == 0.041666666666666664
+
+
+def test_score_pair():
+    pairs = [
+        ("this is a test", "this is test"),
+        ("", "this is a test"),
+        ("this is a test", ""),
+        ("", ""),
+        ("otomatik konuşma tanıma", "otomotik konuşma tanımla"),
+        ("Kafkas göçmenleriyse günlük tartışmalardan uzak.", "Kafkas göçmenleri ise günlük tartışmalardan uzak."),
+    ]
+
+    for ref, hyp in pairs:
+        scores = score_pair(ref, hyp)
+        assert scores.wer == wer(ref, hyp)
+        assert scores.cer == cer(ref, hyp)
+        assert scores.levenshtein == levenshtein_distance(ref, hyp)
+        assert scores.normalized_levenshtein == normalized_levenshtein_distance(ref, hyp)
+
+    refs = [ref for ref, _ in pairs]
+    hyps = [hyp for _, hyp in pairs]
+    assert score_pairs(refs, hyps) == [score_pair(ref, hyp) for ref, hyp in pairs]
+
+    with pytest.raises(ValueError):
+        score_pairs(["a"], [])
+
+    with pytest.raises(TypeError):
+        score_pair("a", ["a"])
+
+
+def test_score_pair_copy_and_pickle():
+    scores = score_pair("a b", "a c")
+    for restored in (pickle.loads(pickle.dumps(scores)), copy.copy(scores), copy.deepcopy(scores)):
+        assert restored == scores
+        assert restored.wer == scores.wer
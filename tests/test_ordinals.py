@@ -4,7 +4,13 @@ import os
 
 # Add parent directory to path to allow imports from parent directory
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from trnorm.ordinals import normalize_ordinals
+from trnorm.ordinals import (
+    ORDINAL_TABLE_SIZE,
+    normalize_ordinals,
+    num_to_text,
+    num_to_text_many,
+)
+
 
 class TestOrdinalNormalization(unittest.TestCase):
     def test_basic_ordinals(self):
@@ -95,5 +101,37 @@ class TestOrdinalNormalization(unittest.TestCase):
         for input_text, expected_output in test_cases.items():
             self.assertEqual(normalize_ordinals(input_text), expected_output)
 
+    def test_combined_forms(self):
+        """Test lines where several ordinal forms interact, as with the former sequential passes."""
+        test_cases = {
+            "1. 2. 3. ve 4. Madde": "birinci ikinci üçüncü ve dördüncü Madde",
+            "Sonuç: 3. Ali geldi": "Sonuç: üçüncü Ali geldi",
+            "5inci\t3.": "5inciüçüncü",
+            "Başlık\n1. Madde\nbu 2. madde": "Başlık\n1. Madde\nbu ikinci madde",
+            "bu 3. II. Dünya Savaşı": "bu üçüncü II. Dünya Savaşı",
+            "ordinal yok": "ordinal yok",
+        }
+        for input_text, expected_output in test_cases.items():
+            self.assertEqual(normalize_ordinals(input_text), expected_output)
+
+        roman_cases = {
+            "bu 3. II. Dünya Savaşı": "bu üçüncü ikinci Dünya Savaşı",
+            "II. V. Karl": "ikinci V. Karl",
+            "XIV. 2. 3. sıra": "on dördüncü ikinci üçüncü sıra",
+        }
+        for input_text, expected_output in roman_cases.items():
+            self.assertEqual(normalize_ordinals(input_text, convert_roman_ordinals=True), expected_output)
+
+    def test_num_to_text_table(self):
+        """Test that table lookups, cached conversions and the batch API agree."""
+        self.assertEqual(num_to_text(1), "birinci")
+        self.assertEqual(num_to_text(ORDINAL_TABLE_SIZE), "on bininci")
+        self.assertEqual(num_to_text(ORDINAL_TABLE_SIZE + 1), "on bin birinci")
+        self.assertEqual(num_to_text(0), "sıfırıncı")
+
+        numbers = [3, 3, 21, 10001, 1000000, 3]
+        self.assertEqual(num_to_text_many(numbers), [num_to_text(n) for n in numbers])
+        self.assertEqual(num_to_text_many([]), [])
+
 if __name__ == '__main__':
     unittest.main()
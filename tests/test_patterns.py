@@ -0,0 +1,99 @@
+"""
+Unit tests for the regex registry.
+"""
+
+import os
+import re
+import sys
+import unittest
+
+# Add the parent directory to the path to import the trnorm package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trnorm
+
+from trnorm import unit_utils
+from trnorm.patterns import (
+    _COMPILED,
+    _LAZY_PATTERNS,
+    _WARMUP_FUNCTIONS,
+    LazyPattern,
+    compile_pattern,
+    lazy_pattern,
+    pattern_stats,
+    register_warmup,
+    warmup,
+)
+from trnorm.unit_utils import add_unit_translation
+
+
+class TestPatternRegistry(unittest.TestCase):
+    """Test the regex registry."""
+
+    def test_compile_once(self):
+        """Test that a pattern is compiled once and counted."""
+        before = pattern_stats()
+        pattern = compile_pattern(r"test_compile_once(\d+)")
+        self.assertIs(compile_pattern(r"test_compile_once(\d+)"), pattern)
+        self.assertIsNot(compile_pattern(r"test_compile_once(\d+)", re.IGNORECASE), pattern)
+        after = pattern_stats()
+        self.assertEqual(after.count, before.count + 2)
+        self.assertGreaterEqual(after.seconds, before.seconds)
+
+    def test_snapshot_patterns_not_kept(self):
+        """Test that patterns built from mapping snapshots are not kept by the registry."""
+        before = pattern_stats()
+        self.assertEqual(compile_pattern(r"test_not_kept(\d+)", keep=False).pattern, r"test_not_kept(\d+)")
+        self.assertEqual(pattern_stats().count, before.count + 1)
+        self.assertNotIn((r"test_not_kept(\d+)", 0), _COMPILED)
+
+        saved = unit_utils.unit_registry._snapshot
+        try:
+            trnorm.normalize("5 cm ve 3x4 m")
+            kept = len(_COMPILED)
+            for unit in ("tnka", "tnkb", "tnkc"):
+                add_unit_translation(unit, "birim")
+                self.assertEqual(trnorm.normalize(f"5 {unit} ve 3x4{unit}"), "beş birim ve 3 çarpı 4 birim")
+            self.assertEqual(len(_COMPILED), kept)
+        finally:
+            unit_utils.unit_registry._snapshot = saved
+
+    def test_lazy_pattern(self):
+        """Test that lazy patterns compile on first use and behave like compiled patterns."""
+        lazy = lazy_pattern(r"(\d+)-(\d+)")
+        try:
+            self.assertIsInstance(lazy, LazyPattern)
+            self.assertIsNone(lazy._compiled)
+            compiled = re.compile(r"(\d+)-(\d+)")
+            text = "1-2 ve 30-40"
+            self.assertEqual(lazy.sub(r"\2-\1", text), compiled.sub(r"\2-\1", text))
+            self.assertEqual(lazy.subn(r"\2", text, 1), compiled.subn(r"\2", text, 1))
+            self.assertEqual(lazy.findall(text), compiled.findall(text))
+            self.assertEqual(lazy.search(text, 4).span(), compiled.search(text, 4).span())
+            self.assertEqual([m.group() for m in lazy.finditer(text)], ["1-2", "30-40"])
+            self.assertIsNone(lazy.match(text, 3))
+            self.assertIsNotNone(lazy.fullmatch("5-6"))
+            self.assertEqual(lazy.split(text), compiled.split(text))
+            self.assertIs(lazy.compiled(), compile_pattern(r"(\d+)-(\d+)"))
+        finally:
+            _LAZY_PATTERNS.remove(lazy)
+
+    def test_warmup(self):
+        """Test that warmup compiles the declared patterns and calls the warm-up functions."""
+        calls = []
+        lazy = lazy_pattern(r"test_warmup\d")
+        register_warmup(lambda: calls.append(True))
+        try:
+            stats = trnorm.warmup()
+            self.assertIsNotNone(lazy._compiled)
+            self.assertEqual(calls, [True])
+            self.assertTrue(all(pattern._compiled is not None for pattern in _LAZY_PATTERNS))
+            self.assertGreater(stats.count, 20)
+            self.assertEqual(warmup().count, stats.count)
+        finally:
+            _LAZY_PATTERNS.remove(lazy)
+            _WARMUP_FUNCTIONS.pop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the pipeline planner.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path to import the trnorm package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trnorm import normalize
+from trnorm.dimension_utils import normalize_dimensions, preprocess_dimensions
+from trnorm.normalizer import DEFAULT_PIPELINE
+from trnorm.pipeline import (
+    _STAGE_INFO,
+    PipelinePlan,
+    get_stage_info,
+    plan_pipeline,
+    register_stage,
+)
+from trnorm.test_strings import sapka_test_sentences
+from trnorm.text_utils import fold, remove_punctuation, sapkasiz, turkish_lower
+
+
+class TestPipelinePlanner(unittest.TestCase):
+    """Test the pipeline planner."""
+
+    def test_default_pipeline_plan(self):
+        """Test the rewrites of the default pipeline."""
+        plan = plan_pipeline(DEFAULT_PIPELINE)
+        self.assertIsInstance(plan, PipelinePlan)
+        self.assertEqual(len(plan.stages), len(DEFAULT_PIPELINE) - 3)
+        # The first sapkasiz is kept, units and dimensions are matched without circumflexes
+        self.assertEqual(plan.stages.count(sapkasiz), 1)
+        self.assertLess(plan.stages.index(sapkasiz), plan.stages.index(normalize_dimensions))
+        self.assertNotIn(preprocess_dimensions, plan.stages)
+        self.assertEqual(plan.stages[-1].__name__, "fold(lower, dehat, strip_punct)")
+        self.assertEqual(len(plan.changes), 3)
+        self.assertIn("fused preprocess_dimensions", plan.changes[0])
+        self.assertIn("fold(lower, dehat, strip_punct)", plan.report())
+        self.assertIs(plan_pipeline(DEFAULT_PIPELINE), plan)
+
+    def test_plan_matches_converters(self):
+        """Test that planned and unplanned normalization give the same results."""
+        texts = list(sapka_test_sentences) + [
+            "Bugün 15. kattaki 3 toplantıya katıldım.", "Saat 14:30'da %25 indirim", "II. Dünya Savaşı 1939-1945",
+            "Masa 75x120x90cm.", "Âlim 'İSTANBUL'da", "", "   "]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(normalize(text), normalize(text, optimize=False))
+                self.assertEqual(normalize(text, context_text=text), normalize(text, context_text=text, optimize=False))
+
+    def test_hatted_units_and_dimensions(self):
+        """Test that units and dimensions written with circumflexes are converted as without planning."""
+        texts = ["3 gâl su", "pâ", "5 pâ", "kcâl", "250 kcâl", "75x120 câl", "75x120câl", "3bâr", "2x3 mÂl"]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(normalize(text), normalize(text, optimize=False))
+        self.assertEqual(normalize("3 gâl su"), "üç galon su")
+
+    def test_fold_stages(self):
+        """Test fusions of the lowercase, hat removal and punctuation stages."""
+        plan = plan_pipeline([sapkasiz, remove_punctuation])
+        self.assertEqual([stage.__name__ for stage in plan.stages], ["fold(dehat, strip_punct)"])
+        text = "Âlim, KÂĞIT!"
+        self.assertEqual(plan(text), fold(text, lower=False))
+
+        # Punctuation removal does not come before lowercasing in fold
+        plan = plan_pipeline([remove_punctuation, turkish_lower])
+        self.assertEqual(plan.stages, (remove_punctuation, turkish_lower))
+        self.assertEqual(plan.changes, ())
+        self.assertIn("no changes", plan.report())
+
+    def test_unknown_stages(self):
+        """Test that unregistered stages block rewrites across them."""
+        def shout(text):
+            return text.upper()
+
+        plan = plan_pipeline([sapkasiz, shout, sapkasiz])
+        self.assertEqual(plan.stages, (sapkasiz, shout, sapkasiz))
+        self.assertEqual(plan("kâr"), "KAR")
+
+        plan = plan_pipeline([sapkasiz, sapkasiz])
+        self.assertEqual(plan.stages, (sapkasiz,))
+        self.assertIn("runs twice in a row", plan.changes[0])
+
+    def test_register_stage(self):
+        """Test metadata of user-defined stages, including triggers."""
+        calls = []
+
+        def strip_hashes(text):
+            calls.append(text)
+            return text.replace("#", "")
+
+        try:
+            register_stage(strip_hashes, idempotent=True, commutes_with=[sapkasiz], triggers="#")
+            self.assertTrue(get_stage_info(strip_hashes).idempotent)
+
+            plan = plan_pipeline([strip_hashes, sapkasiz, strip_hashes])
+            self.assertEqual(plan.stages, (sapkasiz, strip_hashes))
+            self.assertEqual(plan("#kâr#"), "kar")
+            self.assertEqual(plan("kâr"), "kar")
+            self.assertEqual(calls, ["#kar#"])
+        finally:
+            del _STAGE_INFO[strip_hashes]
+
+
+if __name__ == "__main__":
+    unittest.main()
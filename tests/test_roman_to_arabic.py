@@ -3,7 +3,13 @@ Tests for Roman numeral to Arabic number conversion.
 """
 
 import unittest
-from trnorm.roman_numerals import roman_to_arabic, is_roman_numeral
+from trnorm.roman_numerals import (
+    MAX_ROMAN,
+    arabic_to_roman,
+    find_roman_ordinal_values,
+    is_roman_numeral,
+    roman_to_arabic,
+)
 
 
 class TestRomanToArabic(unittest.TestCase):
@@ -98,6 +104,25 @@ class TestRomanToArabic(unittest.TestCase):
         for numeral in invalid_numerals:
             self.assertFalse(is_roman_numeral(numeral), f"{numeral} should not be a valid Roman numeral")
 
+    def test_arabic_to_roman(self):
+        """Test the arabic_to_roman function and the round trip over all numbers."""
+        self.assertEqual(arabic_to_roman(4), "IV")
+        self.assertEqual(arabic_to_roman(1994), "MCMXCIV")
+        self.assertEqual(arabic_to_roman(MAX_ROMAN), "MMMCMXCIX")
+
+        for number in range(1, MAX_ROMAN + 1):
+            self.assertEqual(roman_to_arabic(arabic_to_roman(number)), number)
+
+        for number in [0, -1, MAX_ROMAN + 1, 2.0, "4"]:
+            with self.assertRaises(ValueError, msg=f"Should raise ValueError for {number!r}"):
+                arabic_to_roman(number)
+
+    def test_find_roman_ordinal_values(self):
+        """Test that Roman ordinals are found with their values and invalid numerals are skipped."""
+        text = "XX. yüzyılda II. Dünya Savaşı yaşandı. IIII. kez"
+        self.assertEqual(find_roman_ordinal_values(text), [(20, "yüzyılda", 0), (2, "Dünya", 13)])
+        self.assertEqual(find_roman_ordinal_values("Roma yok"), [])
+
 
 if __name__ == "__main__":
     unittest.main()
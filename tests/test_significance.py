@@ -0,0 +1,78 @@
+"""
+Tests for the significance module in trnorm package.
+"""
+
+import random
+
+import pytest
+
+from trnorm.significance import bootstrap_wer, paired_bootstrap_test
+
+# The significance module imports NumPy on first use
+pytest.importorskip("numpy")
+
+
+def _system(seed, error_rate, lengths):
+    rng = random.Random(seed)
+    return [sum(rng.random() < error_rate for _ in range(n)) for n in lengths]
+
+
+LENGTHS = [random.Random(0).randint(3, 15) for _ in range(500)]
+
+
+def test_bootstrap_wer_interval():
+    edits = _system(1, 0.2, LENGTHS)
+    result = bootstrap_wer(edits, LENGTHS, n=2000, seed=42)
+
+    assert result.rate == sum(edits) / sum(LENGTHS)
+    assert result.low < result.rate < result.high
+    assert result.high - result.low < 0.1
+    assert result.replicates == 2000
+    # Same seed, same result
+    assert bootstrap_wer(edits, LENGTHS, n=2000, seed=42) == result
+
+
+def test_bootstrap_wer_small_blocks(monkeypatch):
+    import trnorm.significance as significance
+
+    edits = _system(2, 0.3, LENGTHS)
+    expected = bootstrap_wer(edits, LENGTHS, n=300, seed=7)
+
+    # Processing replicates in smaller blocks must still give a valid interval
+    monkeypatch.setattr(significance, "BLOCK_ELEMENTS", 10)
+    result = bootstrap_wer(edits, LENGTHS, n=300, seed=7)
+
+    assert result.rate == expected.rate
+    assert result.low < result.rate < result.high
+
+
+def test_paired_bootstrap_test():
+    edits_a = _system(3, 0.10, LENGTHS)
+    edits_b = _system(4, 0.25, LENGTHS)
+
+    result = paired_bootstrap_test(edits_a, edits_b, LENGTHS, n=2000, seed=0)
+
+    assert result.delta == pytest.approx(result.rate_b - result.rate_a)
+    assert result.delta > 0
+    assert result.low > 0
+    assert result.p_value < 0.01
+
+
+def test_paired_bootstrap_test_identical_systems():
+    edits = _system(5, 0.2, LENGTHS)
+    result = paired_bootstrap_test(edits, edits, LENGTHS, n=500, seed=0)
+
+    assert result.delta == 0.0
+    assert result.low == result.high == 0.0
+    assert result.p_value == 1.0
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        bootstrap_wer([1, 2], [3], n=10)
+
+    with pytest.raises(ValueError):
+        bootstrap_wer([], [], n=10)
+
+    with pytest.raises(ValueError):
+        paired_bootstrap_test([1], [1, 2], [3], n=10)
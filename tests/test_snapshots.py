@@ -0,0 +1,71 @@
+"""
+Tests for the snapshots module.
+"""
+
+import unittest
+
+from trnorm import unit_utils
+from trnorm.snapshots import MappingSnapshot, VersionedMapping
+from trnorm.unit_utils import (
+    add_unit_translation,
+    get_unit_translations,
+    normalize_units,
+)
+
+
+class TestVersionedMapping(unittest.TestCase):
+    """Test cases for versioned, copy-on-write mappings."""
+
+    def test_updates_publish_new_snapshots(self):
+        """Test that every update publishes a new snapshot with the next version."""
+        registry = VersionedMapping({"cm": "santimetre"})
+        first = registry.snapshot()
+        self.assertIsInstance(first, MappingSnapshot)
+        self.assertEqual(first.version, 0)
+
+        second = registry.set("mm", "milimetre")
+        third = registry.update({"cm": "sm", "m": "metre"})
+
+        self.assertEqual((second.version, third.version, registry.version), (1, 2, 2))
+        self.assertIs(registry.snapshot(), third)
+        self.assertEqual(dict(first), {"cm": "santimetre"})
+        self.assertEqual(dict(second), {"cm": "santimetre", "mm": "milimetre"})
+        self.assertEqual(list(third), ["cm", "mm", "m"])
+        self.assertEqual(third["cm"], "sm")
+
+    def test_snapshot_is_read_only(self):
+        """Test that snapshots behave like read-only mappings."""
+        snapshot = VersionedMapping({"a": 1}).snapshot()
+        self.assertEqual(len(snapshot), 1)
+        self.assertIn("a", snapshot)
+        self.assertEqual(snapshot.get("b", 2), 2)
+        self.assertEqual(snapshot, {"a": 1})
+        with self.assertRaises(TypeError):
+            snapshot["b"] = 2
+        with self.assertRaises(AttributeError):
+            snapshot.extra = True
+
+
+class TestUnitTranslations(unittest.TestCase):
+    """Test cases for the unit translation snapshots."""
+
+    def setUp(self):
+        self._saved = unit_utils.unit_registry._snapshot
+
+    def tearDown(self):
+        unit_utils.unit_registry._snapshot = self._saved
+
+    def test_add_unit_translation(self):
+        """Test that added units are used by new conversions only."""
+        before = get_unit_translations()
+        self.assertEqual(normalize_units("5 nm"), "5 nm")
+
+        snapshot = add_unit_translation("nm", "nanometre")
+        self.assertEqual(snapshot.version, before.version + 1)
+        self.assertIs(unit_utils.unit_translations, snapshot)
+        self.assertNotIn("nm", before)
+        self.assertEqual(normalize_units("5 nm"), "5 nanometre")
+
+
+if __name__ == "__main__":
+    unittest.main()
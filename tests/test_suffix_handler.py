@@ -3,7 +3,12 @@ Tests for the suffix_handler module.
 """
 
 import unittest
-from trnorm.suffix_handler import merge_suffixes
+from trnorm.suffix_handler import (
+    merge_suffixes,
+    context_aware_merge_suffixes,
+    aligned_merge_suffixes,
+    _count_suffixes,
+)
 
 
 class TestSuffixHandler(unittest.TestCase):
@@ -90,6 +95,62 @@ class TestSuffixHandler(unittest.TestCase):
         
         self.assertEqual(merge_suffixes(input_list), expected_output)
 
+    def test_spacing_preserved(self):
+        """Test that whitespace between words that are not merged is kept."""
+        self.assertEqual(merge_suffixes("Toros  ile\thamile"), "Torosla\thamile")
+        self.assertEqual(merge_suffixes("  AB ile  ilgili "), "  AB ile  ilgili ")
+        self.assertEqual(merge_suffixes("TOROS ILE hamile"), "TOROSla hamile")
+
+    def test_consecutive_suffixes(self):
+        """Test that particles are merged left to right in a single pass."""
+        self.assertEqual(merge_suffixes("gelir ise ile"), "gelirseyle")
+
+    def test_count_suffixes(self):
+        """Test counting suffixes split by whitespace and punctuation."""
+        self.assertEqual(
+            _count_suffixes("Çay İSE içelim, kahve ile,de olur iken? ile"),
+            {"ile": 2, "ise": 1, "iken": 1},
+        )
+        self.assertEqual(_count_suffixes(""), {"ile": 0, "ise": 0, "iken": 0})
+
+    def test_context_aware(self):
+        """Test that suffixes are kept when the context has the same pattern."""
+        text = "Toros ile hamile"
+        self.assertEqual(context_aware_merge_suffixes(text, "Toros ile gitti"), text)
+        self.assertEqual(context_aware_merge_suffixes(text, "Torosla gitti"), "Torosla hamile")
+        self.assertEqual(context_aware_merge_suffixes(text), "Torosla hamile")
+        self.assertEqual(
+            context_aware_merge_suffixes(["Ali ile", "Veli ise"], ["Ali ile", "Veliyse"]),
+            ["Ali ile", "Veliyse"],
+        )
+
+    def test_aligned_merge(self):
+        """Test that each particle is merged or preserved based on its aligned counterpart."""
+        test_cases = [
+            # Only the second particle is merged in the context
+            ("Ali ile Veli ile gitti", "Ali ile Veliyle gitti", "Ali ile Veliyle gitti"),
+            ("Ali ile Veliyle gitti", "Ali ile Veli ile gitti", "Ali ile Veliyle gitti"),
+            # Same particles in both texts, despite other differences
+            ("Toros ile gitti ve hava güzel ise döndü", "Toros ile geldi hava güzel ise kaldı",
+             "Toros ile gitti ve hava güzel ise döndü"),
+            # Different particle at the aligned position
+            ("Çocuk iken gitti", "Çocuk ise gitti", "Çocukken gitti"),
+            # Case and trailing punctuation are ignored when aligning
+            ("toros ile gitti", "Toros İLE, gitti.", "toros ile gitti"),
+            # No particles in the context, everything is merged
+            ("Toros ile  gitti", "Torosla gitti", "Torosla  gitti"),
+            # No context
+            ("Toros ile gitti", None, "Torosla gitti"),
+        ]
+        for text, context, expected in test_cases:
+            with self.subTest(text=text, context=context):
+                self.assertEqual(aligned_merge_suffixes(text, context), expected)
+
+        self.assertEqual(
+            aligned_merge_suffixes(["Ali ile", "Veli ise"], ["Ali ile", "Veliyse"]),
+            ["Ali ile", "Veliyse"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
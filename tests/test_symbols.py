@@ -2,7 +2,9 @@
 Tests for the symbols module.
 """
 
+import threading
 import unittest
+
 from trnorm.symbols import SymbolConverter, convert_symbols
 
 
@@ -138,6 +140,72 @@ class TestSymbols(unittest.TestCase):
         for input_text, expected_output in test_cases:
             self.assertEqual(converter.convert_all_symbols(input_text), expected_output)
 
+    def test_combined_pattern(self):
+        """Test that the single-pattern scan resolves adjacent symbols and numbers."""
+        test_cases = [
+            ("3 %20'lik indirim", "3 yüzde 20'lik indirim"),
+            ("%5 $", "yüzde 5 dolar"),
+            ("Sembol yok.", "Sembol yok."),
+        ]
+        
+        for input_text, expected_output in test_cases:
+            self.assertEqual(convert_symbols(input_text), expected_output)
+        
+        # Adding a symbol recompiles the pattern, changing a text reuses it
+        converter = SymbolConverter(load_defaults=False)
+        converter.add_symbol_mapping("@", "et", False)
+        self.assertEqual(converter.convert_all_symbols("@50 ve 5 #"), "et 50 ve 5 #")
+        converter.add_symbol_mapping("#", "diyez", False)
+        self.assertEqual(converter.convert_all_symbols("@50 ve 5 #"), "et 50 ve 5 diyez")
+        pattern = converter._compiled[1]
+        converter.add_symbol_mapping("@", "at", False)
+        self.assertEqual(converter.convert_all_symbols("@50"), "at 50")
+        self.assertIs(converter._compiled[1], pattern)
+    
+    def test_mapping_snapshots(self):
+        """Test that added mappings are published as new versions without changing old snapshots."""
+        converter = SymbolConverter()
+        before = converter.mappings.snapshot()
+        version = converter.version
+        
+        converter.add_symbol_mapping("§", "paragraf", False)
+        self.assertEqual(converter.version, version + 1)
+        self.assertNotIn("§", before)
+        self.assertEqual(converter.symbols_map["§"], "paragraf")
+        self.assertNotIn("§", converter.text_after_number)
+        self.assertIn("$", converter.text_after_number)
+        self.assertEqual(converter.convert_all_symbols("§5 ve $5"), "paragraf 5 ve 5 dolar")
+        
+        # A snapshot cannot be modified
+        with self.assertRaises(TypeError):
+            before["§"] = ("paragraf", False)
+    
+    def test_concurrent_updates(self):
+        """Test converting text while other threads add mappings."""
+        converter = SymbolConverter()
+        symbols = [chr(code) for code in range(0x2460, 0x2460 + 40)]  # circled digits
+        errors = []
+        
+        def convert():
+            for _ in range(200):
+                try:
+                    self.assertEqual(converter.convert_all_symbols("%50 ve $25"), "yüzde 50 ve 25 dolar")
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+        
+        def add():
+            for symbol in symbols:
+                converter.add_symbol_mapping(symbol, "sembol", False)
+        
+        threads = [threading.Thread(target=convert) for _ in range(4)] + [threading.Thread(target=add)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(converter.convert_all_symbols(symbols[-1] + "5"), "sembol 5")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -14,7 +14,10 @@ from trnorm.text_utils import (
     son_sesli_harf,
     son_sesli_harf_kalin,
     sapkasiz,
+    remove_punctuation,
+    fold,
     ekle,
+    ekle_many,
 )
 from trnorm.test_strings import (
     TURKISH_ALPHABET_SMALL,
@@ -256,6 +259,44 @@ class TestTurkishTextUtils(unittest.TestCase):
         # Test with numbers and special characters
         self.assertEqual(sapkasiz("kâğıt123!"), "kağıt123!")
 
+    def test_remove_punctuation(self):
+        """Test remove_punctuation function with various inputs."""
+        self.assertEqual(remove_punctuation("Merhaba, dünya!"), "Merhaba dünya")
+        self.assertEqual(remove_punctuation("kuzey-güney/doğu|batı"), "kuzey güney doğu batı")
+        self.assertEqual(remove_punctuation("«alıntı» … ‹iç›"), "alıntı iç")
+        self.assertEqual(remove_punctuation("a\u00a0b\tc"), "a bc")
+        self.assertEqual(remove_punctuation("a\u200bb\ufeffc\u00add"), "abcd")
+        self.assertEqual(remove_punctuation("  çok   boşluk  "), "çok boşluk")
+        self.assertEqual(remove_punctuation(""), "")
+
+        # Unicode punctuation and symbols outside the hand-maintained list
+        self.assertEqual(remove_punctuation("“tırnak” ‚alıntı‘ 「kutu」 ★ ✓ → 😀"), "tırnak alıntı kutu")
+        self.assertEqual(remove_punctuation("10\u202f000\u2009km"), "10 000 km")
+
+        # Symbols converted to words by convert_symbols are kept
+        self.assertEqual(remove_punctuation("100 ₺ ve 5 €"), "100 ₺ ve 5 €")
+
+    def test_fold(self):
+        """Test that fold matches the turkish_lower -> sapkasiz -> remove_punctuation chain."""
+        self.assertEqual(fold("Kâğıt-Kalem, İSTANBUL!"), "kağıt kalem istanbul")
+        self.assertEqual(fold("ÎMAN ve ÂLİM"), "iman ve alim")
+        self.assertEqual(fold(""), "")
+
+        texts = [
+            "Bugün İSTANBUL'da hava 25°C, rüzgâr kuzeyden-güneye esiyor...",
+            "ÂLÎ BÂBÂ ve Kırk Haramiler",
+            "IĞDIR / ŞANLIURFA | Çanakkale",
+            "ΟΔΟΣ. ΑΣ.Α",
+            "  \t boşluklar\u00a0ve\u00adçizgiler  ",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(fold(text), remove_punctuation(sapkasiz(turkish_lower(text))))
+                self.assertEqual(fold(text, lower=False), remove_punctuation(sapkasiz(text)))
+                self.assertEqual(fold(text, dehat=False), remove_punctuation(turkish_lower(text)))
+                self.assertEqual(fold(text, strip_punct=False), sapkasiz(turkish_lower(text)))
+                self.assertEqual(fold(text, False, False, False), text)
+
     def test_ekle_ile(self):
         """Test ekle function with 'ile' suffix."""
         # Test regular words with 'ile'
@@ -295,6 +336,20 @@ class TestTurkishTextUtils(unittest.TestCase):
         with self.assertRaises(ValueError):
             ekle("test", "")
 
+    def test_ekle_many(self):
+        """Test that ekle_many matches ekle for every word."""
+        for ek, test_words in (("ile", ile_test_words), ("ise", ise_test_words), ("iken", iken_test_words)):
+            kelimeler = list(test_words) + list(istisnalar_test_words) + ["", "TBMM", "krş"]
+            with self.subTest(ek=ek):
+                self.assertEqual(ekle_many(kelimeler, ek), [ekle(kelime, ek) for kelime in kelimeler])
+
+        # Repeated words are analyzed once
+        self.assertEqual(ekle_many(["Ankara", "Ankara", "İzmir"], "ile"), ["Ankarayla", "Ankarayla", "İzmirle"])
+
+        # The suffix is validated even when there are no words
+        with self.assertRaises(ValueError):
+            ekle_many([], "invalid")
+
     def test_turkish_case_conversion_roundtrip(self):
         """Test that turkish_lower and turkish_upper work correctly in roundtrip."""
         test_words = [
@@ -9,45 +9,120 @@ This package provides tools for normalizing Turkish text, including:
 - Adding Turkish suffixes to words (ile, ise, iken)
 - Various text utility functions for Turkish language processing
 - Metrics for text similarity (WER, CER, Levenshtein distance)
+- Parallel corpus scoring with per-utterance edit counts and corpus totals
+- Bootstrap confidence intervals and paired significance tests for corpus WER
+- Streaming error analysis (top substitutions, deletions, character confusions)
 - Legacy normalizer for backward compatibility
 - Simple normalizer that applies a list of conversion functions in sequence
+- Pipeline planner that removes redundant stages and fuses others
+- Registry compiling every regular expression once, with an explicit warmup
 - Utilities for handling dimensions and multiplication symbols
 - Handling alphanumeric patterns (e.g., F3, B1) by separating letters and numbers
 """
 
 __version__ = "0.1.0"
 
-from .num_to_text import NumberToTextConverter, convert_numbers_to_words_wrapper
-from .ordinals import normalize_ordinals
-from .roman_numerals import roman_to_arabic, is_roman_numeral, find_roman_ordinals
-from .symbols import SymbolConverter, convert_symbols, default_converter, add_symbol_mapping
-from .symbol_mappings import get_all_mappings, get_mapping, add_mapping
-from .metrics import wer, cer, levenshtein_distance
-from .legacy_normalizer import normalize_text, replace_hatted_characters, turkish_lower as legacy_turkish_lower
-from .text_utils import (
-    turkish_lower,
-    turkish_upper,
-    turkish_capitalize,
-    is_turkish_upper,
-    son_harf,
-    sesli_ile_bitiyor,
-    son_sesli_harf,
-    son_sesli_harf_kalin,
-    sapkasiz,
-    ekle,
-)
-from .normalizer import normalize
-from .dimension_utils import preprocess_dimensions, normalize_dimensions
-from .unit_utils import normalize_units
-from .alphanumeric import separate_alphanumeric, normalize_alphanumeric
+import importlib
+
+# Public names mapped to the submodule defining them (and their name there, if different).
+# Submodules are imported on first access to one of their names (PEP 562), so importing
+# trnorm is cheap and a program only pays for the parts it uses.
+_LAZY_IMPORTS = {
+    "NumberToTextConverter": ".num_to_text",
+    "convert_numbers_to_words_wrapper": ".num_to_text",
+    "normalize_ordinals": ".ordinals",
+    "roman_to_arabic": ".roman_numerals",
+    "arabic_to_roman": ".roman_numerals",
+    "is_roman_numeral": ".roman_numerals",
+    "find_roman_ordinals": ".roman_numerals",
+    "find_roman_ordinal_values": ".roman_numerals",
+    "SymbolConverter": ".symbols",
+    "convert_symbols": ".symbols",
+    "default_converter": ".symbols",
+    "add_symbol_mapping": ".symbols",
+    "get_all_mappings": ".symbol_mappings",
+    "get_mapping": ".symbol_mappings",
+    "add_mapping": ".symbol_mappings",
+    "wer": ".metrics",
+    "cer": ".metrics",
+    "levenshtein_distance": ".metrics",
+    "score_pair": ".metrics",
+    "score_pairs": ".metrics",
+    "align": ".metrics",
+    "score_corpus": ".corpus_metrics",
+    "CorpusScores": ".corpus_metrics",
+    "bootstrap_wer": ".significance",
+    "paired_bootstrap_test": ".significance",
+    "ErrorAnalyzer": ".error_analysis",
+    "SpaceSavingCounter": ".error_analysis",
+    "normalize_text": ".legacy_normalizer",
+    "replace_hatted_characters": ".legacy_normalizer",
+    "legacy_turkish_lower": (".legacy_normalizer", "turkish_lower"),
+    "turkish_lower": ".text_utils",
+    "turkish_upper": ".text_utils",
+    "turkish_capitalize": ".text_utils",
+    "is_turkish_upper": ".text_utils",
+    "son_harf": ".text_utils",
+    "sesli_ile_bitiyor": ".text_utils",
+    "son_sesli_harf": ".text_utils",
+    "son_sesli_harf_kalin": ".text_utils",
+    "sapkasiz": ".text_utils",
+    "remove_punctuation": ".text_utils",
+    "fold": ".text_utils",
+    "ekle": ".text_utils",
+    "ekle_many": ".text_utils",
+    "normalize": ".normalizer",
+    "PipelinePlan": ".pipeline",
+    "plan_pipeline": ".pipeline",
+    "register_stage": ".pipeline",
+    "PatternStats": ".patterns",
+    "pattern_stats": ".patterns",
+    "warmup": ".patterns",
+    "preprocess_dimensions": ".dimension_utils",
+    "normalize_dimensions": ".dimension_utils",
+    "normalize_units": ".unit_utils",
+    "separate_alphanumeric": ".alphanumeric",
+    "normalize_alphanumeric": ".alphanumeric",
+    "ColumnMapping": ".evaluate",
+    "EvaluationSummary": ".evaluate",
+    "evaluate_log": ".evaluate",
+    "MappedCorpus": ".corpus_reader",
+    "normalize_mapped_corpus": ".corpus_reader",
+    "score_mapped_corpus": ".corpus_reader",
+}
+
+
+def __getattr__(name):
+    target = _LAZY_IMPORTS.get(name)
+    if target is None:
+        # Submodules used to be imported with the package, keep trnorm.<submodule> working
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = target if isinstance(target, tuple) else (target, name)
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    # Later accesses do not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "NumberToTextConverter",
     "convert_numbers_to_words_wrapper",
     "normalize_ordinals",
     "roman_to_arabic",
+    "arabic_to_roman",
     "is_roman_numeral",
     "find_roman_ordinals",
+    "find_roman_ordinal_values",
     "SymbolConverter",
     "convert_symbols",
     "default_converter",
@@ -58,6 +133,15 @@ __all__ = [
     "wer",
     "cer",
     "levenshtein_distance",
+    "score_pair",
+    "score_pairs",
+    "align",
+    "score_corpus",
+    "CorpusScores",
+    "bootstrap_wer",
+    "paired_bootstrap_test",
+    "ErrorAnalyzer",
+    "SpaceSavingCounter",
     "normalize_text",
     "replace_hatted_characters",
     "legacy_turkish_lower",
@@ -70,11 +154,26 @@ __all__ = [
     "son_sesli_harf",
     "son_sesli_harf_kalin",
     "sapkasiz",
+    "remove_punctuation",
+    "fold",
     "ekle",
+    "ekle_many",
     "normalize",
+    "PipelinePlan",
+    "plan_pipeline",
+    "register_stage",
+    "PatternStats",
+    "pattern_stats",
+    "warmup",
     "preprocess_dimensions",
     "normalize_dimensions",
     "normalize_units",
     "separate_alphanumeric",
     "normalize_alphanumeric",
+    "ColumnMapping",
+    "EvaluationSummary",
+    "evaluate_log",
+    "MappedCorpus",
+    "normalize_mapped_corpus",
+    "score_mapped_corpus",
 ]
@@ -0,0 +1,7 @@
+"""Run the trnorm command with python -m trnorm."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -6,7 +6,11 @@ by separating the letter and number components with a space to allow for proper
 text normalization in the pipeline.
 """
 
-import re
+from trnorm.patterns import lazy_pattern
+
+# Pattern to match a letter (or sequence of letters) followed by a number
+# Handles both uppercase and lowercase letters
+_ALPHANUMERIC_PATTERN = lazy_pattern(r"([a-zA-Z]+)(\d+)")
 
 
 def separate_alphanumeric(text):
@@ -23,12 +27,8 @@ def separate_alphanumeric(text):
     Returns:
         str: Text with alphanumeric patterns separated by a space.
     """
-    # Pattern to match a letter (or sequence of letters) followed by a number
-    # Handles both uppercase and lowercase letters
-    pattern = r'([a-zA-Z]+)(\d+)'
-    
     # Replace with the same letter followed by a space and then the number
-    result = re.sub(pattern, r'\1 \2', text)
+    result = _ALPHANUMERIC_PATTERN.sub(r"\1 \2", text)
     
     return result
 
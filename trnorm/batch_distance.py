@@ -0,0 +1,200 @@
+"""
+NumPy backend for batched Levenshtein distance computation.
+
+Scoring millions of short utterances one pair at a time is dominated by
+Python loop overhead. This module computes the edit distances of a whole
+batch of pairs at once:
+
+- Each side of the batch is encoded into a padded integer array
+  (Unicode code points for characters, vocabulary ids for words).
+- The DP matrix is filled one anti-diagonal at a time. All cells of an
+  anti-diagonal only depend on the two previous anti-diagonals, so every
+  step is a handful of vectorized operations over the whole batch.
+- Pairs are bucketed by length before padding to keep the wasted work small.
+
+NumPy is optional. When it is not installed, HAS_NUMPY is False and callers
+(see trnorm.metrics) fall back to the pure-Python implementation. NumPy itself
+is only imported on first use, so importing this module stays cheap.
+"""
+
+import importlib.util
+
+from typing import Callable, Dict, Hashable, List, Sequence
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# The numpy module, imported on first use by _load_numpy
+np = None
+
+# Number of pairs processed together in one wavefront computation
+BATCH_SIZE = 1024
+
+# Minimum number of pairs for which the NumPy backend is worth its setup cost
+MIN_BATCH = 8
+
+
+def _load_numpy():
+    """Import NumPy on first use."""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def _encode(codes, lengths, pad: int):
+    """
+    Encode integer sequences into a padded 2D array.
+
+    Args:
+        codes: Flat array with the concatenation of all sequences
+        lengths: Length of each sequence
+        pad: Value used for padding
+
+    Returns:
+        numpy.ndarray: Array of shape (len(lengths), max(lengths))
+    """
+    batch = len(lengths)
+    width = int(lengths.max()) if batch else 0
+    encoded = np.full((batch, width), pad, dtype=np.int64)
+    total = int(lengths.sum())
+    if total:
+        rows = np.repeat(np.arange(batch), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        encoded[rows, np.arange(total) - starts] = codes
+    return encoded
+
+
+def _wavefront(a, b, len_a, len_b):
+    """
+    Compute the Levenshtein distance of every row pair of two padded arrays.
+
+    The DP matrix D of each pair is traversed by anti-diagonals k = i + j.
+    A diagonal is stored as an array indexed by i, so D[i][j] on diagonal k
+    depends on the previous diagonal at i - 1 (deletion) and i (insertion),
+    and on the diagonal before that at i - 1 (substitution).
+
+    Args:
+        a: Padded array of shape (batch, n)
+        b: Padded array of shape (batch, m)
+        len_a: Actual length of each row of a
+        len_b: Actual length of each row of b
+
+    Returns:
+        numpy.ndarray: The distance of each pair
+    """
+    batch, n = a.shape
+    m = b.shape[1]
+    big = n + m + 1
+
+    # b reversed, so that b[:, k - i - 1] for increasing i is a contiguous slice
+    b_rev = b[:, ::-1]
+
+    targets = len_a + len_b
+    result = np.zeros(batch, dtype=np.int64)
+
+    prev2 = np.full((batch, n + 1), big, dtype=np.int64)
+    prev = np.full((batch, n + 1), big, dtype=np.int64)
+    prev[:, 0] = 0
+
+    for k in range(1, n + m + 1):
+        cur = np.full((batch, n + 1), big, dtype=np.int64)
+        lo = max(0, k - m)
+        hi = min(n, k)
+
+        # Interior cells: 1 <= i <= n and 1 <= j = k - i <= m
+        start = max(1, lo)
+        stop = min(hi, k - 1) + 1
+        if start < stop:
+            substitution = prev2[:, start - 1:stop - 1] + (
+                a[:, start - 1:stop - 1] != b_rev[:, m - k + start:m - k + stop]
+            )
+            deletion = prev[:, start - 1:stop - 1] + 1
+            insertion = prev[:, start:stop] + 1
+            cur[:, start:stop] = np.minimum(np.minimum(deletion, insertion), substitution)
+
+        # Boundary cells: D[0][k] and D[k][0]
+        if lo == 0:
+            cur[:, 0] = k
+        if hi == k:
+            cur[:, k] = k
+
+        done = targets == k
+        if done.any():
+            result[done] = cur[done, len_a[done]]
+
+        prev2, prev = prev, cur
+
+    return result
+
+
+def _batched_distances(seqs1: Sequence, seqs2: Sequence, flatten: Callable) -> List[int]:
+    """
+    Compute edit distances of sequence pairs, bucketed by length.
+
+    Args:
+        seqs1: First sequences
+        seqs2: Second sequences, one per first sequence
+        flatten: Function mapping a list of sequences to the flat integer array
+            of their concatenated codes
+    """
+    _load_numpy()
+    count = len(seqs1)
+    lengths1 = np.fromiter((len(s) for s in seqs1), dtype=np.int64, count=count)
+    lengths2 = np.fromiter((len(s) for s in seqs2), dtype=np.int64, count=count)
+
+    # Sort by size so each bucket is padded to similar lengths
+    order = np.lexsort((lengths2, lengths1))
+    distances = np.zeros(count, dtype=np.int64)
+
+    for start in range(0, count, BATCH_SIZE):
+        index = order[start:start + BATCH_SIZE]
+        len_a = lengths1[index]
+        len_b = lengths2[index]
+        a = _encode(flatten([seqs1[i] for i in index]), len_a, -1)
+        b = _encode(flatten([seqs2[i] for i in index]), len_b, -2)
+        distances[index] = _wavefront(a, b, len_a, len_b)
+
+    return distances.tolist()
+
+
+def _flatten_strings(strings: List[str]):
+    """Concatenate strings into a flat array of Unicode code points."""
+    return np.frombuffer("".join(strings).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+
+def _flatten_codes(codes: List[List[int]]):
+    """Concatenate integer lists into a flat array."""
+    return np.fromiter((x for seq in codes for x in seq), dtype=np.int64, count=sum(map(len, codes)))
+
+
+def char_distances(strings1: Sequence[str], strings2: Sequence[str]) -> List[int]:
+    """
+    Compute character-level Levenshtein distances for a batch of string pairs.
+
+    Args:
+        strings1: First strings
+        strings2: Second strings, one per first string
+
+    Returns:
+        List[int]: The Levenshtein distance of each pair
+    """
+    return _batched_distances(strings1, strings2, _flatten_strings)
+
+
+def token_distances(tokens1: Sequence[Sequence[Hashable]], tokens2: Sequence[Sequence[Hashable]]) -> List[int]:
+    """
+    Compute token-level (e.g. word-level) Levenshtein distances for a batch of pairs.
+
+    Tokens are mapped to integer ids through a vocabulary shared by the batch.
+
+    Args:
+        tokens1: First token sequences
+        tokens2: Second token sequences, one per first sequence
+
+    Returns:
+        List[int]: The Levenshtein distance of each pair
+    """
+    vocabulary: Dict[Hashable, int] = {}
+    codes1 = [[vocabulary.setdefault(t, len(vocabulary)) for t in seq] for seq in tokens1]
+    codes2 = [[vocabulary.setdefault(t, len(vocabulary)) for t in seq] for seq in tokens2]
+    return _batched_distances(codes1, codes2, _flatten_codes)
@@ -0,0 +1,473 @@
+"""
+Command-line interface of trnorm.
+
+Two subcommands are available:
+
+- normalize: normalize plain text lines, a TSV column or a JSON lines field
+  read from files or standard input, and stream the result
+- score: normalize and score the reference/hypothesis pairs of an ASR log
+  with trnorm.evaluate.evaluate_log and print the summary as JSON
+
+Only argparse and the standard library are imported at startup; the
+normalization modules are imported when a command runs.
+
+Examples:
+    $ echo "Bugün 15 kişi geldi." | trnorm normalize
+    bugün on beş kişi geldi
+    $ trnorm normalize --column r --workers 4 --cache norm.sqlite results.tsv > normalized.tsv
+    $ trnorm score --output rows.tsv results.tsv
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+from collections import deque
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+# Input formats of the normalize command
+INPUT_FORMATS = ("text", "tsv", "jsonl")
+
+_EXTENSION_FORMATS = {".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# An input item: the record to write back (a line, a JSON object or the fields of
+# a TSV line with the position of the normalized column), its text to normalize
+# (None to write the record unchanged) and the context text
+Item = Tuple[Any, Optional[str], Optional[str]]
+
+
+def _column(value: str):
+    """Parse a TSV column given as a name or a 0-based position."""
+    return int(value) if value.isdigit() else value
+
+
+def _names(value: str) -> List[str]:
+    """Parse a comma-separated list of names."""
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _get_converters(names: Optional[List[str]]) -> Optional[list]:
+    """
+    Get the converters for a list of transformer names.
+
+    Returns:
+        Optional[list]: The transformers, or None (the default pipeline) if names is None
+
+    Raises:
+        ValueError: If a name is not in AVAILABLE_TRANSFORMERS
+    """
+    if names is None:
+        return None
+    from .transformer import AVAILABLE_TRANSFORMERS
+
+    unknown = [name for name in names if name not in AVAILABLE_TRANSFORMERS]
+    if unknown:
+        raise ValueError(f"Unknown transformers: {unknown}. Available transformers: {list(AVAILABLE_TRANSFORMERS)}")
+    return [AVAILABLE_TRANSFORMERS[name] for name in names]
+
+
+def _stage_name(stage: Callable) -> str:
+    """Get the name of a function or of a transformer."""
+    return getattr(stage, "__name__", None) or getattr(stage, "name", None) or repr(stage)
+
+
+class _TimedStage:
+    """A stage of a pipeline plan that records how long it runs."""
+
+    __slots__ = ("stage", "triggers", "calls", "skipped", "seconds")
+
+    def __init__(self, stage: Callable, triggers):
+        self.stage = stage
+        self.triggers = triggers
+        self.calls = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    def __call__(self, text: str, context_text: Optional[str] = None) -> str:
+        if self.triggers is not None and self.triggers.search(text) is None:
+            self.skipped += 1
+            return text
+        start = time.perf_counter()
+        try:
+            text = self.stage(text, context_text)
+        except TypeError:
+            text = self.stage(text)
+        self.seconds += time.perf_counter() - start
+        self.calls += 1
+        return text
+
+
+def _normalize_chunk(task: Tuple[List[str], List[Optional[str]], Optional[list], bool]):
+    """
+    Normalize a chunk of texts. This is the unit of work sent to worker processes.
+
+    Returns:
+        Tuple of the normalized texts and, when profiling, the (name, calls, skipped,
+        seconds) of every stage of the plan
+    """
+    from .normalizer import DEFAULT_PIPELINE, normalize
+    from .pipeline import get_stage_info, plan_pipeline
+
+    texts, contexts, converters, profile = task
+    if not profile:
+        return [normalize(text, converters, context) for text, context in zip(texts, contexts)], None
+
+    plan = plan_pipeline(DEFAULT_PIPELINE if converters is None else converters)
+    stages = [_TimedStage(stage, get_stage_info(stage).triggers) for stage in plan.stages]
+    results = [normalize(text, stages, context, optimize=False) for text, context in zip(texts, contexts)]
+    return results, [(_stage_name(timed.stage), timed.calls, timed.skipped, timed.seconds) for timed in stages]
+
+
+class _NormalizationCache:
+    """
+    Persistent cache of normalized texts in an SQLite database.
+
+    Entries are keyed by the pipeline, the text and the context text, so one
+    database can serve several pipelines. The pipeline key includes a
+    fingerprint of the trnorm code and data (see _code_fingerprint), so
+    entries written by another version of the code are not used.
+    """
+
+    def __init__(self, path: str, pipeline: str):
+        self.pipeline = pipeline
+        self.hits = 0
+        self.misses = 0
+        import sqlite3
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS normalized (pipeline TEXT NOT NULL, text TEXT NOT NULL, "
+            "context TEXT NOT NULL, result TEXT NOT NULL, PRIMARY KEY (pipeline, text, context))"
+        )
+
+    def get(self, text: str, context: Optional[str]) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT result FROM normalized WHERE pipeline = ? AND text = ? AND context = ?",
+            (self.pipeline, text, context or ""),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put_many(self, entries: Iterable[Tuple[str, Optional[str], str]]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO normalized VALUES (?, ?, ?, ?)",
+                ((self.pipeline, text, context or "", result) for text, context, result in entries),
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _code_fingerprint() -> str:
+    """
+    Hash the source and data files of the trnorm package.
+
+    Any change of the code that normalizes texts, including an edit of an
+    installed copy that keeps the version number, gives another fingerprint.
+
+    Returns:
+        str: Hexadecimal digest of the files
+    """
+    import hashlib
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for directory, subdirectories, files in os.walk(package_dir):
+        subdirectories[:] = sorted(name for name in subdirectories if name != "__pycache__")
+        for name in sorted(files):
+            if name.endswith((".py", ".tsv")):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, package_dir).encode("utf-8") + b"\0")
+                with open(path, "rb") as file:
+                    digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def _open_inputs(files: Sequence[str]) -> Iterator[TextIO]:
+    """Yield the opened input files, standard input for "-"."""
+    for path in files:
+        if path == "-":
+            yield sys.stdin
+        else:
+            with open(path, encoding="utf-8", newline="") as file:
+                yield file
+
+
+def _read_items(args: argparse.Namespace) -> Iterator[Item]:
+    """Yield the items of the input files of the normalize command."""
+    header_written = False
+    for file in _open_inputs(args.files):
+        if args.format == "text":
+            for line in file:
+                yield line.rstrip("\r\n"), line.rstrip("\r\n"), None
+            continue
+
+        if args.format == "jsonl":
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                text = record.get(args.column) if isinstance(record, dict) else None
+                context = record.get(args.context_column) if args.context_column and text is not None else None
+                yield record, text if isinstance(text, str) else None, context if isinstance(context, str) else None
+            continue
+
+        column, context_column = args.column, args.context_column
+        lines = (line.rstrip("\r\n") for line in file)
+        if not args.no_header:
+            names = next(lines, "").split("\t")
+            try:
+                column, context_column = (names.index(c) if isinstance(c, str) else c
+                                          for c in (column, context_column))
+            except ValueError:
+                raise ValueError(f"Column {args.column!r} or {args.context_column!r} not in the header: {names}") from None
+            # Files are concatenated, so only the first header is written
+            if not header_written:
+                header_written = True
+                yield (names, None), None, None
+        for line in lines:
+            fields = line.split("\t")
+            text = fields[column] if column < len(fields) else None
+            context = fields[context_column] if context_column is not None and context_column < len(fields) else None
+            yield (fields, column), text, context
+
+
+def _format_record(args: argparse.Namespace, record: Any, result: Optional[str]) -> str:
+    """Format an output line, replacing the normalized text of the record by result."""
+    if args.format == "text":
+        return result if result is not None else record
+    if args.format == "jsonl":
+        if result is not None:
+            record[args.column] = result
+        return json.dumps(record, ensure_ascii=False)
+    fields, column = record
+    if result is not None:
+        fields[column] = result
+    return "\t".join(fields)
+
+
+def _print_profile(timings: dict, seconds: float, texts: int, cache: Optional[_NormalizationCache]) -> None:
+    """Print the stage timings of the normalize command to standard error."""
+    total = sum(stage_seconds for _, _, stage_seconds in timings.values()) or 1.0
+    lines = [f"{texts} texts in {seconds:.3f}s ({texts / seconds if seconds else 0:.0f}/s)"]
+    if cache is not None:
+        lines.append(f"cache: {cache.hits} hits, {cache.misses} misses")
+    lines.append(f"{'stage':<40} {'calls':>9} {'skipped':>9} {'seconds':>9} {'share':>6}")
+    for name, (calls, skipped, stage_seconds) in timings.items():
+        lines.append(f"{name:<40} {calls:>9} {skipped:>9} {stage_seconds:>9.3f} {stage_seconds / total:>6.1%}")
+    print("\n".join(lines), file=sys.stderr)
+
+
+def _run_normalize(args: argparse.Namespace, output: TextIO) -> int:
+    """Run the normalize command."""
+    from .evaluate import _map_bounded
+
+    converters = _get_converters(args.pipeline)
+    cache = None
+    if args.cache:
+        pipeline_key = "default" if args.pipeline is None else ",".join(args.pipeline)
+        from . import __version__
+        cache = _NormalizationCache(args.cache, f"{__version__}:{_code_fingerprint()}:{pipeline_key}")
+
+    items = _read_items(args)
+    chunks = iter(lambda: list(islice(items, args.batch_size)), [])
+    # Chunks whose texts are being normalized, with their cached results
+    pending = deque()
+
+    def tasks():
+        for chunk in chunks:
+            results: List[Optional[str]] = [None] * len(chunk)
+            missing = []
+            for i, (_, text, context) in enumerate(chunk):
+                if text is None:
+                    continue
+                cached = cache.get(text, context) if cache is not None else None
+                if cached is None:
+                    missing.append(i)
+                else:
+                    results[i] = cached
+            pending.append((chunk, results, missing))
+            yield [chunk[i][1] for i in missing], [chunk[i][2] for i in missing], converters, args.profile
+
+    if args.workers > 1:
+        chunk_results = _map_bounded(_normalize_chunk, tasks(), args.workers)
+    else:
+        chunk_results = map(_normalize_chunk, tasks())
+
+    timings = {}
+    texts = 0
+    start = time.perf_counter()
+    try:
+        for normalized, chunk_timings in chunk_results:
+            chunk, results, missing = pending.popleft()
+            for i, result in zip(missing, normalized):
+                results[i] = result
+            if cache is not None:
+                cache.put_many((chunk[i][1], chunk[i][2], results[i]) for i in missing)
+            output.write("".join(_format_record(args, record, result) + "\n"
+                                 for (record, _, _), result in zip(chunk, results)))
+            output.flush()
+            texts += sum(1 for _, text, _ in chunk if text is not None)
+            for name, calls, skipped, seconds in chunk_timings or ():
+                total = timings.setdefault(name, [0, 0, 0.0])
+                total[0] += calls
+                total[1] += skipped
+                total[2] += seconds
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if args.profile:
+        _print_profile(timings, time.perf_counter() - start, texts, cache)
+    return 0
+
+
+def _run_score(args: argparse.Namespace, output: TextIO) -> int:
+    """Run the score command."""
+    from .evaluate import ColumnMapping, evaluate_log
+
+    summary = evaluate_log(
+        args.log,
+        output=args.output,
+        summary_output=args.summary,
+        format=args.format,
+        columns=ColumnMapping(args.reference_column, args.hypothesis_column, args.id_column),
+        header=not args.no_header,
+        converters=_get_converters(args.pipeline),
+        context_aware=not args.no_context,
+        metrics=args.metrics,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint=args.checkpoint,
+        checkpoint_interval=args.checkpoint_interval,
+    )
+    output.write(json.dumps(summary._asdict(), ensure_ascii=False, indent=2) + "\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the trnorm command."""
+    parser = argparse.ArgumentParser(prog="trnorm", description="Turkish text normalization and ASR scoring.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--pipeline", type=_names, default=None,
+                        help="comma-separated transformer names from trnorm.transformer.AVAILABLE_TRANSFORMERS "
+                             "(default: the default normalization pipeline)")
+    common.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    common.add_argument("--batch-size", type=int, default=1000,
+                        help="number of rows processed and written together (default: 1000)")
+    common.add_argument("--no-header", action="store_true", help="TSV input has no header line")
+
+    normalize_parser = subparsers.add_parser(
+        "normalize", parents=[common], help="normalize text lines, a TSV column or a JSON lines field")
+    normalize_parser.add_argument("files", nargs="*", default=["-"],
+                                  help="input files, '-' for standard input (default)")
+    normalize_parser.add_argument("--format", choices=INPUT_FORMATS, default=None,
+                                  help="input format (default: from the extension of the first file, else text)")
+    normalize_parser.add_argument("--column", default=None,
+                                  help="TSV column (name or 0-based position) or JSON lines field to normalize")
+    normalize_parser.add_argument("--context-column", default=None,
+                                  help="TSV column or JSON lines field used as context text")
+    normalize_parser.add_argument("--output", "-o", default=None, help="output file (default: standard output)")
+    normalize_parser.add_argument("--cache", default=None,
+                                  help="path of a persistent cache of normalized texts (SQLite database); "
+                                       "entries of other trnorm code versions are not used")
+    normalize_parser.add_argument("--profile", action="store_true",
+                                  help="print the time spent in each pipeline stage to standard error")
+
+    score_parser = subparsers.add_parser(
+        "score", parents=[common], help="normalize and score the reference/hypothesis pairs of an ASR log")
+    score_parser.add_argument("log", nargs="?", default="-", help="TSV, JSON or JSON lines log, '-' for standard input")
+    score_parser.add_argument("--format", choices=("tsv", "json", "jsonl"), default=None,
+                              help="log format (default: from the file extension, else tsv)")
+    score_parser.add_argument("--reference-column", "-r", type=_column, default="r",
+                              help="reference column or key (default: r)")
+    score_parser.add_argument("--hypothesis-column", "-p", type=_column, default="p",
+                              help="hypothesis column or key (default: p)")
+    score_parser.add_argument("--id-column", type=_column, default=None, help="row id column or key")
+    score_parser.add_argument("--metrics", type=_names, default=["wer", "cer"],
+                              help="comma-separated metrics among wer, cer and levenshtein (default: wer,cer)")
+    score_parser.add_argument("--no-context", action="store_true",
+                              help="normalize each side without the other one as context")
+    score_parser.add_argument("--output", "-o", default=None, help="per-row results (.tsv, or .jsonl for JSON lines)")
+    score_parser.add_argument("--summary", default=None, help="JSON summary, rewritten after every batch")
+    score_parser.add_argument("--checkpoint", default=None,
+                              help="checkpoint file; an interrupted run started again with the same arguments "
+                                   "resumes from it")
+    score_parser.add_argument("--checkpoint-interval", type=float, default=60.0,
+                              help="minimum number of seconds between checkpoints (default: 60)")
+    return parser
+
+
+def _use_utf8(stream: TextIO) -> None:
+    """Read and write the standard streams as UTF-8 whatever the platform encoding is."""
+    if isinstance(stream, io.TextIOWrapper):
+        stream.reconfigure(encoding="utf-8")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the trnorm command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments, sys.argv[1:] if None
+
+    Returns:
+        int: The exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.batch_size < 1:
+        parser.error("--workers and --batch-size must be at least 1")
+
+    if args.command == "normalize":
+        if args.format is None:
+            extension = os.path.splitext(args.files[0])[1].lower()
+            args.format = _EXTENSION_FORMATS.get(extension, "text")
+        if args.format != "text" and args.column is None:
+            parser.error(f"--column is required for {args.format} input")
+        if args.format == "tsv":
+            args.column = _column(args.column)
+            args.context_column = _column(args.context_column) if args.context_column else None
+            if args.no_header and not (isinstance(args.column, int) and
+                                       isinstance(args.context_column, (int, type(None)))):
+                parser.error("columns of TSV input without a header must be given by position")
+
+    for stream in (sys.stdin, sys.stdout):
+        _use_utf8(stream)
+    output = sys.stdout
+    try:
+        if args.command == "normalize":
+            if args.output is not None:
+                output = open(args.output, "w", encoding="utf-8", newline="")
+            return _run_normalize(args, output)
+        return _run_score(args, output)
+    except (OSError, ValueError) as error:
+        print(f"trnorm: error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Corpus-level scoring for ASR evaluation.
+
+This module provides a scoring engine that computes edit counts for many
+reference/hypothesis pairs at once and aggregates them into corpus totals.
+It can distribute the work over several processes:
+
+- Pairs are sorted by their dynamic-programming cost (len(ref) * len(hyp))
+  and dealt into shards with a longest-processing-time-first strategy, so a
+  few very long utterances do not leave the other workers idle.
+- Results are written back by original position, so per-utterance arrays
+  and corpus totals are identical regardless of the number of workers.
+
+Supported metrics:
+- "wer": word-level edit distance, normalized by the reference word count
+- "cer": character-level edit distance, normalized by the reference length
+- "levenshtein": character-level edit distance, normalized by the length
+  of the longer string
+"""
+
+import heapq
+import os
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from trnorm.metrics import _calculate_levenshtein_batch
+
+# Metrics that can be requested from score_corpus
+AVAILABLE_METRICS = ("wer", "cer", "levenshtein")
+
+# Rate reported for an utterance (or corpus) whose normalizing length is zero.
+# This mirrors wer()/cer() (1.0) and normalized_levenshtein_distance() (0.0).
+_EMPTY_RATES = {"wer": 1.0, "cer": 1.0, "levenshtein": 0.0}
+
+
+class MetricScores:
+    """
+    Per-utterance edit counts and corpus totals for a single metric.
+
+    Attributes:
+        name (str): The metric name ("wer", "cer" or "levenshtein")
+        edits (array): Edit distance of each utterance, in input order
+        lengths (array): Normalizing length of each utterance, in input order
+    """
+
+    def __init__(self, name: str, edits: array, lengths: array):
+        self.name = name
+        self.edits = edits
+        self.lengths = lengths
+
+    @property
+    def total_edits(self) -> int:
+        """Sum of the edit distances over the corpus."""
+        return sum(self.edits)
+
+    @property
+    def total_length(self) -> int:
+        """Sum of the normalizing lengths over the corpus."""
+        return sum(self.lengths)
+
+    @property
+    def rates(self) -> List[float]:
+        """Per-utterance error rates (edits divided by length)."""
+        empty_rate = _EMPTY_RATES[self.name]
+        return [e / n if n else empty_rate for e, n in zip(self.edits, self.lengths)]
+
+    @property
+    def corpus_rate(self) -> float:
+        """Corpus error rate (total edits divided by total length)."""
+        total_length = self.total_length
+        if total_length == 0:
+            return _EMPTY_RATES[self.name]
+        return self.total_edits / total_length
+
+    def __repr__(self) -> str:
+        """Return a string representation of the metric scores."""
+        return (f"MetricScores(name='{self.name}', utterances={len(self.edits)}, "
+                f"corpus_rate={self.corpus_rate:.4f})")
+
+
+class CorpusScores:
+    """
+    Result of score_corpus: one MetricScores entry per requested metric.
+
+    Metric results can be accessed by name, e.g. ``scores["wer"].corpus_rate``.
+    """
+
+    def __init__(self, metrics: Dict[str, MetricScores]):
+        self.metrics = metrics
+
+    def __getitem__(self, name: str) -> MetricScores:
+        return self.metrics[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.metrics
+
+    def __len__(self) -> int:
+        for scores in self.metrics.values():
+            return len(scores.edits)
+        return 0
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the corpus totals for every metric.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Mapping of metric name to a dictionary with
+                "edits", "length" and "rate" keys
+        """
+        return {
+            name: {
+                "edits": scores.total_edits,
+                "length": scores.total_length,
+                "rate": scores.corpus_rate,
+            }
+            for name, scores in self.metrics.items()
+        }
+
+    def __repr__(self) -> str:
+        """Return a string representation of the corpus scores."""
+        return f"CorpusScores(metrics={list(self.metrics)}, utterances={len(self)})"
+
+
+def _score_shard(shard: Tuple[List[int], List[str], List[str], Tuple[str, ...]]):
+    """
+    Score a shard of pairs. This is the unit of work sent to worker processes.
+
+    The character-level distances are computed once and shared between
+    "cer" and "levenshtein". Distances are computed for the whole shard at
+    once, so the vectorized backend is used when NumPy is available.
+
+    Returns:
+        Tuple of the shard's original indices and, for each metric in order,
+        the (edits, lengths) lists of the shard's pairs
+    """
+    indices, refs, hyps, metrics = shard
+    results = []
+    char_distances = None
+    for name in metrics:
+        if name == "wer":
+            ref_words = [ref.split() for ref in refs]
+            hyp_words = [hyp.split() for hyp in hyps]
+            distances = _calculate_levenshtein_batch(ref_words, hyp_words, tokens=True)
+            results.append((distances, [len(words) for words in ref_words]))
+        else:
+            if char_distances is None:
+                char_distances = _calculate_levenshtein_batch(refs, hyps)
+            if name == "cer":
+                results.append((char_distances, [len(ref) for ref in refs]))
+            else:
+                results.append((char_distances, [max(len(ref), len(hyp)) for ref, hyp in zip(refs, hyps)]))
+    return indices, results
+
+
+def _make_shards(costs: List[int], n_shards: int) -> List[List[int]]:
+    """
+    Partition pair indices into shards of roughly equal total cost.
+
+    Pairs are assigned in order of decreasing cost to the currently lightest
+    shard (longest-processing-time-first). Each shard is returned sorted by
+    decreasing cost, and shards are ordered heaviest first so the most
+    expensive work is scheduled earliest.
+    """
+    order = sorted(range(len(costs)), key=lambda i: (-costs[i], i))
+    heap = [(0, k) for k in range(n_shards)]
+    shards: List[List[int]] = [[] for _ in range(n_shards)]
+    loads = [0] * n_shards
+    for i in order:
+        load, k = heapq.heappop(heap)
+        shards[k].append(i)
+        loads[k] = load + costs[i] + 1
+        heapq.heappush(heap, (loads[k], k))
+    ranked = sorted(range(n_shards), key=lambda k: (-loads[k], k))
+    return [shards[k] for k in ranked if shards[k]]
+
+
+def score_corpus(references: Sequence[str], hypotheses: Sequence[str],
+                 metrics: Sequence[str] = ("wer", "cer"), workers: Optional[int] = 1,
+                 shards_per_worker: int = 4) -> CorpusScores:
+    """
+    Score a corpus of reference/hypothesis pairs.
+
+    Per-utterance edit counts are identical to the ones used by wer(), cer()
+    and levenshtein_distance(), and do not depend on the number of workers.
+
+    Args:
+        references (Sequence[str]): Reference texts
+        hypotheses (Sequence[str]): Hypothesis texts, one per reference
+        metrics (Sequence[str]): Metrics to compute, any of "wer", "cer" and "levenshtein"
+        workers (Optional[int]): Number of worker processes. 1 scores in the
+            current process, None uses all available CPUs.
+        shards_per_worker (int): Number of shards created per worker. More shards
+            give finer load balancing at the cost of more inter-process traffic.
+
+    Returns:
+        CorpusScores: Per-utterance edit counts and lengths, plus corpus totals
+
+    Raises:
+        ValueError: If the inputs have different lengths or an unknown metric is requested
+
+    Examples:
+        >>> scores = score_corpus(["bu bir test"], ["bu test"], metrics=["wer"])
+        >>> scores["wer"].corpus_rate
+        0.3333333333333333
+    """
+    if len(references) != len(hypotheses):
+        raise ValueError("Input lists must have the same length for batch processing")
+
+    metrics = tuple(metrics)
+    for name in metrics:
+        if name not in AVAILABLE_METRICS:
+            raise ValueError(f"Unknown metric: {name}. Available metrics: {AVAILABLE_METRICS}")
+
+    refs = [str(ref) for ref in references]
+    hyps = [str(hyp) for hyp in hypotheses]
+    n = len(refs)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    edits = [array("q", bytes(8 * n)) for _ in metrics]
+    lengths = [array("q", bytes(8 * n)) for _ in metrics]
+
+    def collect(indices, results):
+        for k, (shard_edits, shard_lengths) in enumerate(results):
+            for i, distance, length in zip(indices, shard_edits, shard_lengths):
+                edits[k][i] = distance
+                lengths[k][i] = length
+
+    if workers <= 1 or n < 2:
+        collect(range(n), _score_shard((None, refs, hyps, metrics))[1])
+    else:
+        costs = [len(ref) * len(hyp) for ref, hyp in zip(refs, hyps)]
+        shards = _make_shards(costs, min(n, workers * max(1, shards_per_worker)))
+        payloads = [
+            (indices, [refs[i] for i in indices], [hyps[i] for i in indices], metrics)
+            for indices in shards
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for indices, results in executor.map(_score_shard, payloads):
+                collect(indices, results)
+
+    return CorpusScores({
+        name: MetricScores(name, edits[k], lengths[k]) for k, name in enumerate(metrics)
+    })
@@ -0,0 +1,495 @@
+"""
+Memory-mapped reader for large TSV corpora.
+
+A MappedCorpus memory-maps a TSV file and indexes the byte offset of every
+stride-th line. The index is small (8 bytes per stride lines) and is kept in
+a sidecar file next to the corpus, so it is built only once per file version.
+With it, the corpus can be split into byte-range shards without reading the
+file: each worker maps the file itself, reads only the lines of its shard and
+decodes only the columns it needs (e.g. "r" and "p" of our ASR logs).
+
+normalize_mapped_corpus and score_mapped_corpus run the normalizer and the
+corpus scoring engine over the shards in worker processes.
+
+Examples:
+    >>> with MappedCorpus("results.tsv", columns=("r", "p")) as corpus:
+    ...     summary = score_mapped_corpus(corpus, workers=8)
+    >>> summary.metrics["wer"]["rate"]
+    0.0842
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+
+from array import array
+from itertools import accumulate, count, islice
+from operator import add
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from trnorm.corpus_metrics import _EMPTY_RATES, AVAILABLE_METRICS, score_corpus
+from trnorm.evaluate import EvaluationSummary, _map_bounded, _summarize
+from trnorm.normalizer import normalize
+
+# Suffix of the index sidecar file
+INDEX_SUFFIX = ".idx"
+
+# Number of lines per index entry
+DEFAULT_STRIDE = 64
+
+# Bytes read at a time when scanning lines
+SCAN_CHUNK_SIZE = 1 << 24
+
+# Shards are split further so that no shard holds more bytes than this
+SHARD_BYTES = 1 << 25
+
+# Sidecar header: magic, corpus size, corpus modification time (ns), byte offset
+# of the first data line, stride and number of lines, followed by the offsets as
+# little-endian 64-bit integers
+_INDEX_HEADER = struct.Struct("<8sqqqqq")
+_INDEX_MAGIC = b"TRNIDX01"
+
+Column = Union[str, int]
+
+
+class CorpusShard(NamedTuple):
+    """A range of lines of a mapped corpus, to be read by read_shard in any process."""
+
+    path: str
+    # Number of the first line of the shard (0 is the first line after the header)
+    first_line: int
+    # Number of lines in the shard
+    lines: int
+    # Byte range of the shard in the file
+    start: int
+    end: int
+    # Positions of the columns to decode, and the encoding of the file
+    columns: Tuple[int, ...]
+    encoding: str
+
+
+def _map_file(file) -> Union[mmap.mmap, bytes]:
+    """Memory-map a file for reading (empty files cannot be mapped)."""
+    if os.fstat(file.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _iter_lines(data: Union[mmap.mmap, bytes], start: int, end: int,
+                chunk_size: int = SCAN_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of data[start:end] without their line breaks, reading chunk_size bytes at a time."""
+    remainder = b""
+    position = start
+    while position < end:
+        chunk = data[position:min(position + chunk_size, end)]
+        position += len(chunk)
+        lines = chunk.split(b"\n")
+        lines[0] = remainder + lines[0]
+        remainder = lines.pop()
+        yield from lines
+    if remainder:
+        yield remainder
+
+
+def _scan_offsets(data: Union[mmap.mmap, bytes], start: int, stride: int,
+                  chunk_size: int = SCAN_CHUNK_SIZE) -> Tuple[array, int]:
+    """
+    Find the byte offset of every stride-th line of data[start:].
+
+    Returns:
+        Tuple[array, int]: The offsets, followed by the size of the data, and the number of lines
+    """
+    size = len(data)
+    offsets = array("q")
+    # Number of lines starting before position
+    lines = 0
+    if start < size:
+        offsets.append(start)
+        lines = 1
+    position = start
+    while position < size:
+        chunk = data[position:position + chunk_size]
+        parts = chunk.split(b"\n")
+        # Start of the line following each line break of the chunk
+        starts = map(add, accumulate(map(len, parts[:-1])), count(position + 1))
+        offsets.extend(offset for offset in islice(starts, (-lines) % stride, None, stride) if offset < size)
+        lines += len(parts) - 1
+        position += len(chunk)
+    if size > start and data[size - 1:size] == b"\n":
+        # A final line break does not start a line
+        lines -= 1
+    offsets.append(size)
+    return offsets, lines
+
+
+class MappedCorpus:
+    """
+    Memory-mapped TSV corpus with a sparse line-offset index.
+
+    Lines are numbered from 0, starting after the header. Only the selected
+    columns are decoded; a line without all of them reads as None and blank
+    lines are ignored.
+    """
+
+    def __init__(self, path: str, columns: Sequence[Column] = ("r", "p"), header: bool = True,
+                 encoding: str = "utf-8", index_path: Optional[str] = None, stride: int = DEFAULT_STRIDE,
+                 persist_index: bool = True):
+        """
+        Map the corpus and load its index, building it if it is missing or out of date.
+
+        Args:
+            path (str): Path of the TSV file
+            columns (Sequence[Column]): Columns to decode, as header names or 0-based positions
+            header (bool): Whether the first line holds the column names
+            encoding (str): Encoding of the file
+            index_path (Optional[str]): Path of the index sidecar, path + INDEX_SUFFIX if None
+            stride (int): Number of lines per index entry when the index is built
+            persist_index (bool): Write a built index to the sidecar file
+
+        Raises:
+            ValueError: If a column is not in the header, or is a name but the file has no header
+        """
+        if stride < 1:
+            raise ValueError("Stride must be at least 1")
+        self.path = path
+        self.encoding = encoding
+        self.index_path = index_path or path + INDEX_SUFFIX
+        self._file = open(path, "rb")
+        try:
+            self._data = _map_file(self._file)
+            self._load(columns, header, stride, persist_index)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def _load(self, columns: Sequence[Column], header: bool, stride: int, persist_index: bool) -> None:
+        """Resolve the columns and load or build the index."""
+        path, encoding = self.path, self.encoding
+        start = 0
+        names = None
+        if header:
+            start = self._data.find(b"\n") + 1 or len(self._data)
+            names = bytes(self._data[:start]).decode(encoding).rstrip("\r\n").split("\t")
+        positions = []
+        for column in columns:
+            if isinstance(column, int):
+                positions.append(column)
+            elif names is None:
+                raise ValueError("Columns of a TSV file without a header must be given by position")
+            elif column not in names:
+                raise ValueError(f"Column {column!r} not found in the header of {path}: {names}")
+            else:
+                positions.append(names.index(column))
+        self.columns = tuple(positions)
+
+        stat = os.fstat(self._file.fileno())
+        key = (stat.st_size, stat.st_mtime_ns, start)
+        loaded = self._load_index(key)
+        if loaded is None:
+            self._offsets, self.lines = _scan_offsets(self._data, start, stride)
+            self.stride = stride
+            if persist_index:
+                self._save_index(key)
+        else:
+            self._offsets, self.lines, self.stride = loaded
+
+    def _load_index(self, key: Tuple[int, int, int]) -> Optional[Tuple[array, int, int]]:
+        """Load the index sidecar, or return None if it is missing or was built for another file version."""
+        try:
+            with open(self.index_path, "rb") as file:
+                fields = _INDEX_HEADER.unpack(file.read(_INDEX_HEADER.size))
+                magic, size, mtime_ns, start, stride, lines = fields
+                if magic != _INDEX_MAGIC or (size, mtime_ns, start) != key:
+                    return None
+                offsets = array("q")
+                offsets.frombytes(file.read())
+        except (OSError, struct.error, ValueError):
+            return None
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        if len(offsets) != math.ceil(lines / stride) + 1:
+            return None
+        return offsets, lines, stride
+
+    def _save_index(self, key: Tuple[int, int, int]) -> None:
+        """Write the index sidecar, replacing it atomically. A read-only location is not an error."""
+        offsets = self._offsets
+        if sys.byteorder == "big":
+            offsets = array("q", offsets)
+            offsets.byteswap()
+        temporary_path = f"{self.index_path}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, *key, self.stride, self.lines))
+                file.write(offsets.tobytes())
+            os.replace(temporary_path, self.index_path)
+        except OSError:
+            pass
+
+    def __len__(self) -> int:
+        """Number of lines after the header, including blank lines."""
+        return self.lines
+
+    def line_offset(self, line: int) -> int:
+        """
+        Get the byte offset of the start of a line.
+
+        Args:
+            line (int): Line number, from 0 to len(corpus) (the end of the file)
+
+        Returns:
+            int: The byte offset
+        """
+        if not 0 <= line <= self.lines:
+            raise IndexError(f"Line {line} out of range for a corpus of {self.lines} lines")
+        if line == self.lines:
+            return self._offsets[-1]
+        entry, remaining = divmod(line, self.stride)
+        position = self._offsets[entry]
+        for _ in range(remaining):
+            position = self._data.find(b"\n", position) + 1
+        return position
+
+    def shards(self, n_shards: int) -> List[CorpusShard]:
+        """
+        Split the corpus into contiguous shards of roughly equal numbers of lines.
+
+        Shard boundaries are index entries, so no line is scanned.
+
+        Args:
+            n_shards (int): Maximum number of shards
+
+        Returns:
+            List[CorpusShard]: The non-empty shards, in file order
+        """
+        entries = len(self._offsets) - 1
+        n_shards = max(1, min(n_shards, entries))
+        bounds = sorted({round(i * entries / n_shards) for i in range(n_shards + 1)})
+        shards = []
+        for first, last in zip(bounds, bounds[1:]):
+            first_line = first * self.stride
+            lines = min(last * self.stride, self.lines) - first_line
+            shards.append(CorpusShard(self.path, first_line, lines, self._offsets[first], self._offsets[last],
+                                      self.columns, self.encoding))
+        return shards
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Optional[Tuple[str, ...]]]:
+        """
+        Yield the decoded columns of a range of lines.
+
+        Args:
+            start (int): First line
+            stop (Optional[int]): Line after the last one, len(corpus) if None
+
+        Yields:
+            Optional[Tuple[str, ...]]: The columns of each non-blank line, None if it lacks one
+        """
+        stop = self.lines if stop is None else min(stop, self.lines)
+        if start >= stop:
+            return
+        yield from _decode_lines(_iter_lines(self._data, self.line_offset(start), self.line_offset(stop)),
+                                 self.columns, self.encoding)
+
+    def __getitem__(self, line: int) -> Optional[Tuple[str, ...]]:
+        """Get the decoded columns of a line (None if it is blank or lacks a column)."""
+        if line < 0:
+            line += self.lines
+        start = self.line_offset(line)
+        if line >= self.lines:
+            raise IndexError(f"Line {line} out of range for a corpus of {self.lines} lines")
+        rows = list(_decode_lines(_iter_lines(self._data, start, self.line_offset(line + 1)),
+                                  self.columns, self.encoding))
+        return rows[0] if rows else None
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedCorpus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the corpus."""
+        return f"MappedCorpus({self.path!r}, lines={self.lines}, columns={self.columns})"
+
+
+def _decode_lines(lines: Iterator[bytes], columns: Tuple[int, ...],
+                  encoding: str) -> Iterator[Optional[Tuple[str, ...]]]:
+    """Decode the selected columns of TSV lines, skipping blank lines."""
+    # Fields after the last needed column are not split
+    maxsplit = max(columns) + 1 if columns else 0
+    for line in lines:
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        if not line:
+            continue
+        fields = line.split(b"\t", maxsplit)
+        if len(fields) < maxsplit:
+            yield None
+        else:
+            yield tuple(fields[column].decode(encoding) for column in columns)
+
+
+def read_shard(shard: CorpusShard) -> Iterator[Optional[Tuple[str, ...]]]:
+    """
+    Yield the decoded columns of the lines of a shard, mapping the file in this process.
+
+    Yields:
+        Optional[Tuple[str, ...]]: The columns of each non-blank line, None if it lacks one
+    """
+    with open(shard.path, "rb") as file:
+        data = _map_file(file)
+        try:
+            yield from _decode_lines(_iter_lines(data, shard.start, shard.end), shard.columns, shard.encoding)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def _shards_for(corpus: MappedCorpus, workers: int, shards_per_worker: int) -> List[CorpusShard]:
+    """Split a corpus for workers, into shards of at most SHARD_BYTES when possible."""
+    size = corpus.line_offset(len(corpus)) - corpus.line_offset(0)
+    return corpus.shards(max(workers * max(1, shards_per_worker), math.ceil(size / SHARD_BYTES)))
+
+
+def _normalize_shard(task: Tuple[CorpusShard, Optional[List[Callable]], bool]) -> List[Optional[str]]:
+    """Normalize the first column of the lines of a shard. This is the unit of work sent to worker processes."""
+    shard, converters, context_aware = task
+    results = []
+    for row in read_shard(shard):
+        if row is None:
+            results.append(None)
+        elif context_aware and len(row) > 1:
+            results.append(normalize(row[0], converters, row[1]))
+        else:
+            results.append(normalize(row[0], converters))
+    return results
+
+
+def normalize_mapped_corpus(corpus: MappedCorpus, converters: Optional[List[Callable]] = None,
+                            context_aware: bool = True, workers: Optional[int] = 1,
+                            shards_per_worker: int = 4) -> Iterator[Optional[str]]:
+    """
+    Normalize the first selected column of every non-blank line of a corpus.
+
+    Shards are normalized by worker processes and yielded in file order, with
+    at most two shards per worker in flight.
+
+    Args:
+        corpus (MappedCorpus): The corpus
+        converters (Optional[List[Callable]]): Conversion functions used by trnorm.normalize,
+            DEFAULT_PIPELINE if None. They must be picklable when workers are used.
+        context_aware (bool): Use the second selected column, if any, as context text
+        workers (Optional[int]): Number of worker processes. 1 normalizes in the current
+            process, None uses all available CPUs.
+        shards_per_worker (int): Minimum number of shards per worker
+
+    Yields:
+        Optional[str]: The normalized text of each line, None for lines lacking a column
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = ((shard, converters, context_aware) for shard in _shards_for(corpus, workers, shards_per_worker))
+    results = map(_normalize_shard, tasks) if workers <= 1 else _map_bounded(_normalize_shard, tasks, workers)
+    for shard_results in results:
+        yield from shard_results
+
+
+def _score_shard(task: Tuple[CorpusShard, Optional[List[Callable]], bool, Tuple[str, ...]]):
+    """
+    Normalize and score the reference/hypothesis lines of a shard. This is the unit of work
+    sent to worker processes.
+
+    Returns:
+        Tuple of the number of scored and skipped lines and, for each metric in order, the
+        sums of the edits, lengths and rates of the lines
+    """
+    shard, converters, context_aware, metrics = task
+    references = []
+    hypotheses = []
+    skipped = 0
+    for row in read_shard(shard):
+        if row is None:
+            skipped += 1
+        elif context_aware:
+            references.append(normalize(row[0], converters, row[1]))
+            hypotheses.append(normalize(row[1], converters, row[0]))
+        else:
+            references.append(normalize(row[0], converters))
+            hypotheses.append(normalize(row[1], converters))
+    scores = score_corpus(references, hypotheses, metrics)
+    sums = []
+    for name in metrics:
+        edits, lengths = scores[name].edits, scores[name].lengths
+        rate_sum = sum(e / n if n else _EMPTY_RATES[name] for e, n in zip(edits, lengths))
+        sums.append((sum(edits), sum(lengths), rate_sum))
+    return len(references), skipped, sums
+
+
+def score_mapped_corpus(corpus: MappedCorpus, converters: Optional[List[Callable]] = None,
+                        context_aware: bool = True, metrics: Sequence[str] = ("wer", "cer"),
+                        workers: Optional[int] = 1, shards_per_worker: int = 4) -> EvaluationSummary:
+    """
+    Normalize and score the reference/hypothesis pairs of a corpus.
+
+    The first two selected columns of the corpus are the reference and the
+    hypothesis. Workers read, normalize and score whole shards and only send
+    back their totals. Edit and length totals match evaluate_log on the same
+    file; mean rates may differ in the last digits, as they are summed by shard.
+
+    Args:
+        corpus (MappedCorpus): The corpus, with at least two selected columns
+        converters (Optional[List[Callable]]): Conversion functions used by trnorm.normalize,
+            DEFAULT_PIPELINE if None. They must be picklable when workers are used.
+        context_aware (bool): Normalize each side with the other one as context
+        metrics (Sequence[str]): Metrics to compute, any of "wer", "cer" and "levenshtein"
+        workers (Optional[int]): Number of worker processes. 1 scores in the current
+            process, None uses all available CPUs.
+        shards_per_worker (int): Minimum number of shards per worker
+
+    Returns:
+        EvaluationSummary: Line counts and corpus totals of every metric
+
+    Raises:
+        ValueError: If an unknown metric is requested or fewer than two columns are selected
+    """
+    metrics = tuple(metrics)
+    for name in metrics:
+        if name not in AVAILABLE_METRICS:
+            raise ValueError(f"Unknown metric: {name}. Available metrics: {AVAILABLE_METRICS}")
+    if len(corpus.columns) < 2:
+        raise ValueError("The corpus must select a reference and a hypothesis column")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    tasks = [(shard, converters, context_aware, metrics)
+             for shard in _shards_for(corpus, workers, shards_per_worker)]
+    results = map(_score_shard, tasks) if workers <= 1 else _map_bounded(_score_shard, tasks, workers)
+
+    totals = {name: {"edits": 0, "length": 0, "rate_sum": 0.0} for name in metrics}
+    rows = skipped = 0
+    for shard_rows, shard_skipped, sums in results:
+        rows += shard_rows
+        skipped += shard_skipped
+        for name, (edits, length, rate_sum) in zip(metrics, sums):
+            total = totals[name]
+            total["edits"] += edits
+            total["length"] += length
+            total["rate_sum"] += rate_sum
+    return _summarize(totals, rows, skipped)
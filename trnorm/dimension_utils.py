@@ -5,15 +5,52 @@ This module provides functions to handle dimensions and multiplication symbols
 in Turkish text, particularly for ASR normalization.
 """
 
-import re
-from trnorm.unit_utils import unit_translations
+from trnorm.patterns import compile_pattern, register_warmup
+from trnorm.unit_utils import get_unit_patterns
+
+# Patterns built from the unit patterns they were derived from, rebuilt when the units change
+_dimension_patterns = None
+
+@register_warmup
+def _get_dimension_patterns():
+    """
+    Get the unit-dependent patterns of this module for the current unit translations.
+    
+    Returns:
+        tuple: (spacing pattern used by preprocess_dimensions, combined pattern used by normalize_dimensions)
+    """
+    global _dimension_patterns
+    unit_patterns = get_unit_patterns()
+    cached = _dimension_patterns
+    if cached is None or cached[0] is not unit_patterns:
+        units = unit_patterns.units
+        # Spaces to add: around an 'x' between two digits, and between a number and a unit.
+        # The unit is only looked at, so a unit ending with a digit (mm3) can still be followed
+        # by another match.
+        spacing = r"(?<=\d)(?:(?P<x>[xX])(?=\d)|(?=" + units + r"))"
+        # One link of a dimension chain: a number with an optional unit, then an 'x' with
+        # spaces around it, or between two digits. The next number is only looked at,
+        # since it starts the next link of the chain.
+        link = (
+            r"(?P<number>\d+(?:\.\d+)?)(?:\s*(?P<unit>" + units + r"))?"
+            r"(?:\s+[xX]\s+|(?<=\d)[xX](?=\d))(?=\d)"
+        )
+        cached = (unit_patterns, compile_pattern(spacing, keep=False), compile_pattern(link + "|" + spacing, keep=False))
+        _dimension_patterns = cached
+    return cached[1], cached[2]
+
+def _add_spacing(match):
+    """Add the spaces of preprocess_dimensions for a match of the spacing pattern."""
+    x_symbol = match.group("x")
+    return f" {x_symbol} " if x_symbol else " "
 
 def preprocess_dimensions(text):
     """
     Preprocess text to add spaces between numbers and multiplication symbols.
     
     This function detects numbers and multiplication symbols that are merged together
-    and adds spaces between them to ensure proper normalization.
+    and adds spaces between them to ensure proper normalization. Spaces are also
+    added between numbers and units.
     
     Args:
         text (str): The input text containing potentially merged dimensions
@@ -21,24 +58,9 @@ def preprocess_dimensions(text):
     Returns:
         str: Text with spaces added between numbers and multiplication symbols
     """
-    processed_text = text
-    
-    # Add spaces between numbers and 'x' (for dimensions like 2x3)
-    processed_text = re.sub(r'(\d+)([xX])(\d+)', r'\1 \2 \3', processed_text)
-    
-    # Add spaces between numbers and units
-    # Create a pattern that matches any unit (with optional period)
-    unit_pattern = '|'.join([re.escape(unit) + r'\.?' for unit in unit_translations.keys()])
-    processed_text = re.sub(r'(\d+)(' + unit_pattern + r')', r'\1 \2', processed_text)
-    
-    # Handle multi-dimensional cases (like 2x3x4)
-    # Apply the pattern repeatedly until no more changes
-    previous_text = ""
-    while previous_text != processed_text:
-        previous_text = processed_text
-        processed_text = re.sub(r'(\d+)([xX])(\d+)', r'\1 \2 \3', processed_text)
-    
-    return processed_text
+    spacing, _ = _get_dimension_patterns()
+    # Every 'x' between digits is spaced in a single pass, including chains like 2x3x4
+    return spacing.sub(_add_spacing, text)
 
 
 def normalize_dimensions(text):
@@ -48,27 +70,30 @@ def normalize_dimensions(text):
     This function handles various dimension formats including multiple dimensions
     like 2x5x6x3 and dimensions with units like 3x4cm.
     
+    The text is parsed from left to right in a single pass: each link of a chain
+    ("2 x", "5cm x") is rewritten as soon as it is recognized, and the next number
+    starts the next link. Merged dimensions are handled directly, so the text does
+    not need to go through preprocess_dimensions first (the result is the same).
+    
     Args:
         text (str): The input text containing dimensional expressions
         
     Returns:
         str: The text with multiplication symbols replaced by 'çarpı'
     """
-    # First, preprocess to ensure spaces between numbers and 'x'
-    text = preprocess_dimensions(text)
+    _, pattern = _get_dimension_patterns()
     
-    # Replace 'x' with 'çarpı' when it's between numbers (dimensions)
-    pattern = r'(\d+(?:\.\d+)?(?:\s*(?:' + '|'.join([re.escape(unit) for unit in unit_translations.keys()]) + r'))?)\s+([xX])\s+(\d+(?:\.\d+)?)'
+    def replacement(match):
+        """Replace 'x' with 'çarpı' after a number, or add the spaces of preprocess_dimensions."""
+        number = match.group("number")
+        if number is None:
+            return _add_spacing(match)
+        unit = match.group("unit")
+        if unit:
+            number = f"{number} {unit}"
+        return f"{number} çarpı "
     
-    # Replace all occurrences of the pattern
-    while re.search(pattern, text):
-        def replacement(match):
-            """Replace 'x' with 'çarpı' between numbers."""
-            num1, x_symbol, num2 = match.groups()
-            return f"{num1.strip()} çarpı {num2.strip()}"
-        
-        # Replace one occurrence at a time to handle chains like 2 x 3 x 4
-        text = re.sub(pattern, replacement, text, count=1)
+    text = pattern.sub(replacement, text)
     
     # Clean up any double spaces
-    return re.sub(r'\s+', ' ', text).strip()
+    return " ".join(text.split())
@@ -0,0 +1,288 @@
+"""
+Streaming error analysis for ASR evaluation.
+
+This module summarizes the errors of a whole corpus without keeping the
+alignments in memory. Each reference/hypothesis pair is aligned with
+trnorm.metrics.align and the resulting operations are fed into bounded-memory
+counters:
+
+- top substituted word pairs (reference word -> hypothesis word)
+- most deleted and most inserted words
+- a character confusion matrix, built from the character alignment of
+  substituted word pairs
+
+Word counters use the space-saving algorithm, so their memory is bounded by
+their capacity regardless of the corpus size. Analyzers built on different
+workers (or different shards of a corpus) can be merged.
+
+Tokens are whitespace-separated words of the texts as given; pass a
+normalizer (e.g. trnorm.normalize) to key the counters off normalized tokens.
+"""
+
+import heapq
+
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from trnorm.metrics import DELETION, INSERTION, MATCH, SUBSTITUTION, align
+
+# Placeholder used in the character confusion matrix for a missing character
+EMPTY = ""
+
+
+class SpaceSavingCounter:
+    """
+    Approximate top-k counter with bounded memory (space-saving algorithm).
+
+    At most ``capacity`` keys are tracked. When a new key arrives and the
+    counter is full, the key with the smallest count is replaced and the new
+    key inherits that count as its overestimation error. Keys whose true
+    count exceeds N / capacity (N being the total of all updates) are
+    guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize the counter.
+
+        Args:
+            capacity (int): Maximum number of tracked keys
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # Min-heap of (count, key). Entries may be stale (lower than the current count)
+        # and are refreshed lazily when they reach the top of the heap.
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._counts
+
+    def _pop_min(self) -> Tuple[int, Hashable]:
+        """Remove and return the tracked key with the smallest count."""
+        while True:
+            count, key = heapq.heappop(self._heap)
+            current = self._counts[key]
+            if current == count:
+                return count, key
+            heapq.heappush(self._heap, (current, key))
+
+    def update(self, key: Hashable, count: int = 1) -> None:
+        """
+        Add ``count`` occurrences of ``key``.
+
+        Args:
+            key (Hashable): The key to count
+            count (int): Number of occurrences
+        """
+        self.total += count
+        counts = self._counts
+        if key in counts:
+            counts[key] += count
+            return
+
+        if len(counts) < self.capacity:
+            counts[key] = count
+            self._errors[key] = 0
+        else:
+            min_count, min_key = self._pop_min()
+            del counts[min_key]
+            del self._errors[min_key]
+            counts[key] = min_count + count
+            self._errors[key] = min_count
+        heapq.heappush(self._heap, (counts[key], key))
+
+    def count(self, key: Hashable) -> int:
+        """Get the (over)estimated count of a key, 0 if it is not tracked."""
+        return self._counts.get(key, 0)
+
+    def error(self, key: Hashable) -> int:
+        """Get the maximum overestimation of a key's count, 0 if it is not tracked."""
+        return self._errors.get(key, 0)
+
+    def most_common(self, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        Get the k keys with the highest counts.
+
+        Args:
+            k (Optional[int]): Number of keys to return. If None, all tracked keys are returned.
+
+        Returns:
+            List[Tuple[Hashable, int]]: (key, count) pairs sorted by decreasing count
+        """
+        items = sorted(self._counts.items(), key=lambda item: (-item[1], str(item[0])))
+        return items if k is None else items[:k]
+
+    def merge(self, other: "SpaceSavingCounter") -> "SpaceSavingCounter":
+        """
+        Merge another counter into this one.
+
+        A key missing from a full counter may still have occurred up to that
+        counter's minimum count, so it is credited with that minimum (and the
+        same amount is added to its error). The merged result keeps the
+        ``capacity`` keys with the highest counts.
+
+        Args:
+            other (SpaceSavingCounter): The counter to merge
+
+        Returns:
+            SpaceSavingCounter: This counter
+        """
+        self_min = min(self._counts.values()) if len(self._counts) >= self.capacity else 0
+        other_min = min(other._counts.values()) if len(other._counts) >= other.capacity else 0
+
+        merged_counts = {}
+        merged_errors = {}
+        for key in set(self._counts) | set(other._counts):
+            count = self._counts.get(key, self_min) + other._counts.get(key, other_min)
+            error = self._errors.get(key, self_min) + other._errors.get(key, other_min)
+            merged_counts[key] = count
+            merged_errors[key] = error
+
+        keep = heapq.nlargest(self.capacity, merged_counts, key=lambda key: (merged_counts[key], str(key)))
+        self._counts = {key: merged_counts[key] for key in keep}
+        self._errors = {key: merged_errors[key] for key in keep}
+        self._heap = [(count, key) for key, count in self._counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+        return self
+
+    def __repr__(self) -> str:
+        """Return a string representation of the counter."""
+        return f"SpaceSavingCounter(capacity={self.capacity}, tracked={len(self)}, total={self.total})"
+
+
+class ErrorAnalyzer:
+    """
+    Incremental, mergeable summary of the errors of a corpus.
+
+    Examples:
+        >>> analyzer = ErrorAnalyzer()
+        >>> analyzer.update("bu bir test", "bu bi test")
+        >>> analyzer.substitutions.most_common(1)
+        [(('bir', 'bi'), 1)]
+    """
+
+    def __init__(self, capacity: int = 1000, normalizer: Optional[Callable[[str], str]] = None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            capacity (int): Capacity of each word counter (see SpaceSavingCounter)
+            normalizer (Optional[Callable[[str], str]]): Optional function applied to both
+                texts before tokenization, e.g. trnorm.normalize. It must be picklable for
+                the analyzer to be sent between processes.
+        """
+        self.capacity = capacity
+        self.normalizer = normalizer
+        self.substitutions = SpaceSavingCounter(capacity)
+        self.deletions = SpaceSavingCounter(capacity)
+        self.insertions = SpaceSavingCounter(capacity)
+        # Keys are (reference char, hypothesis char), with EMPTY for deletions and insertions.
+        # Its size is bounded by the square of the alphabet.
+        self.char_confusions: Counter = Counter()
+        self.operations: Counter = Counter({MATCH: 0, SUBSTITUTION: 0, DELETION: 0, INSERTION: 0})
+        self.utterances = 0
+
+    def update(self, reference: str, hypothesis: str) -> None:
+        """
+        Align a reference/hypothesis pair and add its errors to the summary.
+
+        Args:
+            reference (str): The reference text
+            hypothesis (str): The hypothesis text
+        """
+        if self.normalizer is not None:
+            reference = self.normalizer(reference)
+            hypothesis = self.normalizer(hypothesis)
+
+        self.utterances += 1
+        operations = self.operations
+        for operation, ref_word, hyp_word in align(reference.split(), hypothesis.split()):
+            operations[operation] += 1
+            if operation == SUBSTITUTION:
+                self.substitutions.update((ref_word, hyp_word))
+                self._update_chars(ref_word, hyp_word)
+            elif operation == DELETION:
+                self.deletions.update(ref_word)
+            elif operation == INSERTION:
+                self.insertions.update(hyp_word)
+
+    def _update_chars(self, ref_word: str, hyp_word: str) -> None:
+        """Add the character confusions of a substituted word pair."""
+        confusions = self.char_confusions
+        for operation, ref_char, hyp_char in align(ref_word, hyp_word):
+            if operation != MATCH:
+                confusions[(ref_char or EMPTY, hyp_char or EMPTY)] += 1
+
+    def update_many(self, references: Iterable[str], hypotheses: Iterable[str]) -> None:
+        """
+        Add the errors of many reference/hypothesis pairs.
+
+        Args:
+            references (Iterable[str]): Reference texts
+            hypotheses (Iterable[str]): Hypothesis texts, one per reference
+        """
+        for reference, hypothesis in zip(references, hypotheses):
+            self.update(reference, hypothesis)
+
+    def merge(self, other: "ErrorAnalyzer") -> "ErrorAnalyzer":
+        """
+        Merge the summary of another analyzer (e.g. from another worker) into this one.
+
+        Args:
+            other (ErrorAnalyzer): The analyzer to merge
+
+        Returns:
+            ErrorAnalyzer: This analyzer
+        """
+        self.substitutions.merge(other.substitutions)
+        self.deletions.merge(other.deletions)
+        self.insertions.merge(other.insertions)
+        self.char_confusions.update(other.char_confusions)
+        self.operations.update(other.operations)
+        self.utterances += other.utterances
+        return self
+
+    def confusion_matrix(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the character confusion matrix as nested dictionaries.
+
+        Returns:
+            Dict[str, Dict[str, int]]: matrix[reference char][hypothesis char] = count,
+                with EMPTY ("") standing for a missing character
+        """
+        matrix: Dict[str, Dict[str, int]] = {}
+        for (ref_char, hyp_char), count in self.char_confusions.items():
+            matrix.setdefault(ref_char, {})[hyp_char] = count
+        return matrix
+
+    def report(self, k: int = 20) -> Dict[str, Any]:
+        """
+        Summarize the most frequent errors.
+
+        Args:
+            k (int): Number of entries in each top list
+
+        Returns:
+            Dict[str, Any]: Operation counts and the top substitutions, deletions,
+                insertions and character confusions
+        """
+        return {
+            "utterances": self.utterances,
+            "operations": dict(self.operations),
+            "substitutions": self.substitutions.most_common(k),
+            "deletions": self.deletions.most_common(k),
+            "insertions": self.insertions.most_common(k),
+            "char_confusions": self.char_confusions.most_common(k),
+        }
+
+    def __repr__(self) -> str:
+        """Return a string representation of the analyzer."""
+        return f"ErrorAnalyzer(utterances={self.utterances}, operations={dict(self.operations)})"
@@ -0,0 +1,615 @@
+"""
+Streaming evaluation of ASR result logs.
+
+A log holds one reference/hypothesis pair per row, as a TSV file with a
+header, a JSON array of objects or JSON lines. evaluate_log reads the log
+in batches, normalizes both sides of every pair, scores the batch with the
+corpus scoring engine (trnorm.corpus_metrics) and writes the per-row results
+before reading the next batch, so memory use depends on the batch size and
+not on the size of the log. Batches can be processed by worker processes.
+
+Examples:
+    >>> summary = evaluate_log("results.tsv", output="rows.tsv", summary_output="summary.json")
+    >>> summary.metrics["wer"]["rate"]
+    0.0842
+"""
+
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from trnorm.corpus_metrics import _EMPTY_RATES, AVAILABLE_METRICS, score_corpus
+from trnorm.normalizer import normalize
+
+# Log formats that can be read
+LOG_FORMATS = ("tsv", "json", "jsonl")
+
+# Formats guessed from file extensions, other files are read as TSV
+_EXTENSION_FORMATS = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Characters read at a time from JSON array logs
+JSON_CHUNK_SIZE = 1 << 16
+
+Column = Union[str, int]
+
+
+class ColumnMapping(NamedTuple):
+    """
+    Columns of a log holding the reference, the hypothesis and optionally a row id.
+
+    Columns are names (TSV header fields or JSON keys) or 0-based positions.
+    The defaults match the column names of our ASR logs.
+    """
+
+    reference: Column = "r"
+    hypothesis: Column = "p"
+    id: Optional[Column] = None
+
+
+class LogRow(NamedTuple):
+    """A reference/hypothesis pair read from a log."""
+
+    # Number of the row in the log, starting at 1 (the header is not counted)
+    line: int
+    id: Optional[str]
+    reference: str
+    hypothesis: str
+    # Byte offset of the end of the row in the log, see LogReader.read
+    end: int
+
+
+class EvaluationSummary(NamedTuple):
+    """Result of evaluate_log."""
+
+    # Number of evaluated rows
+    rows: int
+    # Number of rows skipped because a mapped column was missing or invalid
+    skipped: int
+    # Mapping of metric name to "edits", "length", "rate" (corpus rate) and "mean" (mean row rate)
+    metrics: Dict[str, Dict[str, float]]
+
+
+def detect_format(path: str) -> str:
+    """
+    Guess the format of a log from its file extension.
+
+    Args:
+        path (str): Path of the log
+
+    Returns:
+        str: "json" or "jsonl" for JSON files, "tsv" otherwise
+    """
+    return _EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), "tsv")
+
+
+def _iter_json_array(file: TextIO, chunk_size: int = JSON_CHUNK_SIZE, encoding: str = "utf-8",
+                     offset: int = 0, resume: bool = False) -> Iterator[Tuple[Any, int]]:
+    """
+    Yield the items of a JSON array one at a time, reading the file in chunks.
+
+    Args:
+        file (TextIO): The file, opened without newline translation
+        chunk_size (int): Number of characters read at a time
+        encoding (str): Encoding of the file, used to compute byte offsets
+        offset (int): Byte offset of the start of the file in the log
+        resume (bool): The file starts right after an item of the array instead
+            of at the start of the array
+
+    Yields:
+        Tuple[Any, int]: Each item and the byte offset of its end in the log
+
+    Raises:
+        ValueError: If the file does not contain a valid JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    # Byte offset of buffer[0], and how much of the buffer was encoded to compute offsets
+    base = offset
+    encoded = 0
+    encoded_bytes = 0
+
+    def byte_offset(index):
+        nonlocal encoded, encoded_bytes
+        encoded_bytes += len(buffer[encoded:index].encode(encoding))
+        encoded = index
+        return base + encoded_bytes
+
+    def replace_buffer(chunk):
+        nonlocal buffer, position, eof, base, encoded, encoded_bytes
+        eof = not chunk
+        base = byte_offset(position)
+        buffer = buffer[position:] + chunk
+        position = encoded = encoded_bytes = 0
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            replace_buffer(file.read(chunk_size))
+
+    def expect(characters):
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] not in characters:
+            raise ValueError(f"Invalid JSON log: expected one of {characters!r} at a top-level position")
+        return buffer[position]
+
+    if not resume:
+        expect("[")
+        position += 1
+        if expect(']{["-0123456789tfn') == "]":
+            return
+    elif expect(",]") == "]":
+        return
+    else:
+        position += 1
+
+    while True:
+        skip_whitespace()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # A number at the end of the buffer might continue in the next chunk
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError("Invalid JSON log: malformed or truncated array item") from None
+            replace_buffer(file.read(chunk_size))
+        yield item, byte_offset(end)
+        position = end
+        if expect(",]") == "]":
+            return
+        position += 1
+
+
+class LogReader:
+    """
+    Iterable over the reference/hypothesis pairs of a log.
+
+    Rows where a mapped column is missing or empty (None) are skipped and
+    counted in ``skipped``. Each iteration reads the file again. The path "-"
+    reads the log from standard input.
+    """
+
+    def __init__(self, path: str, format: Optional[str] = None, columns: Optional[ColumnMapping] = None,
+                 header: bool = True, encoding: str = "utf-8"):
+        """
+        Initialize the reader.
+
+        Args:
+            path (str): Path of the log
+            format (Optional[str]): One of LOG_FORMATS, guessed from the extension if None
+            columns (Optional[ColumnMapping]): Columns to read, ColumnMapping() if None
+            header (bool): Whether the first line of a TSV log holds the column names
+            encoding (str): Encoding of the log
+
+        Raises:
+            ValueError: If the format is unknown, or a TSV column is a name but the log has no header
+        """
+        self.path = path
+        self.format = format or detect_format(path)
+        if self.format not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {self.format}. Available formats: {LOG_FORMATS}")
+        self.columns = columns or ColumnMapping()
+        if self.format == "tsv" and not header and any(isinstance(column, str) for column in self.columns):
+            raise ValueError("Columns of a TSV log without a header must be given by position")
+        self.header = header
+        self.encoding = encoding
+        self.skipped = 0
+
+    def __iter__(self) -> Iterator[LogRow]:
+        return self.read()
+
+    def read(self, offset: int = 0, line: int = 0) -> Iterator[LogRow]:
+        """
+        Yield the rows of the log, optionally starting after a row read before.
+
+        Args:
+            offset (int): Byte offset to start at, the ``end`` of a row read before
+            line (int): The ``line`` of that row, so that rows keep their numbers
+
+        Yields:
+            LogRow: The rows that have all mapped columns
+
+        Raises:
+            ValueError: If the log cannot be parsed, or an offset is given for standard input
+        """
+        self.skipped = 0
+        if self.path == "-":
+            if offset:
+                raise ValueError("Standard input cannot be read from an offset")
+            source = contextlib.nullcontext(sys.stdin.buffer)
+        else:
+            source = open(self.path, "rb")
+        with source as file:
+            columns = self.columns
+            position = 0
+            if self.format == "tsv" and self.header:
+                names = file.readline()
+                position = len(names)
+                columns = self._header_positions(names.decode(self.encoding).rstrip("\r\n").split("\t"))
+            if offset > position:
+                file.seek(offset)
+                position = offset
+
+            if self.format == "json":
+                text = io.TextIOWrapper(file, encoding=self.encoding, newline="")
+                records = _iter_json_array(text, encoding=self.encoding, offset=position, resume=offset > 0)
+            else:
+                text = None
+                records = self._line_records(file, position)
+
+            reference_column, hypothesis_column, id_column = columns
+            try:
+                for number, (record, end) in enumerate(records, line + 1):
+                    reference = self._field(record, reference_column)
+                    hypothesis = self._field(record, hypothesis_column)
+                    if reference is None or hypothesis is None:
+                        self.skipped += 1
+                        continue
+                    row_id = self._field(record, id_column) if id_column is not None else None
+                    yield LogRow(number, None if row_id is None else str(row_id), str(reference), str(hypothesis), end)
+            finally:
+                # The binary file is closed by its own context
+                if text is not None:
+                    text.detach()
+
+    def _header_positions(self, names: List[str]) -> ColumnMapping:
+        """Replace the column names of the mapping by their positions in a TSV header."""
+        positions = {name: i for i, name in enumerate(names)}
+        missing = [column for column in self.columns if isinstance(column, str) and column not in positions]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in the header of {self.path}: {names}")
+        return ColumnMapping(*(positions.get(column, column) for column in self.columns))
+
+    def _line_records(self, file: BinaryIO, position: int) -> Iterator[Tuple[Any, int]]:
+        """
+        Yield the records of a TSV or JSON lines log with the byte offset of their end.
+
+        TSV records are lists of fields; texts may contain quotes, so fields are only
+        separated by tabs. JSON lines records are None for lines that are not valid JSON.
+        Blank lines are not records.
+        """
+        tsv = self.format == "tsv"
+        for data in file:
+            position += len(data)
+            text = data.decode(self.encoding).rstrip("\r\n")
+            if tsv:
+                if text:
+                    yield text.split("\t"), position
+            elif text.strip():
+                try:
+                    yield json.loads(text), position
+                except json.JSONDecodeError:
+                    yield None, position
+
+    @staticmethod
+    def _field(record: Any, column: Column) -> Any:
+        """Get a column of a record, or None if it does not have it."""
+        try:
+            return record[column]
+        except (IndexError, KeyError, TypeError):
+            return None
+
+
+def _evaluate_batch(task: Tuple[List[LogRow], Optional[List[Callable]], bool, Tuple[str, ...]]):
+    """
+    Normalize and score a batch of rows. This is the unit of work sent to worker processes.
+
+    Returns:
+        Tuple of the normalized references, the normalized hypotheses and, for each
+        metric in order, the (edits, lengths) arrays of the rows
+    """
+    rows, converters, context_aware, metrics = task
+    references = []
+    hypotheses = []
+    for row in rows:
+        if context_aware:
+            # Each side is normalized with the other one as its context
+            references.append(normalize(row.reference, converters, row.hypothesis))
+            hypotheses.append(normalize(row.hypothesis, converters, row.reference))
+        else:
+            references.append(normalize(row.reference, converters))
+            hypotheses.append(normalize(row.hypothesis, converters))
+    scores = score_corpus(references, hypotheses, metrics)
+    return references, hypotheses, [(scores[name].edits, scores[name].lengths) for name in metrics]
+
+
+def _map_bounded(function: Callable, tasks: Iterable, workers: int) -> Iterator:
+    """
+    Apply a function to tasks in worker processes, yielding results in task order.
+
+    At most two tasks per worker are pending at any time, so tasks are read from
+    the iterable only as fast as they are processed.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _RowWriter:
+    """Writer of per-row results as TSV or JSON lines, chosen by the file extension."""
+
+    def __init__(self, path: str, metrics: Sequence[str], offset: Optional[int] = None):
+        """
+        Open the file, or reopen it at a checkpointed size to append more rows.
+
+        Raises:
+            ValueError: If the file is shorter than the offset
+        """
+        if offset is None:
+            self.file = open(path, "w", encoding="utf-8", newline="")
+        else:
+            if not os.path.exists(path) or os.path.getsize(path) < offset:
+                raise ValueError(f"Cannot resume: {path} is shorter than recorded in the checkpoint")
+            # Rows written after the checkpoint are written again
+            os.truncate(path, offset)
+            self.file = open(path, "a", encoding="utf-8", newline="")
+        self.jsonl = detect_format(path) in ("json", "jsonl")
+        self.fields = ["line", "id", "reference", "hypothesis", "normalized_reference", "normalized_hypothesis"]
+        for name in metrics:
+            self.fields += [f"{name}_edits", f"{name}_length", name]
+        if not self.jsonl:
+            self.writer = csv.writer(self.file, delimiter="\t", lineterminator="\n")
+            if offset is None:
+                self.writer.writerow(self.fields)
+
+    def write(self, values: List[Any]) -> None:
+        if self.jsonl:
+            self.file.write(json.dumps(dict(zip(self.fields, values)), ensure_ascii=False) + "\n")
+        else:
+            self.writer.writerow(["" if value is None else value for value in values])
+
+    def flush(self) -> int:
+        """Flush the file and return its size in bytes."""
+        self.file.flush()
+        return os.fstat(self.file.fileno()).st_size
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _summarize(totals: Dict[str, Dict[str, float]], rows: int, skipped: int) -> EvaluationSummary:
+    """
+    Build a summary from metric accumulators.
+
+    Args:
+        totals (Dict[str, Dict[str, float]]): Mapping of metric name to the sums of the
+            "edits", "length" and "rate_sum" (row rates) of the evaluated rows
+        rows (int): Number of evaluated rows
+        skipped (int): Number of skipped rows
+
+    Returns:
+        EvaluationSummary: The summary
+    """
+    summary_metrics = {}
+    for name, total in totals.items():
+        length = total["length"]
+        summary_metrics[name] = {
+            "edits": total["edits"],
+            "length": length,
+            "rate": total["edits"] / length if length else _EMPTY_RATES[name],
+            "mean": total["rate_sum"] / rows if rows else _EMPTY_RATES[name],
+        }
+    return EvaluationSummary(rows, skipped, summary_metrics)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """Write data as JSON, replacing the previous file atomically."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(temporary_path, path)
+
+
+def _converter_name(converter: Callable) -> str:
+    """Get a name identifying a converter across runs."""
+    name = getattr(converter, "__qualname__", None) or getattr(converter, "name", None) or type(converter).__name__
+    return f"{getattr(converter, '__module__', '')}.{name}"
+
+
+def _load_checkpoint(path: str, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Load a checkpoint written by evaluate_log.
+
+    Returns:
+        Optional[Dict[str, Any]]: The checkpoint, or None if there is none yet
+
+    Raises:
+        ValueError: If the checkpoint was written for other arguments or another log
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            state = json.load(file)
+    except FileNotFoundError:
+        return None
+    if state.get("fingerprint") != fingerprint:
+        raise ValueError(f"Checkpoint {path} was written for other arguments or another log; "
+                         "delete it to start over")
+    return state
+
+
+def evaluate_log(path: str, output: Optional[str] = None, summary_output: Optional[str] = None,
+                 format: Optional[str] = None, columns: Optional[ColumnMapping] = None, header: bool = True,
+                 converters: Optional[List[Callable]] = None, context_aware: bool = True,
+                 metrics: Sequence[str] = ("wer", "cer"), batch_size: int = 1000,
+                 workers: Optional[int] = 1, encoding: str = "utf-8", checkpoint: Optional[str] = None,
+                 checkpoint_interval: float = 60.0) -> EvaluationSummary:
+    """
+    Normalize and score every reference/hypothesis pair of an ASR log.
+
+    The log is processed in batches of batch_size rows. The results of a batch
+    are written to output, and the summary to summary_output, before more rows
+    are read, so both files can be followed while a large log is evaluated.
+
+    With a checkpoint path, the position in the log and in the output and the
+    metric totals are saved at most every checkpoint_interval seconds, after a
+    batch is written. Calling evaluate_log again with the same arguments then
+    resumes after the last checkpointed batch, truncating rows written after
+    it from the output, and gives the same results as an uninterrupted run.
+    The number of workers and the batch size can differ between runs.
+
+    Args:
+        path (str): Path of the log, "-" for standard input
+        output (Optional[str]): Path of the per-row results, written as JSON lines if it ends
+            with .json or .jsonl, as TSV otherwise. Nothing is written if None.
+        summary_output (Optional[str]): Path of the summary, written as JSON after every batch
+            ("complete" is true once the whole log is evaluated). Nothing is written if None.
+        format (Optional[str]): One of LOG_FORMATS, guessed from the extension if None
+        columns (Optional[ColumnMapping]): Columns of the log to read, ColumnMapping() if None
+        header (bool): Whether the first line of a TSV log holds the column names
+        converters (Optional[List[Callable]]): Conversion functions used by trnorm.normalize,
+            DEFAULT_PIPELINE if None. They must be picklable (e.g. module-level functions)
+            when workers are used.
+        context_aware (bool): Normalize each side with the other one as context
+        metrics (Sequence[str]): Metrics to compute, any of "wer", "cer" and "levenshtein"
+        batch_size (int): Number of rows normalized and scored together
+        workers (Optional[int]): Number of worker processes. 1 evaluates in the current
+            process, None uses all available CPUs.
+        encoding (str): Encoding of the log
+        checkpoint (Optional[str]): Path of the checkpoint, a JSON file. A log read from
+            standard input cannot be checkpointed.
+        checkpoint_interval (float): Minimum number of seconds between two checkpoints
+
+    Returns:
+        EvaluationSummary: Row counts and corpus totals of every metric
+
+    Raises:
+        ValueError: If an argument is invalid, the log cannot be parsed or the
+            checkpoint does not match the arguments
+    """
+    metrics = tuple(metrics)
+    for name in metrics:
+        if name not in AVAILABLE_METRICS:
+            raise ValueError(f"Unknown metric: {name}. Available metrics: {AVAILABLE_METRICS}")
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    reader = LogReader(path, format, columns, header, encoding)
+    totals = {name: {"edits": 0, "length": 0, "rate_sum": 0.0} for name in metrics}
+    count = 0
+    # Line of the last evaluated row and end of that row in the log and in the output
+    line = 0
+    offset = 0
+    output_offset = None
+
+    state = None
+    if checkpoint is not None:
+        if path == "-":
+            raise ValueError("A log read from standard input cannot be checkpointed")
+        fingerprint = json.loads(json.dumps({
+            "log": os.path.abspath(path),
+            "size": os.path.getsize(path),
+            "format": reader.format,
+            "columns": reader.columns,
+            "header": header,
+            "encoding": encoding,
+            "converters": None if converters is None else [_converter_name(converter) for converter in converters],
+            "context_aware": context_aware,
+            "metrics": metrics,
+            "output": None if output is None else os.path.abspath(output),
+        }))
+        state = _load_checkpoint(checkpoint, fingerprint)
+        if state is not None:
+            totals, count, line, offset, output_offset = (
+                state["totals"], state["rows"], state["line"], state["offset"], state["output_offset"])
+    # Rows skipped before the current position of the reader
+    skipped_before = line - count
+
+    def summarize(skipped):
+        return _summarize(totals, count, skipped)
+
+    def save_checkpoint(skipped, complete):
+        _write_json(checkpoint, {"fingerprint": fingerprint, "complete": complete, "offset": offset, "line": line,
+                                 "rows": count, "skipped": skipped, "totals": totals, "output_offset": output_offset})
+
+    if state is not None and state["complete"]:
+        return summarize(state["skipped"])
+
+    rows_iterator = reader.read(offset, line)
+    batches = iter(lambda: list(islice(rows_iterator, batch_size)), [])
+    tasks = ((batch, converters, context_aware, metrics) for batch in batches)
+    # The rows of a batch are needed again to write its results
+    submitted = deque()
+
+    def track(tasks):
+        for task in tasks:
+            submitted.append(task[0])
+            yield task
+
+    if workers <= 1:
+        results = map(_evaluate_batch, track(tasks))
+    else:
+        results = _map_bounded(_evaluate_batch, track(tasks), workers)
+
+    last_checkpoint = time.monotonic()
+    writer = _RowWriter(output, metrics, output_offset) if output is not None else None
+    try:
+        for references, hypotheses, scores in results:
+            rows = submitted.popleft()
+            for i, row in enumerate(rows):
+                values = [row.line, row.id, row.reference, row.hypothesis, references[i], hypotheses[i]]
+                for name, (edits, lengths) in zip(metrics, scores):
+                    length = lengths[i]
+                    rate = edits[i] / length if length else _EMPTY_RATES[name]
+                    total = totals[name]
+                    total["edits"] += edits[i]
+                    total["length"] += length
+                    total["rate_sum"] += rate
+                    values += [edits[i], length, rate]
+                if writer is not None:
+                    writer.write(values)
+            count += len(rows)
+            line, offset = rows[-1].line, rows[-1].end
+            if writer is not None:
+                output_offset = writer.flush()
+            if summary_output is not None:
+                _write_json(summary_output, {"log": path, "complete": False, **summarize(line - count)._asdict()})
+            if checkpoint is not None and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                save_checkpoint(line - count, complete=False)
+                last_checkpoint = time.monotonic()
+    finally:
+        if writer is not None:
+            writer.close()
+
+    summary = summarize(skipped_before + reader.skipped)
+    if summary_output is not None:
+        _write_json(summary_output, {"log": path, "complete": True, **summary._asdict()})
+    if checkpoint is not None:
+        save_checkpoint(summary.skipped, complete=True)
+    return summary
@@ -1,204 +1,219 @@
+"""
+Exception lexicon for the vowel harmony of the suffixes "ile" and "ise".
+
+Some words, mostly loanwords ending in "l" such as "alkol" or "gol", take
+front-vowel endings although their last vowel is a back vowel
+("alkolle", "golse"). The lexicon maps these words to their ("ile", "ise")
+endings and is used by trnorm.text_utils.ekle.
+
+The built-in words are stored in data/istisnalar.tsv and loaded on first use,
+so importing trnorm does not pay for the lexicon. Domain-specific words can be
+added at runtime with add_exceptions or load_exceptions.
+
+Words are looked up in lowercase without circumflexes, e.g. "ALKOL" and
+"Alkol" both find "alkol".
+"""
+
+import os
+import threading
+
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+# Default endings of an exception word for "ile" and "ise"
 suffix_tuple = ("le", "se")
 
-ek_istisnalar_unlu_uyumu = {
-    "akropol": suffix_tuple,
-    "alkol": suffix_tuple,
-    "alveol": suffix_tuple,
-    "amiral": suffix_tuple,
-    "anormal": suffix_tuple,
-    "antimikrobiyal": suffix_tuple,
-    "antiviral": suffix_tuple,
-    "atol": suffix_tuple,
-    "azol": suffix_tuple,
-    "bandrol": suffix_tuple,
-    "başrol": suffix_tuple,
-    "bemol": suffix_tuple,
-    "berkemal": suffix_tuple,
-    "bienal": suffix_tuple,
-    "biomedikal": suffix_tuple,
-    "biyomedikal": suffix_tuple,
-    "brakisefal": suffix_tuple,
-    "celal": suffix_tuple,
-    "cemal": suffix_tuple,
-    "deccal": suffix_tuple,
-    "desimal": suffix_tuple,
-    "diagonal": suffix_tuple,
-    "dijital": suffix_tuple,
-    "diastol": suffix_tuple,
-    "diyagonal": suffix_tuple,
-    "diyastol": suffix_tuple,
-    "dömifinal": suffix_tuple,
-    "efdal": suffix_tuple,
-    "ekol": suffix_tuple,
-    "ekstrasistol": suffix_tuple,
-    "emsal": suffix_tuple,
-    "etanol": suffix_tuple,
-    "etfal": suffix_tuple,
-    "faul": suffix_tuple,
-    "federal": suffix_tuple,
-    "feldmareşal": suffix_tuple,
-    "fenol": suffix_tuple,
-    "feodal": suffix_tuple,
-    "fetal": suffix_tuple,
-    "festival": suffix_tuple,
-    "final": suffix_tuple,
-    "fleol": suffix_tuple,
-    "fol": suffix_tuple,
-    "fümerol": suffix_tuple,
-    "general": suffix_tuple,
-    "glikol": suffix_tuple,
-    "global": suffix_tuple,
-    "gol": suffix_tuple,
-    "gribal": suffix_tuple,
-    "hakikat": suffix_tuple,
-    "hayal": suffix_tuple,
-    "helal": suffix_tuple,
-    "hidrozol": suffix_tuple,
-    "hidrotermal": suffix_tuple,
-    "hilal": suffix_tuple,
-    "hiperbol": suffix_tuple,
-    "hol": suffix_tuple,
-    "ideal": suffix_tuple,
-    "idol": suffix_tuple,
-    "iğfal": suffix_tuple,
-    "ihlal": suffix_tuple,
-    "ihmal": suffix_tuple,
-    "ihtilal": suffix_tuple,
-    "ihtimal": suffix_tuple,
-    "ikbal": suffix_tuple,
-    "ikmal": suffix_tuple,
-    "illegal": suffix_tuple,
-    "imal": suffix_tuple,
-    "immoral": suffix_tuple,
-    "imtisal": suffix_tuple,
-    "infial": suffix_tuple,
-    "inhilal": suffix_tuple,
-    "integral": suffix_tuple,
-    "intihal": suffix_tuple,
-    "intikal": suffix_tuple,
-    "iptal": suffix_tuple,
-    "irtical": suffix_tuple,
-    "irtihal": suffix_tuple,
-    "ishal": suffix_tuple,
-    "istihsal": suffix_tuple,
-    "istikbal": suffix_tuple,
-    "istiklal": suffix_tuple,
-    "ithal": suffix_tuple,
-    "itidal": suffix_tuple,
-    "izmihlal": suffix_tuple,
-    "işgal": suffix_tuple,
-    "iştigal": suffix_tuple,
-    "jeotermal": suffix_tuple,
-    "jurnal": suffix_tuple,
-    "kabul": suffix_tuple,
-    "kapital": suffix_tuple,
-    "karambol": suffix_tuple,
-    "kardinal": suffix_tuple,
-    "katedral": suffix_tuple,
-    "kefal": suffix_tuple,
-    "kemal": suffix_tuple,
-    "kolesterol": suffix_tuple,
-    "kolonyal": suffix_tuple,
-    "kontrol": suffix_tuple,
-    "koramiral": suffix_tuple,
-    "korgeneral": suffix_tuple,
-    "krezol": suffix_tuple,
-    "kristal": suffix_tuple,
-    "kriminal": suffix_tuple,
-    "legal": suffix_tuple,
-    "liberal": suffix_tuple,
-    "lokal": suffix_tuple,
-    "lugol": suffix_tuple,
-    "lügol": suffix_tuple,
-    "mahal": suffix_tuple,
-    "mareşal": suffix_tuple,
-    "marjinal": suffix_tuple,
-    "materyal": suffix_tuple,
-    "mecal": suffix_tuple,
-    "medikal": suffix_tuple,
-    "medikososyal": suffix_tuple,
-    "megapol": suffix_tuple,
-    "melal": suffix_tuple,
-    "mentol": suffix_tuple,
-    "metal": suffix_tuple,
-    "metanol": suffix_tuple,
-    "meyal": suffix_tuple,
-    "meyyal": suffix_tuple,
-    "mezosefal": suffix_tuple,
-    "minimal": suffix_tuple,
-    "mineral": suffix_tuple,
-    "minval": suffix_tuple,
-    "misal": suffix_tuple,
-    "miskal": suffix_tuple,
-    "monopol": suffix_tuple,
-    "moral": suffix_tuple,
-    "müstahal": suffix_tuple,
-    "müstehal": suffix_tuple,
-    "müzikal": suffix_tuple,
-    "müzikhol": suffix_tuple,
-    "münhal": suffix_tuple,
-    "nekropol": suffix_tuple,
-    "neoliberal": suffix_tuple,
-    "nominal": suffix_tuple,
-    "normal": suffix_tuple,
-    "oligopol": suffix_tuple,
-    "opal": suffix_tuple,
-    "optimal": suffix_tuple,
-    "oramiral": suffix_tuple,
-    "orgeneral": suffix_tuple,
-    "orijinal": suffix_tuple,
-    "oryantal": suffix_tuple,
-    "otokontrol": suffix_tuple,
-    "oval": suffix_tuple,
-    "parabol": suffix_tuple,
-    "pastoral": suffix_tuple,
-    "peştamal": suffix_tuple,
-    "peştemal": suffix_tuple,
-    "petrol": suffix_tuple,
-    "profiterol": suffix_tuple,
-    "protokol": suffix_tuple,
-    "psikososyal": suffix_tuple,
-    "radikal": suffix_tuple,
-    "resital": suffix_tuple,
-    "rical": suffix_tuple,
-    "riyal": suffix_tuple,
-    "rol": suffix_tuple,
-    "saat": suffix_tuple,
-    "santral": suffix_tuple,
-    "sembol": suffix_tuple,
-    "sinyal": suffix_tuple,
-    "sistol": suffix_tuple,
-    "sosyal": suffix_tuple,
-    "spesiyal": suffix_tuple,
-    "spiral": suffix_tuple,
-    "sual": suffix_tuple,
-    "suistimal": suffix_tuple,
-    "sukutuhayal": suffix_tuple,
-    "sürreal": suffix_tuple,
-    "sürrenal": suffix_tuple,
-    "şarampol": suffix_tuple,
-    "şevval": suffix_tuple,
-    "şimal": suffix_tuple,
-    "telal": suffix_tuple,
-    "terminal": suffix_tuple,
-    "termal": suffix_tuple,
-    "timsal": suffix_tuple,
-    "total": suffix_tuple,
-    "trol": suffix_tuple,
-    "troll": suffix_tuple,
-    "tropikal": suffix_tuple,
-    "tuğgeneral": suffix_tuple,
-    "tuval": suffix_tuple,
-    "tümamiral": suffix_tuple,
-    "tümgeneral": suffix_tuple,
-    "vebal": suffix_tuple,
-    "viral": suffix_tuple,
-    "visamiral": suffix_tuple,
-    "viyol": suffix_tuple,
-    "vokal": suffix_tuple,
-    "zeval": suffix_tuple,
-    "zülal": suffix_tuple,
-    "zühal": suffix_tuple,
-    "turnusol": suffix_tuple,
-    "turnüsol": suffix_tuple,
-}
\ No newline at end of file
+# Packaged lexicon, one word per line with optional tab-separated endings
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "istisnalar.tsv")
+
+# The lexicon as (words with the default endings, words with other endings mapped to their
+# endings), or None until it is loaded. The pair is replaced (never mutated) on updates,
+# so lookups do not need the lock.
+_lexicon: Optional[Tuple[FrozenSet[str], Dict[str, Tuple[str, str]]]] = None
+_lock = threading.Lock()
+
+
+def _normalize(word: str) -> str:
+    """Get the lookup form of a word (lowercase, without circumflexes)."""
+    from trnorm.text_utils import sapkasiz, turkish_lower
+
+    return sapkasiz(turkish_lower(word.strip()))
+
+
+def _read_lexicon(path: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Read a lexicon file.
+
+    Empty lines and lines starting with "#" are ignored. Other lines contain a
+    word, optionally followed by its "ile" and "ise" endings, separated by tabs.
+
+    Raises:
+        ValueError: If a line has a word and a single ending, or more than three fields
+    """
+    entries = {}
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if len(fields) == 1:
+                entries[fields[0]] = suffix_tuple
+            elif len(fields) == 3:
+                entries[fields[0]] = (fields[1], fields[2])
+            else:
+                raise ValueError(f"{path}:{line_number}: expected a word and optionally two endings")
+    return entries
+
+
+def _merge(entries: Dict[str, Tuple[str, str]]) -> None:
+    """Add normalized entries to the lexicon. Must be called with the lock held."""
+    global _lexicon
+    words, custom_endings = _lexicon if _lexicon is not None else (frozenset(), {})
+    words = set(words)
+    custom_endings = dict(custom_endings)
+    for word, endings in entries.items():
+        if endings == suffix_tuple:
+            words.add(word)
+            custom_endings.pop(word, None)
+        else:
+            custom_endings[word] = endings
+            words.discard(word)
+    _lexicon = (frozenset(words), custom_endings)
+
+
+def _ensure_loaded() -> None:
+    """Load the packaged lexicon on first use."""
+    if _lexicon is None:
+        with _lock:
+            if _lexicon is None:
+                _merge(_read_lexicon(DATA_PATH))
+
+
+def lookup(key: str) -> Optional[Tuple[str, str]]:
+    """
+    Get the endings of a word that is already in lookup form.
+
+    This is the fast path used by ekle, which normalizes words itself.
+
+    Args:
+        key (str): The word, lowercase and without circumflexes
+
+    Returns:
+        Optional[Tuple[str, str]]: The ("ile", "ise") endings, or None if the word is not an exception
+    """
+    if _lexicon is None:
+        _ensure_loaded()
+    words, custom_endings = _lexicon
+    if key in words:
+        return suffix_tuple
+    return custom_endings.get(key)
+
+
+def get_exception(word: str) -> Optional[Tuple[str, str]]:
+    """
+    Get the endings of a vowel harmony exception.
+
+    Args:
+        word (str): The word, in any case
+
+    Returns:
+        Optional[Tuple[str, str]]: The ("ile", "ise") endings, or None if the word is not an exception
+
+    Examples:
+        >>> get_exception("Alkol")
+        ('le', 'se')
+    """
+    return lookup(_normalize(word))
+
+
+def get_exceptions(words: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Look up many words at once.
+
+    Args:
+        words (Iterable[str]): The words, in any case
+
+    Returns:
+        Dict[str, Tuple[str, str]]: The words that are exceptions (as given), mapped to
+            their ("ile", "ise") endings
+    """
+    found = {}
+    for word in words:
+        endings = lookup(_normalize(word))
+        if endings is not None:
+            found[word] = endings
+    return found
+
+
+def is_exception(word: str) -> bool:
+    """Check whether a word is a vowel harmony exception."""
+    return get_exception(word) is not None
+
+
+def add_exceptions(words: Iterable[str], endings: Tuple[str, str] = suffix_tuple) -> None:
+    """
+    Add words to the lexicon at runtime, e.g. domain-specific loanwords.
+
+    Args:
+        words (Iterable[str]): The words to add, in any case (a single word is also accepted)
+        endings (Tuple[str, str]): Their ("ile", "ise") endings
+
+    Raises:
+        ValueError: If endings is not a pair of strings
+
+    Examples:
+        >>> add_exceptions(["glikokortikosteroidal"])
+        >>> ekle("glikokortikosteroidal", "ile")
+        'glikokortikosteroidalle'
+    """
+    if isinstance(words, str):
+        words = [words]
+    endings = tuple(endings)
+    if len(endings) != 2 or not all(isinstance(ending, str) for ending in endings):
+        raise ValueError("Endings must be a pair of strings for 'ile' and 'ise'")
+    entries = {_normalize(word): endings for word in words}
+    _ensure_loaded()
+    with _lock:
+        _merge(entries)
+
+
+def load_exceptions(path: str) -> None:
+    """
+    Add the words of a lexicon file to the lexicon.
+
+    The file uses the format of the packaged lexicon: one word per line,
+    optionally followed by its "ile" and "ise" endings separated by tabs.
+    Empty lines and lines starting with "#" are ignored.
+
+    Args:
+        path (str): Path of the lexicon file (UTF-8)
+
+    Raises:
+        ValueError: If a line is malformed
+    """
+    entries = {_normalize(word): endings for word, endings in _read_lexicon(path).items()}
+    _ensure_loaded()
+    with _lock:
+        _merge(entries)
+
+
+def all_exceptions() -> Dict[str, Tuple[str, str]]:
+    """
+    Get a copy of the whole lexicon.
+
+    Returns:
+        Dict[str, Tuple[str, str]]: Every exception word mapped to its ("ile", "ise") endings
+    """
+    _ensure_loaded()
+    words, custom_endings = _lexicon
+    exceptions = dict.fromkeys(sorted(words), suffix_tuple)
+    exceptions.update(custom_endings)
+    return exceptions
+
+
+def __getattr__(name):
+    # ek_istisnalar_unlu_uyumu used to be a dict literal in this module. It is now
+    # built from the lexicon when accessed; changes to it do not affect the lexicon.
+    if name == "ek_istisnalar_unlu_uyumu":
+        return all_exceptions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
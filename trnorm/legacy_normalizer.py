@@ -3,7 +3,7 @@ Legacy text normalizer for Turkish text.
 This module provides backward compatibility with the previous normalizer implementation.
 """
 
-import re
+from trnorm.patterns import lazy_pattern
 
 # Turkish character mappings
 turkish_upper_chars = {"ı": "I", "i": "İ", "ş": "Ş", "ğ": "Ğ", "ü": "Ü", "ö": "Ö", "ç": "Ç"}
@@ -21,15 +21,23 @@ turkish_hatted_chars = {
     "Ô": "O"
 }
 
+# Translation tables built once from the mappings above.
+# Characters are lowercased one at a time by turkish_lower, so the only context-sensitive
+# mapping of str.lower() (Greek final sigma) is pinned to its per-character result.
+_HATTED_TABLE = str.maketrans(turkish_hatted_chars)
+_LOWER_TABLE = str.maketrans({**turkish_lower_chars, "Σ": "σ"})
+
+# Characters other than lowercase Turkish letters, and runs of whitespace
+_NON_LETTER = lazy_pattern(r"[^a-zçğıöşü]")
+_WHITESPACE = lazy_pattern(r"\s+")
+
 def replace_hatted_characters(s):
     """Replace Turkish characters with circumflex (hat) with their non-hatted equivalents."""
-    for k, v in turkish_hatted_chars.items():
-        s = s.replace(k, v)
-    return s
+    return s.translate(_HATTED_TABLE)
 
 def turkish_lower(s):
     """Convert a string to lowercase, handling Turkish-specific uppercase to lowercase mappings."""
-    return "".join(turkish_lower_chars.get(c, c.lower()) for c in s)
+    return s.translate(_LOWER_TABLE).lower()
 
 def normalize_text(text):
     """
@@ -51,8 +59,8 @@ def normalize_text(text):
     text = text.replace(' "', ' ').replace('" ', ' ').replace('"', '')
     text = replace_hatted_characters(text)
     text = turkish_lower(text)
-    text = re.sub(r'[^a-zçğıöşü]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _NON_LETTER.sub(" ", text)
+    text = _WHITESPACE.sub(" ", text).strip()
 
     # Return the original text if normalization results in an empty string
     return original_text if text.strip() == '' else text.strip()
@@ -6,11 +6,16 @@ This module provides functions to calculate:
 - Character Error Rate (CER)
 - Levenshtein Distance
 - Normalized Levenshtein Distance
+- All of the above for a pair in one pass (score_pair / score_pairs)
+- Alignment of two sequences into matches, substitutions, deletions and insertions
 
 These metrics are commonly used to evaluate the performance of ASR (Automatic Speech Recognition)
 and text normalization systems.
 """
-from typing import Union, List, Sequence, TypeVar, Any, overload
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from trnorm import batch_distance
 
 
 def _calculate_levenshtein(s1: str, s2: str) -> int:
@@ -58,6 +63,29 @@ def _calculate_levenshtein(s1: str, s2: str) -> int:
     return previous_row[-1]
 
 
+def _calculate_levenshtein_batch(seqs1: Sequence, seqs2: Sequence, tokens: bool = False) -> List[int]:
+    """
+    Internal function to calculate the Levenshtein distances of many pairs.
+
+    Uses the vectorized NumPy backend (see trnorm.batch_distance) when NumPy is
+    importable and the batch is large enough, and the pure-Python implementation otherwise.
+
+    Args:
+        seqs1: First strings (or token lists if tokens is True)
+        seqs2: Second strings (or token lists if tokens is True)
+        tokens: Whether the sequences are token lists instead of strings
+
+    Returns:
+        List[int]: The Levenshtein distance of each pair
+    """
+    if batch_distance.HAS_NUMPY and len(seqs1) >= batch_distance.MIN_BATCH:
+        if tokens:
+            return batch_distance.token_distances(seqs1, seqs2)
+        return batch_distance.char_distances(seqs1, seqs2)
+
+    return [_calculate_levenshtein(s1, s2) for s1, s2 in zip(seqs1, seqs2)]
+
+
 def levenshtein_distance(s1: Union[str, List[str]], s2: Union[str, List[str]]) -> Union[int, List[int]]:
     """
     Calculate the Levenshtein distance between two strings or two lists of strings.
@@ -90,8 +118,8 @@ def levenshtein_distance(s1: Union[str, List[str]], s2: Union[str, List[str]]) -
         if len(s1) != len(s2):
             raise ValueError("Input lists must have the same length for batch processing")
         
-        # Process each pair of strings and return a list of results
-        return [_calculate_levenshtein(str(item1), str(item2)) for item1, item2 in zip(s1, s2)]
+        # Process all pairs of strings at once and return a list of results
+        return _calculate_levenshtein_batch([str(item) for item in s1], [str(item) for item in s2])
     
     # If inputs are strings, calculate the Levenshtein distance directly
     elif isinstance(s1, str) and isinstance(s2, str):
@@ -155,8 +183,15 @@ def normalized_levenshtein_distance(s1: Union[str, List[str]], s2: Union[str, Li
         if len(s1) != len(s2):
             raise ValueError("Input lists must have the same length for batch processing")
         
-        # Process each pair of strings and return a list of results
-        return [_calculate_normalized_levenshtein(str(item1), str(item2)) for item1, item2 in zip(s1, s2)]
+        # Process all pairs of strings at once and return a list of results
+        strings1 = [str(item) for item in s1]
+        strings2 = [str(item) for item in s2]
+        distances = _calculate_levenshtein_batch(strings1, strings2)
+        results = []
+        for item1, item2, distance in zip(strings1, strings2, distances):
+            max_length = max(len(item1), len(item2))
+            results.append(round(distance / max_length, 3) if max_length else 0.0)
+        return results
     
     # If inputs are strings, calculate the normalized Levenshtein distance directly
     elif isinstance(s1, str) and isinstance(s2, str):
@@ -198,18 +233,18 @@ def wer(reference: Union[str, List[str]], hypothesis: Union[str, List[str]]) ->
         if len(reference) != len(hypothesis):
             raise ValueError("Input lists must have the same length for batch processing")
         
-        # Process each pair of strings and return a list of results
+        # Process all pairs of word sequences at once and return a list of results
+        ref_words = [str(ref).split() for ref in reference]
+        hyp_words = [str(hyp).split() for hyp in hypothesis]
+        distances = _calculate_levenshtein_batch(ref_words, hyp_words, tokens=True)
+
         results = []
-        for ref, hyp in zip(reference, hypothesis):
-            ref_words = str(ref).split()
-            hyp_words = str(hyp).split()
-            
-            if len(ref_words) == 0:
+        for words, distance in zip(ref_words, distances):
+            if len(words) == 0:
                 results.append(1.0)
             else:
-                # Calculate Levenshtein distance between word sequences and normalize by reference length
-                distance = _calculate_levenshtein(ref_words, hyp_words)
-                results.append(distance / len(ref_words))
+                # Normalize the word-level distance by reference length
+                results.append(distance / len(words))
         
         return results
     
@@ -264,17 +299,17 @@ def cer(reference: Union[str, List[str]], hypothesis: Union[str, List[str]]) ->
         if len(reference) != len(hypothesis):
             raise ValueError("Input lists must have the same length for batch processing")
         
-        # Process each pair of strings and return a list of results
+        # Process all pairs of strings at once and return a list of results
+        ref_strs = [str(ref) for ref in reference]
+        hyp_strs = [str(hyp) for hyp in hypothesis]
+        distances = _calculate_levenshtein_batch(ref_strs, hyp_strs)
+
         results = []
-        for ref, hyp in zip(reference, hypothesis):
-            ref_str = str(ref)
-            hyp_str = str(hyp)
-            
+        for ref_str, distance in zip(ref_strs, distances):
             if len(ref_str) == 0:
                 results.append(1.0)
             else:
-                # Calculate Levenshtein distance between character sequences and normalize by reference length
-                distance = _calculate_levenshtein(ref_str, hyp_str)
+                # Normalize the character-level distance by reference length
                 results.append(distance / len(ref_str))
         
         return results
@@ -291,3 +326,194 @@ def cer(reference: Union[str, List[str]], hypothesis: Union[str, List[str]]) ->
     # If inputs are neither strings nor lists, raise an error
     else:
         raise TypeError("Inputs must be either strings or lists of strings")
+
+
+@dataclass(frozen=True)
+class PairScores:
+    """
+    Edit counts of a reference/hypothesis pair, from which all metrics are derived.
+
+    Attributes:
+        word_edits (int): Word-level edit distance
+        ref_words (int): Number of words in the reference
+        char_edits (int): Character-level edit distance
+        ref_chars (int): Number of characters in the reference
+        hyp_chars (int): Number of characters in the hypothesis
+    """
+    __slots__ = ("word_edits", "ref_words", "char_edits", "ref_chars", "hyp_chars")
+
+    word_edits: int
+    ref_words: int
+    char_edits: int
+    ref_chars: int
+    hyp_chars: int
+
+    def __getstate__(self) -> Tuple[int, int, int, int, int]:
+        """Get the fields for pickle and copy, which cannot set them on a frozen instance."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[int, int, int, int, int]) -> None:
+        """Restore the fields saved by __getstate__."""
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    @property
+    def wer(self) -> float:
+        """Word Error Rate, identical to wer(reference, hypothesis)."""
+        if self.ref_words == 0:
+            return 1.0
+        return self.word_edits / self.ref_words
+
+    @property
+    def cer(self) -> float:
+        """Character Error Rate, identical to cer(reference, hypothesis)."""
+        if self.ref_chars == 0:
+            return 1.0
+        return self.char_edits / self.ref_chars
+
+    @property
+    def levenshtein(self) -> int:
+        """Levenshtein distance, identical to levenshtein_distance(reference, hypothesis)."""
+        return self.char_edits
+
+    @property
+    def normalized_levenshtein(self) -> float:
+        """Normalized Levenshtein distance, identical to normalized_levenshtein_distance(reference, hypothesis)."""
+        max_length = max(self.ref_chars, self.hyp_chars)
+        if max_length == 0:
+            return 0.0
+        return round(self.char_edits / max_length, 3)
+
+
+def score_pair(reference: str, hypothesis: str) -> PairScores:
+    """
+    Calculate WER, CER and (normalized) Levenshtein distance of a pair in one pass.
+
+    The character-level distance is computed once and shared between CER and the
+    normalized Levenshtein distance, and the word-level distance is computed once
+    for WER. This is cheaper than calling wer(), cer() and
+    normalized_levenshtein_distance() separately.
+
+    Args:
+        reference: The reference text
+        hypothesis: The hypothesis text
+
+    Returns:
+        PairScores: The edit counts of the pair, with wer, cer, levenshtein and
+            normalized_levenshtein available as properties
+
+    Raises:
+        TypeError: If inputs are not strings
+
+    Examples:
+        >>> scores = score_pair("bu bir test", "bu test")
+        >>> scores.wer
+        0.3333333333333333
+    """
+    if not isinstance(reference, str) or not isinstance(hypothesis, str):
+        raise TypeError("Inputs must be strings")
+
+    ref_words = reference.split()
+    return PairScores(
+        word_edits=_calculate_levenshtein(ref_words, hypothesis.split()),
+        ref_words=len(ref_words),
+        char_edits=_calculate_levenshtein(reference, hypothesis),
+        ref_chars=len(reference),
+        hyp_chars=len(hypothesis),
+    )
+
+
+def score_pairs(references: List[str], hypotheses: List[str]) -> List[PairScores]:
+    """
+    Batch version of score_pair.
+
+    Args:
+        references: List of reference texts
+        hypotheses: List of hypothesis texts
+
+    Returns:
+        List[PairScores]: The edit counts of each pair
+
+    Raises:
+        ValueError: If the lists have different lengths
+    """
+    if len(references) != len(hypotheses):
+        raise ValueError("Input lists must have the same length for batch processing")
+
+    refs = [str(ref) for ref in references]
+    hyps = [str(hyp) for hyp in hypotheses]
+    ref_words = [ref.split() for ref in refs]
+    word_edits = _calculate_levenshtein_batch(ref_words, [hyp.split() for hyp in hyps], tokens=True)
+    char_edits = _calculate_levenshtein_batch(refs, hyps)
+
+    return [
+        PairScores(word_edits=w, ref_words=len(words), char_edits=c, ref_chars=len(ref), hyp_chars=len(hyp))
+        for w, words, c, ref, hyp in zip(word_edits, ref_words, char_edits, refs, hyps)
+    ]
+
+
+# Edit operations returned by align()
+MATCH = "match"
+SUBSTITUTION = "substitution"
+DELETION = "deletion"
+INSERTION = "insertion"
+
+
+def align(reference: Sequence[Any], hypothesis: Sequence[Any]) -> List[Tuple[str, Optional[Any], Optional[Any]]]:
+    """
+    Align two sequences (e.g. word lists or strings) with a minimum-cost edit script.
+
+    The number of non-match operations equals the Levenshtein distance of the sequences.
+    When several alignments have the same cost, matches and substitutions are preferred
+    over deletions, and deletions over insertions.
+
+    Args:
+        reference: The reference sequence
+        hypothesis: The hypothesis sequence
+
+    Returns:
+        List[Tuple[str, Optional[Any], Optional[Any]]]: Operations in order as
+            (operation, reference item, hypothesis item) tuples, where operation is one of
+            MATCH, SUBSTITUTION, DELETION (hypothesis item is None) and
+            INSERTION (reference item is None)
+
+    Examples:
+        >>> align("bu bir test".split(), "bu test".split())
+        [('match', 'bu', 'bu'), ('deletion', 'bir', None), ('match', 'test', 'test')]
+    """
+    n = len(reference)
+    m = len(hypothesis)
+
+    # Full DP matrix, needed for the backtrace
+    rows = [list(range(m + 1))]
+    for i in range(1, n + 1):
+        previous_row = rows[-1]
+        current_row = [i]
+        item = reference[i - 1]
+        for j in range(1, m + 1):
+            current_row.append(min(
+                previous_row[j] + 1,
+                current_row[j - 1] + 1,
+                previous_row[j - 1] + (item != hypothesis[j - 1]),
+            ))
+        rows.append(current_row)
+
+    operations = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0:
+            same = reference[i - 1] == hypothesis[j - 1]
+            if rows[i][j] == rows[i - 1][j - 1] + (not same):
+                operations.append((MATCH if same else SUBSTITUTION, reference[i - 1], hypothesis[j - 1]))
+                i -= 1
+                j -= 1
+                continue
+        if i > 0 and rows[i][j] == rows[i - 1][j] + 1:
+            operations.append((DELETION, reference[i - 1], None))
+            i -= 1
+        else:
+            operations.append((INSERTION, None, hypothesis[j - 1]))
+            j -= 1
+
+    operations.reverse()
+    return operations
@@ -18,6 +18,7 @@ from .text_utils import turkish_lower, sapkasiz, remove_punctuation
 from .time_utils import normalize_times
 from .suffix_handler import merge_suffixes, context_aware_merge_suffixes
 from .alphanumeric import normalize_alphanumeric
+from .pipeline import plan_pipeline
 
 # Type definition for a conversion function
 ConversionFunc = Callable[[str, Optional[Any]], str]
@@ -42,7 +43,8 @@ DEFAULT_PIPELINE = [
 ]
 
 def normalize(text: Union[str, List[str]], converters: Optional[List[ConversionFunc]] = None, 
-              context_text: Optional[Union[str, List[str]]] = None) -> Union[str, List[str]]:
+              context_text: Optional[Union[str, List[str]]] = None,
+              optimize: bool = True) -> Union[str, List[str]]:
     """
     Normalize Turkish text using a list of conversion functions.
     
@@ -55,6 +57,9 @@ def normalize(text: Union[str, List[str]], converters: Optional[List[ConversionF
             If None, the DEFAULT_PIPELINE is used.
         context_text (Optional[Union[str, List[str]]]): Optional secondary text to provide context
             for context-aware converters (e.g., reference text when normalizing hypothesis)
+        optimize (bool): Run the converters as planned by trnorm.pipeline.plan_pipeline,
+            which removes redundant stages and fuses others without changing the result.
+            Set to False to call every converter exactly as listed.
             
     Returns:
         Union[str, List[str]]: Normalized text or list of normalized texts
@@ -85,19 +90,22 @@ def normalize(text: Union[str, List[str]], converters: Optional[List[ConversionF
         if context_text is not None and isinstance(context_text, list):
             # If both are lists, normalize each pair
             if len(text) == len(context_text):
-                return [normalize(item, converters, ctx) 
+                return [normalize(item, converters, ctx, optimize) 
                         for item, ctx in zip(text, context_text)]
             else:
                 # If lengths don't match, ignore context
-                return [normalize(item, converters) for item in text]
+                return [normalize(item, converters, optimize=optimize) for item in text]
         else:
             # If only text is a list, normalize each item with the same context
-            return [normalize(item, converters, context_text) for item in text]
+            return [normalize(item, converters, context_text, optimize) for item in text]
     
     # If no converters are provided, use the default pipeline
     if converters is None:
         converters = DEFAULT_PIPELINE
     
+    if optimize:
+        return plan_pipeline(converters)(text, context_text)
+    
     # Apply converters in sequence
     result = text
     for converter in converters:
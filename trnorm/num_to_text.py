@@ -29,11 +29,30 @@ UYARI: Sıra sayıları ekle gösterildiklerinde rakamdan sonra sadece kesme iş
 12. Bir zorunluluk olmadıkça cümle rakamla başlamaz.
 """
 
-import re
+from trnorm.patterns import lazy_pattern
+
+# Number with a decimal or thousands separator
+_SEPARATED_NUMBER = lazy_pattern(r"(\d+)(\.|,)(\d+)")
+# Date, e.g. 12.05.2023
+_DATE_PATTERN = lazy_pattern(r"\b(\d{1,2})[./-](\d{1,2})[./-](\d{2,4})\b")
+# Time with "saat" prefix (e.g., "saat 22.00", "saat 9:45")
+_SAAT_PATTERN = lazy_pattern(r"(\bsaat\s+)(\d{1,2})([\.:])(\d{2})\b")
+# Standalone time that might be a time expression (e.g., "22.00", "9:45")
+_TIME_PATTERN = lazy_pattern(r"\b(\d{1,2})([\.:])(\d{2})\b")
+# Number followed by a comma and spaces (e.g., "13, ")
+_NUMBER_COMMA_SPACE = lazy_pattern(r"(\d+)(,\s+)")
+# Ordinal (e.g., "2.")
+_ORDINAL_NUMBER = lazy_pattern(r"^\d+\.$")
+# Number with period thousands separators (e.g., "1.000.000"), optionally followed by an apostrophe
+_THOUSANDS_NUMBER = lazy_pattern(r"^\d{1,3}(\.\d{3})+$")
+_THOUSANDS_NUMBER_APOSTROPHE = lazy_pattern(r"^\d{1,3}(\.\d{3})+\'")
+# Dimensions with 'x' between numbers, used by replace_multiplication_symbol_in_dimensions
+_DIMENSION_PATTERN = lazy_pattern(
+    r"(\d+(?:\.\d+)?\s*(?:cm|mm)?)(\s*x\s*)(\d+(?:\.\d+)?\s*(?:cm|mm)?)(?:(\s*x\s*)(\d+(?:\.\d+)?\s*(?:cm|mm)?))?"
+)
 
 def detect_decimal_separator(s: str) -> str:
-    pattern = r"(\d+)(\.|,)(\d+)"
-    match = re.search(pattern, s)
+    match = _SEPARATED_NUMBER.search(s)
 
     if match:
         return match.group(2)  # Group 2 is the separator
@@ -49,8 +68,6 @@ class NumberToTextConverter:
         self.decimal_seperator = None
 
     def _convert_dates_to_words(self, text, merge_words):
-        # Regular expression to match dates
-        date_pattern = r'\b(\d{1,2})[./-](\d{1,2})[./-](\d{2,4})\b'
         # Function to replace dates with their word form
         def replace_with_words(match):
             day, month, year = match.groups()
@@ -59,7 +76,7 @@ class NumberToTextConverter:
             year_words = self._num_to_words(int(year), 0, merge_words=merge_words)
             return f"{day_words} {month_words} {year_words}"
 
-        return re.sub(date_pattern, replace_with_words, text)
+        return _DATE_PATTERN.sub(replace_with_words, text)
         
     def _convert_times_to_words(self, text, merge_words):
         """
@@ -75,9 +92,6 @@ class NumberToTextConverter:
         Returns:
             str: The text with time expressions properly converted
         """
-        # Pattern for times with "saat" prefix (e.g., "saat 22.00", "saat 9:45")
-        saat_pattern = r'(\bsaat\s+)(\d{1,2})([\.:])(\d{2})\b'
-        
         def replace_saat_time(match):
             saat_prefix = match.group(1)  # "saat "
             hours = match.group(2)
@@ -95,10 +109,7 @@ class NumberToTextConverter:
             return f"{saat_prefix}{hours_words} {minutes_words}"
         
         # Process times with "saat" prefix
-        processed_text = re.sub(saat_pattern, replace_saat_time, text)
-        
-        # Pattern for standalone times that might be time expressions (e.g., "22.00", "9:45")
-        time_pattern = r'\b(\d{1,2})([\.:])(\d{2})\b'
+        processed_text = _SAAT_PATTERN.sub(replace_saat_time, text)
         
         def is_likely_time(hours, minutes):
             # Check if hours and minutes are valid time components
@@ -126,7 +137,7 @@ class NumberToTextConverter:
             return match.group(0)
         
         # Process standalone times
-        return re.sub(time_pattern, replace_standalone_time, processed_text)
+        return _TIME_PATTERN.sub(replace_standalone_time, processed_text)
 
     def _is_ordinal_or_non_standard_number(self, word):
         """
@@ -149,7 +160,7 @@ class NumberToTextConverter:
             return False
             
         # Check for numbers ending with a period (ordinals)
-        if re.match(r'^\d+\.$', word):
+        if _ORDINAL_NUMBER.match(word):
             return True
             
         # Check for numbers with period as decimal separator
@@ -158,7 +169,7 @@ class NumberToTextConverter:
         if '.' in word and ',' not in word:
             # If it's a properly formatted Turkish number with thousand separators
             # like 1.000, 10.000, 100.000, 1.000.000, etc., don't skip it
-            if re.match(r'^\d{1,3}(\.\d{3})+$', word):
+            if _THOUSANDS_NUMBER.match(word):
                 return False
                 
             # If it has a period but doesn't match the thousand separator pattern,
@@ -199,7 +210,7 @@ class NumberToTextConverter:
         # Special handling for numbers followed by commas and spaces (e.g., "13, ")
         # Replace with a special placeholder to preserve the pattern
         comma_space_placeholder = " |COMMA_SPACE| "
-        input_text = re.sub(r'(\d+)(,\s+)', lambda m: self._int_to_words(int(m.group(1)), merge_words=merge_words) + comma_space_placeholder, input_text)
+        input_text = _NUMBER_COMMA_SPACE.sub(lambda m: self._int_to_words(int(m.group(1)), merge_words=merge_words) + comma_space_placeholder, input_text)
         
         input_text = input_text.replace(", ", " |$| ")
         input_text = input_text.replace("-", " ~ ")
@@ -231,7 +242,7 @@ class NumberToTextConverter:
         words = []
         for word in input_text.split():
             # Special case for numbers with apostrophes and thousand separators
-            if "'" in word and re.match(r'^\d{1,3}(\.\d{3})+\'', word):
+            if "'" in word and _THOUSANDS_NUMBER_APOSTROPHE.match(word):
                 parts = word.split("'", 1)
                 number_part = parts[0]
                 suffix_part = "'" + parts[1] if len(parts) > 1 else ""
@@ -502,9 +513,6 @@ def replace_multiplication_symbol_in_dimensions(text):
         str: The text with the multiplication symbol 'x' replaced by a descriptive term in dimensional expressions.
 
     """
-    # Define a regex pattern that matches 'x' between numbers (with optional decimal parts and optional units)
-    pattern = r'(\d+(?:\.\d+)?\s*(?:cm|mm)?)(\s*x\s*)(\d+(?:\.\d+)?\s*(?:cm|mm)?)(?:(\s*x\s*)(\d+(?:\.\d+)?\s*(?:cm|mm)?))?'
-
     def replacement(match):
         """Construct the replacement string with a descriptive term."""
         number1, x1, number2, x2, number3 = match.groups()
@@ -514,7 +522,7 @@ def replace_multiplication_symbol_in_dimensions(text):
         return replacement
 
     # Replace all occurrences of 'x' between numbers with a descriptive term
-    return re.sub(pattern, replacement, text).replace("  ", " ").strip()
+    return _DIMENSION_PATTERN.sub(replacement, text).replace("  ", " ").strip()
 
 
 def convert_numbers_to_words_wrapper(text):
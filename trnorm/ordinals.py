@@ -1,17 +1,61 @@
-import re
+from functools import lru_cache
+from typing import Iterable, List
+
+from trnorm.patterns import lazy_pattern
+from trnorm.roman_numerals import roman_to_arabic
 from trnorm.text_utils import is_turkish_upper
-from trnorm.roman_numerals import roman_to_arabic, ROMAN_ORDINAL_PATTERN
 
-# Compile regex patterns globally for efficiency
-seq_pattern = re.compile(r'(\b\d+\.,?)\s+(?=\d+\.)')
+# Regex patterns of the former separate passes, compiled on first use
+_SEQ = lazy_pattern(r"(\b\d+\.,?)\s+(?=\d+\.)")
 # New patterns for various ordinal formats
-ordinal_pattern = re.compile(r'\b(\d+)(?:\'(?:inci|[iı]nc[iı]|nci|uncu|üncü|inci|nci)|(?:inci|[iı]nc[iı]|nci|uncu|üncü|inci|nci))\b')
+_ORDINAL = lazy_pattern(r"\b(\d+)(?:\'(?:inci|[iı]nc[iı]|nci|uncu|üncü|inci|nci)|(?:inci|[iı]nc[iı]|nci|uncu|üncü|inci|nci))\b")
 # Pattern for standalone ordinals with period (must be at the start of a line or end of a line or surrounded by spaces)
-standalone_ordinal = re.compile(r'(?:^|\s)(\d+)\.(?:$|\s)')
+_STANDALONE = lazy_pattern(r"(?:^|\s)(\d+)\.(?:$|\s)")
 # Pattern for ordinals or bullet points in context - capture the first letter of the next word to check casing
-context_ordinal = re.compile(r'(\b\d+)\.\s+([A-Za-zÇçĞğİıÖöŞşÜü]\w*)')
+_CONTEXT = lazy_pattern(r"(\b\d+)\.\s+([A-Za-zÇçĞğİıÖöŞşÜü]\w*)")
 # Pattern specifically for bullet points at the beginning of lines
-bullet_point_pattern = re.compile(r'^\s*(\d+)\.\s+([A-Za-zÇçĞğİıÖöŞşÜü]\w*)')
+_BULLET_POINT = lazy_pattern(r"^\s*(\d+)\.\s+([A-Za-zÇçĞğİıÖöŞşÜü]\w*)")
+
+# Letters that can start the word following an ordinal
+_WORD_START = "A-Za-zÇçĞğİıÖöŞşÜü"
+# A Roman ordinal can also be followed by a sequence of ordinals, which is converted to words first
+_ROMAN_WORD_START = rf"(?=[{_WORD_START}]|\d+\.,?\s+\d+\.)"
+_ORDINAL_SUFFIX = r"(?:'(?:inci|[iı]nc[iı]|nci|uncu|üncü|inci|nci)|(?:inci|[iı]nc[iı]|nci|uncu|üncü|inci|nci))"
+
+
+def _combined_pattern(convert_roman_ordinals):
+    """
+    Build the regular expression of the single-scan pattern used by normalize_ordinals.
+
+    The alternatives correspond to the patterns above, in the order in which
+    they used to be applied as separate passes. Alternatives that can start at
+    the same position are tried in that order, so the precedence of the passes
+    is expressed by match order. The word after an Arabic ordinal is only looked
+    at, not consumed, since it is never changed. The word after a Roman ordinal
+    is consumed, as it was by ROMAN_ORDINAL_PATTERN, so it cannot start another
+    Roman ordinal.
+    """
+    alternatives = [r"(?P<seq>\b(?P<seq_num>\d+)\.,?\s+(?=\d+\.))"]
+    if convert_roman_ordinals:
+        alternatives.append(
+            rf"(?P<roman>\b(?P<roman_num>[IVX]+)\.\s+(?:(?P<roman_word>[{_WORD_START}]\w*)|{_ROMAN_WORD_START}))"
+        )
+    alternatives += [
+        rf"(?P<context>\b(?P<context_num>\d+)\.\s+(?=[{_WORD_START}]))",
+        r"(?P<standalone>(?:^|(?<=\s))(?P<standalone_num>\d+)\.(?P<standalone_suffix>\s|$))",
+        rf"(?P<ordinal>\b(?P<ordinal_num>\d+){_ORDINAL_SUFFIX}\b)",
+    ]
+    return "|".join(alternatives)
+
+
+# Single-scan patterns, without and with Roman ordinals
+_COMBINED_PATTERNS = {False: lazy_pattern(_combined_pattern(False)), True: lazy_pattern(_combined_pattern(True))}
+# A Roman ordinal that starts the word after an Arabic ordinal
+_ROMAN_WORD = lazy_pattern(rf"([IVX]+)\.\s+{_ROMAN_WORD_START}")
+# Lines without any of these characters contain no ordinal
+_DIGIT = lazy_pattern(r"\d")
+_DIGIT_OR_ROMAN = lazy_pattern(r"[\dIVX]")
+
 
 # Dictionary for basic ordinals
 ones = {
@@ -122,10 +166,10 @@ def normalize_number(num):
     # Handle ones
     return ones[num]
 
-# Convert numbers to their textual representation in Turkish
-def num_to_text(n):
+# Build the ordinal text of a number from its cardinal text
+def _ordinal_words(n):
     """
-    Convert a number to its ordinal text representation in Turkish.
+    Convert a number to its ordinal text representation in Turkish, without caching.
     
     Args:
         n: The number to convert
@@ -189,6 +233,60 @@ def num_to_text(n):
     # Default case (should not happen with our implementation)
     return words + "ıncı"
 
+# Ordinals up to this value are looked up in a table built on first use. They cover
+# almost every ordinal of running text ("1.", "3. madde", "2023'üncü").
+ORDINAL_TABLE_SIZE = 10000
+# Maximum number of larger ordinals whose text is cached
+ORDINAL_CACHE_SIZE = 4096
+
+_ORDINAL_TABLE = []
+
+def _ordinal_table():
+    """Build (once) the table of ordinal texts, indexed by number."""
+    if not _ORDINAL_TABLE:
+        _ORDINAL_TABLE.extend([""] + [_ordinal_words(n) for n in range(1, ORDINAL_TABLE_SIZE + 1)])
+    return _ORDINAL_TABLE
+
+@lru_cache(maxsize=ORDINAL_CACHE_SIZE)
+def _cached_ordinal_words(n):
+    """Convert a number outside the ordinal table, caching the result."""
+    return _ordinal_words(n)
+
+# Convert numbers to their textual representation in Turkish
+def num_to_text(n):
+    """
+    Convert a number to its ordinal text representation in Turkish.
+    
+    Args:
+        n: The number to convert
+        
+    Returns:
+        The ordinal text representation
+    """
+    if type(n) is int and 0 < n <= ORDINAL_TABLE_SIZE:
+        return _ordinal_table()[n]
+    return _cached_ordinal_words(n)
+
+def num_to_text_many(numbers: Iterable[int]) -> List[str]:
+    """
+    Convert many numbers to their ordinal text representations in Turkish.
+    
+    Args:
+        numbers (Iterable[int]): The numbers to convert
+        
+    Returns:
+        List[str]: The ordinal text of each number, in input order
+    
+    Examples:
+        >>> num_to_text_many([1, 2, 3])
+        ['birinci', 'ikinci', 'üçüncü']
+    """
+    table = _ordinal_table()
+    return [
+        table[n] if type(n) is int and 0 < n <= ORDINAL_TABLE_SIZE else _cached_ordinal_words(n)
+        for n in numbers
+    ]
+
 # Check if a string starts with an uppercase letter (using text_utils)
 def is_uppercase_first(s):
     """Check if the first letter of a string is uppercase."""
@@ -212,12 +310,121 @@ def is_bullet_point(line):
     Returns:
         True if the line is a bullet point, False otherwise
     """
-    match = bullet_point_pattern.match(line)
+    match = _BULLET_POINT.match(line)
     if match and is_uppercase_first(match.group(2)):
         return True
     
     return False
 
+
+def _roman_value(roman):
+    """Get the value of a Roman numeral, or None if it is not valid."""
+    try:
+        return roman_to_arabic(roman)
+    except ValueError:
+        return None
+
+def _is_word_char(char):
+    """Check whether a character matches \\w."""
+    return char.isalnum() or char == "_"
+
+def _context_is_upper(line, word_start, convert_roman_ordinals):
+    """
+    Check whether the word after an ordinal in context starts with an uppercase letter.
+
+    A valid Roman ordinal at the start of the word is converted to lowercase text
+    before the casing is checked, as the separate passes did.
+    """
+    if convert_roman_ordinals:
+        roman = _ROMAN_WORD.match(line, word_start)
+        if roman and _roman_value(roman.group(1)) is not None:
+            return False
+    return is_uppercase_first(line[word_start])
+
+def _becomes_standalone(match, line, convert_roman_ordinals):
+    """Check whether a match of the combined pattern is converted as a standalone ordinal."""
+    if match is None:
+        return False
+    if match.lastgroup == "standalone":
+        return True
+    return match.lastgroup == "context" and _context_is_upper(line, match.end(), convert_roman_ordinals)
+
+def _drop_prefix(pieces):
+    """Remove the whitespace before a standalone ordinal from the output, unless it is a space."""
+    if pieces[-1][-1] != " ":
+        pieces[-1] = pieces[-1][:-1]
+        if not pieces[-1]:
+            pieces.pop()
+
+def _normalize_line(line, convert_roman_ordinals):
+    """
+    Normalize the ordinals of a single line in one scan.
+
+    The result is the same as applying the sequence, Roman, context, standalone
+    and suffix patterns one after another. Where a pass used to see the output
+    of an earlier one, the dispatcher looks at the output built so far (to the
+    left) or at the next match (to the right) instead.
+    """
+    pattern = _COMBINED_PATTERNS[convert_roman_ordinals]
+    pieces = []
+    position = 0
+
+    for match in pattern.finditer(line):
+        start = match.start()
+        if start > position:
+            pieces.append(line[position:start])
+        position = match.end()
+        kind = match.lastgroup
+
+        if kind == "seq":
+            pieces.append(num_to_text(int(match.group("seq_num"))) + " ")
+
+        elif kind == "roman":
+            roman = match.group("roman_num")
+            num = _roman_value(roman)
+            # The word after a Roman ordinal is consumed, so it cannot start another one
+            word = match.group("roman_word") or ""
+            pieces.append((f"{roman}. " if num is None else num_to_text(num) + " ") + word)
+
+        elif kind == "context":
+            num = match.group("context_num")
+            if not _context_is_upper(line, position, convert_roman_ordinals):
+                pieces.append(num_to_text(int(num)) + " ")
+            elif start == 0 or pieces[-1][-1].isspace():
+                # Kept for the uppercase word, then converted as a standalone ordinal
+                if start > 0:
+                    _drop_prefix(pieces)
+                pieces.append(num_to_text(int(num)) + " ")
+            else:
+                pieces.append(f"{num}. ")
+
+        elif kind == "standalone":
+            if start > 0:
+                _drop_prefix(pieces)
+            suffix = " " if match.group("standalone_suffix") == " " else ""
+            pieces.append(num_to_text(int(match.group("standalone_num"))) + suffix)
+
+        else:
+            # A standalone ordinal that removes the whitespace around this one
+            # leaves no word boundary for the suffix pattern
+            glued_left = pieces and _is_word_char(pieces[-1][-1])
+            glued_right = (
+                position < len(line)
+                and line[position] != " "
+                and line[position].isspace()
+                and _becomes_standalone(pattern.match(line, position + 1), line, convert_roman_ordinals)
+            )
+            if glued_left or glued_right:
+                pieces.append(match.group())
+            else:
+                pieces.append(num_to_text(int(match.group("ordinal_num"))))
+
+    if not pieces:
+        return line
+    pieces.append(line[position:])
+    return "".join(pieces)
+
+
 # Normalize text with compiled regex patterns
 def normalize_ordinals(text, convert_roman_ordinals=False):
     """
@@ -230,71 +437,36 @@ def normalize_ordinals(text, convert_roman_ordinals=False):
     Returns:
         Text with normalized ordinals
     """
-    def context_repl(m):
-        num, word = m.group(1), m.group(2)
-        
-        # If the word starts with an uppercase letter, it's likely a bullet point
-        # or the start of a sentence, so keep it as is
-        if is_uppercase_first(word):
-            return f"{num}. {word}"
-        
-        # Convert the number to its ordinal text form
-        return f"{num_to_text(int(num))} {word}"
-    
-    def roman_ordinal_repl(m):
-        roman, word = m.group(1), m.group(2)
-        
-        # Convert Roman numeral to Arabic number
-        try:
-            num = roman_to_arabic(roman)
-            
-            # If the word starts with an uppercase letter, it's likely a proper noun
-            # that follows a Roman numeral (like "II. Dünya Savaşı", "III. Selim")
-            # In this case, we want to convert the Roman numeral to text form
-            if is_uppercase_first(word):
-                return f"{num_to_text(num)} {word}"
-            
-            # Otherwise, convert to ordinal text form
-            return f"{num_to_text(num)} {word}"
-        except ValueError:
-            # If not a valid Roman numeral, return as is
-            return f"{roman}. {word}"
-    
-    def seq_repl(m):
-        nums = list(map(int, re.findall(r'\d+', m.group(0))))
-        return ', '.join(num_to_text(num) for num in nums) + ' '
-    
-    def ordinal_repl(m):
-        num = int(m.group(1))
-        return num_to_text(num)
-    
-    def standalone_repl(m):
-        num = int(m.group(1))
-        # Preserve the space before or after if it exists
-        prefix = ' ' if m.group(0)[0] == ' ' else ''
-        suffix = ' ' if m.group(0)[-1] == ' ' else ''
-        return prefix + num_to_text(num) + suffix
+    convert_roman_ordinals = bool(convert_roman_ordinals)
+    has_candidate = (_DIGIT_OR_ROMAN if convert_roman_ordinals else _DIGIT).compiled().search
 
     # Process the text line by line to better handle bullet points
     lines = text.split('\n')
     processed_lines = []
-    
+
     for line in lines:
-        # Check if the line is a bullet point (starts with a number and period followed by an uppercase word)
-        if is_bullet_point(line):
-            # If it's a bullet point, keep it as is
+        # Lines without digits (or Roman numeral letters) have nothing to convert.
+        # Bullet points (a number and period followed by an uppercase word) are kept as is.
+        if not has_candidate(line) or is_bullet_point(line):
             processed_lines.append(line)
         else:
-            # Apply transformations in sequence to each line
-            line = re.sub(seq_pattern, seq_repl, line)
-            
-            # Only convert Roman ordinals if the parameter is True
-            if convert_roman_ordinals:
-                line = re.sub(ROMAN_ORDINAL_PATTERN, roman_ordinal_repl, line)  # Process Roman ordinals first
-                
-            line = re.sub(context_ordinal, context_repl, line)
-            line = re.sub(standalone_ordinal, standalone_repl, line)
-            line = re.sub(ordinal_pattern, ordinal_repl, line)
-            processed_lines.append(line)
-    
+            processed_lines.append(_normalize_line(line, convert_roman_ordinals))
+
     return '\n'.join(processed_lines)
+
+
+# Compiled patterns available as module attributes, compiled on first access
+_PUBLIC_PATTERNS = {
+    "seq_pattern": _SEQ,
+    "ordinal_pattern": _ORDINAL,
+    "standalone_ordinal": _STANDALONE,
+    "context_ordinal": _CONTEXT,
+    "bullet_point_pattern": _BULLET_POINT,
+}
+
+
+def __getattr__(name):
+    pattern = _PUBLIC_PATTERNS.get(name)
+    if pattern is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return pattern.compiled()
@@ -0,0 +1,207 @@
+"""
+Registry of the regular expressions used by trnorm.
+
+Every static pattern is compiled once and kept for the life of the process,
+instead of relying on the cache of the re module, which holds a limited number of
+patterns and is shared with all other code of the process.
+
+Static patterns are declared at import time with lazy_pattern and compiled on
+first use, so importing trnorm stays cheap. Patterns built at runtime (e.g. from
+the unit translations) are compiled with compile_pattern; those built from a
+mappings snapshot are not kept by the registry, so that the patterns of replaced
+snapshots can be freed. warmup compiles all
+of them up front, e.g. in a server before forking workers, so that the workers
+share the compiled patterns instead of compiling them each.
+
+Examples:
+    >>> import trnorm
+    >>> stats = trnorm.warmup()
+    >>> stats.count > 0
+    True
+"""
+
+import re
+import threading
+import time
+
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Match,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+
+class PatternStats(NamedTuple):
+    """Compilation statistics of the registry."""
+
+    # Number of patterns compiled
+    count: int
+    # Total time spent compiling them, in seconds
+    seconds: float
+
+
+# Compiled patterns by (pattern, flags)
+_COMPILED: Dict[Tuple[str, int], Pattern] = {}
+# Static patterns declared with lazy_pattern
+_LAZY_PATTERNS: List["LazyPattern"] = []
+# Functions building the runtime patterns of a module
+_WARMUP_FUNCTIONS: List[Callable[[], object]] = []
+
+_lock = threading.Lock()
+_compile_seconds = 0.0
+# Number of patterns compiled without being kept
+_unkept_count = 0
+
+
+def compile_pattern(pattern: str, flags: int = 0, keep: bool = True) -> Pattern:
+    """
+    Get the compiled pattern, compiling it on first use.
+
+    Args:
+        pattern (str): The regular expression
+        flags (int): Flags of the re module
+        keep (bool): Keep the compiled pattern in the registry. Patterns built from data
+            that can change, such as a mappings snapshot, are compiled with keep=False and
+            kept by the caller only while that data is current.
+
+    Returns:
+        Pattern: The compiled pattern
+    """
+    global _compile_seconds, _unkept_count
+    if not keep:
+        start = time.perf_counter()
+        compiled = re.compile(pattern, flags)
+        with _lock:
+            _compile_seconds += time.perf_counter() - start
+            _unkept_count += 1
+        return compiled
+
+    key = (pattern, flags)
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        with _lock:
+            compiled = _COMPILED.get(key)
+            if compiled is None:
+                start = time.perf_counter()
+                compiled = re.compile(pattern, flags)
+                _compile_seconds += time.perf_counter() - start
+                _COMPILED[key] = compiled
+    return compiled
+
+
+class LazyPattern:
+    """
+    A static pattern that is compiled on first use.
+
+    Supports the matching methods of a compiled pattern.
+    """
+
+    __slots__ = ("pattern", "flags", "_compiled")
+
+    def __init__(self, pattern: str, flags: int = 0):
+        """
+        Initialize the pattern.
+
+        Args:
+            pattern (str): The regular expression
+            flags (int): Flags of the re module
+        """
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled: Optional[Pattern] = None
+
+    def compiled(self) -> Pattern:
+        """Get the compiled pattern."""
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = compile_pattern(self.pattern, self.flags)
+        return compiled
+
+    def search(self, string: str, *args) -> Optional[Match]:
+        return (self._compiled or self.compiled()).search(string, *args)
+
+    def match(self, string: str, *args) -> Optional[Match]:
+        return (self._compiled or self.compiled()).match(string, *args)
+
+    def fullmatch(self, string: str, *args) -> Optional[Match]:
+        return (self._compiled or self.compiled()).fullmatch(string, *args)
+
+    def finditer(self, string: str, *args) -> Iterator[Match]:
+        return (self._compiled or self.compiled()).finditer(string, *args)
+
+    def findall(self, string: str, *args) -> list:
+        return (self._compiled or self.compiled()).findall(string, *args)
+
+    def split(self, string: str, maxsplit: int = 0) -> list:
+        return (self._compiled or self.compiled()).split(string, maxsplit)
+
+    def sub(self, repl: Union[str, Callable[[Match], str]], string: str, count: int = 0) -> str:
+        return (self._compiled or self.compiled()).sub(repl, string, count)
+
+    def subn(self, repl: Union[str, Callable[[Match], str]], string: str, count: int = 0) -> Tuple[str, int]:
+        return (self._compiled or self.compiled()).subn(repl, string, count)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the pattern."""
+        return f"LazyPattern({self.pattern!r})"
+
+
+def lazy_pattern(pattern: str, flags: int = 0) -> LazyPattern:
+    """
+    Declare a static pattern, compiled on first use or by warmup.
+
+    Args:
+        pattern (str): The regular expression
+        flags (int): Flags of the re module
+
+    Returns:
+        LazyPattern: The pattern
+    """
+    lazy = LazyPattern(pattern, flags)
+    _LAZY_PATTERNS.append(lazy)
+    return lazy
+
+
+def register_warmup(function: Callable[[], object]) -> Callable[[], object]:
+    """
+    Register a function that builds runtime patterns, to be called by warmup.
+
+    Can be used as a decorator.
+
+    Args:
+        function (Callable[[], object]): Function without arguments
+
+    Returns:
+        Callable[[], object]: The function
+    """
+    _WARMUP_FUNCTIONS.append(function)
+    return function
+
+
+def pattern_stats() -> PatternStats:
+    """Get the number of patterns compiled so far and the time spent compiling them."""
+    return PatternStats(len(_COMPILED) + _unkept_count, _compile_seconds)
+
+
+def warmup() -> PatternStats:
+    """
+    Compile every pattern used by trnorm now instead of on first use.
+
+    Returns:
+        PatternStats: Statistics of all patterns compiled so far
+    """
+    # Modules declare their patterns when they are imported
+    from . import legacy_normalizer, normalizer  # noqa: F401
+
+    for lazy in list(_LAZY_PATTERNS):
+        lazy.compiled()
+    for function in list(_WARMUP_FUNCTIONS):
+        function()
+    return pattern_stats()
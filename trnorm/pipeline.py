@@ -0,0 +1,303 @@
+"""
+Pipeline planner for the normalizer.
+
+Stages (conversion functions) can declare metadata describing how they
+interact with other stages:
+
+- idempotent: running the stage twice gives the same result as running it once
+- commutes_with: stages that give the same result when run in either order
+- fusable_with: stages that, run right after this one, can be replaced together
+  by a single fused stage
+- triggers: a regular expression; text without a match is returned unchanged
+
+plan_pipeline uses this metadata to rewrite a list of converters into an
+equivalent plan with fewer passes over the text, and records what it changed.
+Stages without metadata (e.g. user-defined functions) are kept as they are and
+are assumed to interact with every other stage.
+
+Examples:
+    >>> from trnorm.normalizer import DEFAULT_PIPELINE
+    >>> plan = plan_pipeline(DEFAULT_PIPELINE)
+    >>> len(DEFAULT_PIPELINE), len(plan.stages)
+    (14, 11)
+    >>> plan("Masa 75x120cm.")
+    'masa 75 çarpı 120 santimetre'
+"""
+
+from functools import lru_cache
+from itertools import product
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+from .alphanumeric import normalize_alphanumeric
+from .apostrophe_handler import remove_apostrophes
+from .dimension_utils import normalize_dimensions, preprocess_dimensions
+from .patterns import compile_pattern
+from .text_utils import fold, remove_punctuation, sapkasiz, turkish_lower
+from .time_utils import normalize_times
+
+Stage = Callable[..., str]
+
+
+class StageInfo(NamedTuple):
+    """Metadata of a pipeline stage, see register_stage."""
+
+    idempotent: bool = False
+    commutes_with: frozenset = frozenset()
+    fusable_with: Mapping[Stage, Stage] = {}
+    triggers: Optional[Pattern] = None
+
+
+# Metadata of the registered stages
+_STAGE_INFO: Dict[Stage, StageInfo] = {}
+
+_NO_INFO = StageInfo()
+
+
+def register_stage(stage: Stage, idempotent: bool = False, commutes_with: Iterable[Stage] = (),
+                   fusable_with: Optional[Mapping[Stage, Stage]] = None,
+                   triggers: Optional[str] = None) -> StageInfo:
+    """
+    Declare how a stage interacts with other stages, replacing its previous metadata.
+
+    The planner trusts the metadata, so it must hold for every input text.
+
+    Args:
+        stage (Stage): The conversion function
+        idempotent (bool): Whether stage(stage(text)) == stage(text)
+        commutes_with (Iterable[Stage]): Stages B with stage(B(text)) == B(stage(text)).
+            Commutation is symmetric, declaring it on either stage is enough.
+        fusable_with (Optional[Mapping[Stage, Stage]]): Maps a stage B to a single stage
+            F with F(text) == B(stage(text))
+        triggers (Optional[str]): Regular expression such that the stage returns text
+            unchanged if the pattern is not found in it
+
+    Returns:
+        StageInfo: The registered metadata
+    """
+    info = StageInfo(
+        idempotent=idempotent,
+        commutes_with=frozenset(commutes_with),
+        fusable_with=dict(fusable_with or {}),
+        triggers=compile_pattern(triggers) if triggers is not None else None,
+    )
+    _STAGE_INFO[stage] = info
+    _plan_stages.cache_clear()
+    return info
+
+
+def get_stage_info(stage: Stage) -> StageInfo:
+    """Get the metadata of a stage (empty metadata if it was not registered)."""
+    return _STAGE_INFO.get(stage, _NO_INFO)
+
+
+def _name(stage: Stage) -> str:
+    """Get the name of a stage for reports."""
+    return getattr(stage, "__name__", repr(stage))
+
+
+def _commute(first: Stage, second: Stage) -> bool:
+    """Check whether two stages were declared to commute."""
+    return second in get_stage_info(first).commutes_with or first in get_stage_info(second).commutes_with
+
+
+class PipelinePlan:
+    """
+    An optimized pipeline produced by plan_pipeline.
+
+    Calling the plan applies its stages like normalize applies a converter list:
+    each stage is called with the text and the context text, or with the text
+    only if it does not accept a second argument.
+    """
+
+    __slots__ = ("converters", "stages", "changes", "_steps")
+
+    def __init__(self, converters: Tuple[Stage, ...], stages: Tuple[Stage, ...], changes: Tuple[str, ...]):
+        """
+        Initialize the plan.
+
+        Args:
+            converters (Tuple[Stage, ...]): The converter list the plan was made from
+            stages (Tuple[Stage, ...]): The stages to run
+            changes (Tuple[str, ...]): Descriptions of the rewrites, in the order they were made
+        """
+        self.converters = converters
+        self.stages = stages
+        self.changes = changes
+        self._steps = tuple((stage, get_stage_info(stage).triggers) for stage in stages)
+
+    def __call__(self, text: str, context_text: Optional[Any] = None) -> str:
+        """
+        Apply the plan to a single text.
+
+        Stages with triggers are skipped when the text cannot be changed by them.
+        """
+        for stage, triggers in self._steps:
+            if triggers is not None and triggers.search(text) is None:
+                continue
+            try:
+                text = stage(text, context_text)
+            except TypeError:
+                text = stage(text)
+        return text
+
+    def report(self) -> str:
+        """
+        Describe the plan and what the planner changed.
+
+        Returns:
+            str: One line per stage, followed by one line per change
+        """
+        lines = [f"{len(self.converters)} stages planned as {len(self.stages)}:"]
+        for number, (stage, triggers) in enumerate(self._steps, 1):
+            line = f"  {number}. {_name(stage)}"
+            if triggers is not None:
+                line += f" (skipped without {triggers.pattern})"
+            lines.append(line)
+        lines.extend(f"- {change}" for change in self.changes or ("no changes",))
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the plan."""
+        return f"PipelinePlan({', '.join(_name(stage) for stage in self.stages)})"
+
+
+def _drop_redundant(stages: List[Stage], changes: List[str]) -> bool:
+    """
+    Drop the first idempotent stage that runs again later with only commuting stages in between.
+
+    S, B1, ..., Bk, S equals B1, ..., Bk, S, S when S commutes with every Bi, and S, S equals S.
+    """
+    for i, stage in enumerate(stages):
+        if not get_stage_info(stage).idempotent:
+            continue
+        for j in range(i + 1, len(stages)):
+            if stages[j] is stage:
+                between = ", ".join(_name(other) for other in stages[i + 1:j])
+                reason = f"commutes with {between}" if between else "runs twice in a row"
+                changes.append(f"removed {_name(stage)} at position {i + 1}: it runs again later and {reason}")
+                del stages[i]
+                return True
+            if not _commute(stage, stages[j]):
+                break
+    return False
+
+
+def _fuse(stages: List[Stage], changes: List[str]) -> bool:
+    """Replace the first pair of adjacent stages that can be fused by the fused stage."""
+    for i in range(len(stages) - 1):
+        fused = get_stage_info(stages[i]).fusable_with.get(stages[i + 1])
+        if fused is not None:
+            changes.append(f"fused {_name(stages[i])} and {_name(stages[i + 1])} into {_name(fused)}")
+            stages[i:i + 2] = [fused]
+            return True
+    return False
+
+
+@lru_cache(maxsize=64)
+def _plan_stages(converters: Tuple[Stage, ...]) -> PipelinePlan:
+    """Plan a converter list (cached, the cache is cleared when metadata changes)."""
+    stages = list(converters)
+    changes: List[str] = []
+    # Redundant stages are dropped before fusing, as a fused stage hides its parts
+    while _drop_redundant(stages, changes) or _fuse(stages, changes):
+        pass
+    return PipelinePlan(converters, tuple(stages), tuple(changes))
+
+
+def plan_pipeline(converters: Iterable[Stage]) -> PipelinePlan:
+    """
+    Rewrite a converter list into an equivalent plan with fewer passes over the text.
+
+    The planner repeatedly removes idempotent stages that run again later with
+    only commuting stages in between, and fuses adjacent stages that declared a
+    fused replacement. The returned plan also skips stages with triggers when
+    the text has no match for them.
+
+    Args:
+        converters (Iterable[Stage]): The conversion functions, in order
+
+    Returns:
+        PipelinePlan: The plan; plan.changes describes the rewrites
+    """
+    converters = tuple(converters)
+    try:
+        return _plan_stages(converters)
+    except TypeError:
+        # Unhashable converters cannot be cached
+        return _plan_stages.__wrapped__(converters)
+
+
+# Stages of text_utils.fold, in the order fold applies them
+_FOLD_STEPS = (("lower", turkish_lower), ("dehat", sapkasiz), ("strip_punct", remove_punctuation))
+
+
+def _fold_stage(flags: Tuple[bool, bool, bool]) -> Stage:
+    """Create the stage running fold with the given (lower, dehat, strip_punct) flags."""
+    lower, dehat, strip_punct = flags
+
+    def stage(text: str) -> str:
+        return fold(text, lower, dehat, strip_punct)
+
+    names = [name for (name, _), enabled in zip(_FOLD_STEPS, flags) if enabled]
+    stage.__name__ = stage.__qualname__ = f"fold({', '.join(names)})"
+    return stage
+
+
+# Circumflexes are letters to all of these stages, so removing them can be done before
+# or after any of them. The unit and dimension stages are not among them: they match
+# unit abbreviations only without circumflexes, e.g. "3 gâl" is converted only after
+# sapkasiz has made it "3 gal".
+_SAPKASIZ_COMMUTES = (turkish_lower, remove_punctuation, remove_apostrophes)
+
+
+def _register_fold_stages() -> None:
+    """
+    Register turkish_lower, sapkasiz, remove_punctuation and their fold combinations.
+
+    A stage of the family can be fused with a following one if all of its steps come
+    before the steps of the following one in fold, e.g. turkish_lower and sapkasiz
+    into fold(lower, dehat).
+    """
+    family = {}
+    for flags in product((False, True), repeat=3):
+        if sum(flags) == 1:
+            family[flags] = _FOLD_STEPS[flags.index(True)][1]
+        elif sum(flags) > 1:
+            family[flags] = _fold_stage(flags)
+
+    for flags, stage in family.items():
+        last = max(i for i, enabled in enumerate(flags) if enabled)
+        fusions = {}
+        for other_flags, other in family.items():
+            first = min(i for i, enabled in enumerate(other_flags) if enabled)
+            if last < first:
+                fusions[other] = family[tuple(a or b for a, b in zip(flags, other_flags))]
+        register_stage(
+            stage,
+            idempotent=True,
+            commutes_with=_SAPKASIZ_COMMUTES if stage is sapkasiz else (),
+            fusable_with=fusions,
+        )
+
+
+_register_fold_stages()
+
+# normalize_dimensions handles merged dimensions itself
+register_stage(preprocess_dimensions, idempotent=True, triggers=r"\d",
+               fusable_with={normalize_dimensions: normalize_dimensions})
+
+# Stages that only change text with digits or quotes
+register_stage(normalize_times, triggers=r"\d")
+register_stage(normalize_alphanumeric, triggers=r"\d")
+register_stage(remove_apostrophes, triggers="['\"]")
@@ -1,11 +1,17 @@
 """
 Module for handling Roman numerals in Turkish text normalization.
 
-This module provides functions to convert Roman numerals to Arabic numbers
-and identify Roman numerals in text.
+This module provides functions to convert between Roman numerals and Arabic
+numbers and identify Roman numerals in text.
+
+The canonical numerals of 1 to 3999 are indexed in both directions on first
+use, so validating and converting a numeral is a single dictionary lookup.
 """
 
-import re
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
+
+from trnorm.patterns import lazy_pattern
 
 # Dictionary mapping Roman numeral symbols to their values
 ROMAN_VALUES = {
@@ -18,18 +24,54 @@ ROMAN_VALUES = {
     'M': 1000
 }
 
+# Largest number that can be written with the standard symbols
+MAX_ROMAN = 3999
+
+# Symbols and subtractive pairs from largest to smallest value, used to write numerals
+_ROMAN_SYMBOLS = (
+    (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"),
+    (100, "C"), (90, "XC"), (50, "L"), (40, "XL"),
+    (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"),
+)
+
 # Regular expression pattern to match valid Roman numerals
 # This pattern enforces standard Roman numeral rules:
 # - I, X, C, M can be repeated up to 3 times
 # - V, L, D cannot be repeated
 # - Subtractive combinations are limited to specific pairs (IV, IX, XL, XC, CD, CM)
-ROMAN_PATTERN = re.compile(r'^(?=[IVXLCDM])M{0,3}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})$')
+_ROMAN = lazy_pattern(r"^(?=[IVXLCDM])M{0,3}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})$")
 
 # Pattern to match Roman numerals using only I, V, X (up to 39) followed by a period in text
 # This is used to identify potential ordinal Roman numerals
 # Limited to common use cases in Turkish text (typically up to 39/XXXIX)
 # This prevents incorrect conversion of initials like "D." in names like "Mehmet D."
-ROMAN_ORDINAL_PATTERN = re.compile(r'\b([IVX]+)\.\s+([A-Za-zÇçĞğİıÖöŞşÜü]\w*)')
+_ROMAN_ORDINAL = lazy_pattern(r"\b([IVX]+)\.\s+([A-Za-zÇçĞğİıÖöŞşÜü]\w*)")
+
+
+# Canonical numerals indexed by number (index 0 is unused), built on first use
+_ARABIC_TO_ROMAN: List[str] = []
+# Read-only mapping of canonical numerals to their values, built on first use
+_ROMAN_TO_ARABIC: Mapping[str, int] = MappingProxyType({})
+
+
+def _write_roman(number: int) -> str:
+    """Write a number between 1 and MAX_ROMAN as a canonical Roman numeral."""
+    parts = []
+    for value, symbol in _ROMAN_SYMBOLS:
+        count, number = divmod(number, value)
+        parts.append(symbol * count)
+    return "".join(parts)
+
+
+def _roman_index() -> Mapping[str, int]:
+    """Build (once) the indexes of all canonical Roman numerals."""
+    global _ROMAN_TO_ARABIC
+    if not _ROMAN_TO_ARABIC:
+        numerals = [""] + [_write_roman(number) for number in range(1, MAX_ROMAN + 1)]
+        index = {numeral: number for number, numeral in enumerate(numerals) if number}
+        _ARABIC_TO_ROMAN[:] = numerals
+        _ROMAN_TO_ARABIC = MappingProxyType(index)
+    return _ROMAN_TO_ARABIC
 
 
 def is_roman_numeral(s):
@@ -42,7 +84,7 @@ def is_roman_numeral(s):
     Returns:
         bool: True if the string is a valid Roman numeral, False otherwise
     """
-    return bool(ROMAN_PATTERN.match(s.upper()))
+    return s.upper() in _roman_index()
 
 
 def roman_to_arabic(roman):
@@ -58,26 +100,29 @@ def roman_to_arabic(roman):
     Raises:
         ValueError: If the input is not a valid Roman numeral
     """
-    if not is_roman_numeral(roman):
+    number = _roman_index().get(roman.upper())
+    if number is None:
         raise ValueError(f"Invalid Roman numeral: {roman}")
+    return number
+
+
+def arabic_to_roman(number):
+    """
+    Convert an Arabic (integer) number to its Roman numeral.
     
-    result = 0
-    prev_value = 0
-    
-    # Process the Roman numeral from right to left
-    for char in reversed(roman.upper()):
-        value = ROMAN_VALUES[char]
+    Args:
+        number (int): The number to convert, between 1 and 3999
         
-        # If the current value is less than the previous value,
-        # it's a subtractive combination (like IV for 4)
-        if value < prev_value:
-            result -= value
-        else:
-            result += value
+    Returns:
+        str: The canonical Roman numeral, in uppercase
         
-        prev_value = value
-    
-    return result
+    Raises:
+        ValueError: If the number cannot be written as a Roman numeral
+    """
+    if not isinstance(number, int) or not 1 <= number <= MAX_ROMAN:
+        raise ValueError(f"Cannot write {number!r} as a Roman numeral (1-{MAX_ROMAN})")
+    _roman_index()
+    return _ARABIC_TO_ROMAN[number]
 
 
 def find_roman_ordinals(text):
@@ -91,10 +136,47 @@ def find_roman_ordinals(text):
         list: A list of tuples containing (roman_numeral, word, position)
     """
     results = []
-    for match in ROMAN_ORDINAL_PATTERN.finditer(text):
+    for match in _ROMAN_ORDINAL.finditer(text):
         roman = match.group(1)
         word = match.group(2)
         position = match.start()
         results.append((roman, word, position))
     
     return results
+
+
+def find_roman_ordinal_values(text) -> List[Tuple[int, str, int]]:
+    """
+    Find all Roman ordinals in a text, with their numeric values.
+    
+    Like find_roman_ordinals, but numerals are converted while scanning and
+    candidates that are not valid numerals (e.g. "IIII.") are skipped.
+    
+    Args:
+        text (str): The text to search for Roman ordinals
+        
+    Returns:
+        list: A list of tuples containing (value, word, position)
+    
+    Examples:
+        >>> find_roman_ordinal_values("XX. yüzyılda II. Dünya Savaşı yaşandı.")
+        [(20, 'yüzyılda', 0), (2, 'Dünya', 13)]
+    """
+    index = _roman_index()
+    results = []
+    for match in _ROMAN_ORDINAL.finditer(text):
+        number = index.get(match.group(1))
+        if number is not None:
+            results.append((number, match.group(2), match.start()))
+    return results
+
+
+# Compiled patterns available as module attributes, compiled on first access
+_PUBLIC_PATTERNS = {"ROMAN_PATTERN": _ROMAN, "ROMAN_ORDINAL_PATTERN": _ROMAN_ORDINAL}
+
+
+def __getattr__(name):
+    pattern = _PUBLIC_PATTERNS.get(name)
+    if pattern is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return pattern.compiled()
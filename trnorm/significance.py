@@ -0,0 +1,241 @@
+"""
+Bootstrap confidence intervals and paired significance tests for corpus WER.
+
+Comparing model checkpoints needs more than two corpus WER numbers: the
+difference has to be judged against the sampling noise of the test set.
+The functions in this module work on precomputed per-utterance edit counts
+and reference lengths (for example ``score_corpus(...)["wer"].edits`` and
+``.lengths``), so no edit distance is ever recomputed. Resampling is
+vectorized with NumPy: identical utterance rows are collapsed and each
+replicate draws their multiplicities from a multinomial distribution, so
+10k replicates over 100k utterances take well under a second.
+
+NumPy is required for this module (``pip install trnorm[numpy]``).
+"""
+
+from typing import NamedTuple, Optional, Sequence
+
+# Upper bound on the number of resampled multiplicities held in memory at once
+BLOCK_ELEMENTS = 1 << 22
+
+
+class BootstrapResult(NamedTuple):
+    """
+    Bootstrap estimate of a corpus error rate.
+
+    Attributes:
+        rate (float): Corpus error rate of the original sample
+        low (float): Lower bound of the confidence interval
+        high (float): Upper bound of the confidence interval
+        std (float): Standard deviation of the bootstrap replicates
+        confidence (float): Confidence level of the interval
+        replicates (int): Number of bootstrap replicates
+    """
+    rate: float
+    low: float
+    high: float
+    std: float
+    confidence: float
+    replicates: int
+
+
+class PairedBootstrapResult(NamedTuple):
+    """
+    Result of a paired bootstrap comparison of two systems.
+
+    Attributes:
+        rate_a (float): Corpus error rate of system A
+        rate_b (float): Corpus error rate of system B
+        delta (float): rate_b - rate_a on the original sample
+        low (float): Lower bound of the confidence interval of delta
+        high (float): Upper bound of the confidence interval of delta
+        p_value (float): Fraction of replicates in which the sign of delta does
+            not agree with the observed one (1.0 when the systems are tied)
+        confidence (float): Confidence level of the interval
+        replicates (int): Number of bootstrap replicates
+    """
+    rate_a: float
+    rate_b: float
+    delta: float
+    low: float
+    high: float
+    p_value: float
+    confidence: float
+    replicates: int
+
+
+def _require_numpy():
+    """Import NumPy, raising a helpful error if it is not installed."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("trnorm.significance requires NumPy: pip install trnorm[numpy]") from e
+    return numpy
+
+
+def _as_arrays(np, lengths: Sequence[int], *edit_counts: Sequence[int]):
+    """Convert per-utterance inputs to arrays and validate them."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    arrays = [np.asarray(edits, dtype=np.int64) for edits in edit_counts]
+
+    if lengths.ndim != 1 or any(edits.shape != lengths.shape for edits in arrays):
+        raise ValueError("Edit counts and reference lengths must be 1D arrays of the same length")
+    if len(lengths) == 0:
+        raise ValueError("At least one utterance is required")
+    if lengths.sum() == 0:
+        raise ValueError("Total reference length must be positive")
+
+    return lengths, arrays
+
+
+def _resampled_sums(np, rng, n: int, columns):
+    """
+    Sum each column over n bootstrap resamples of the utterances.
+
+    Resampling N utterances with replacement only depends on how often each
+    distinct row of values is drawn. Rows are therefore collapsed into K
+    distinct value tuples with their counts, and each replicate draws the
+    multiplicities from a multinomial distribution. This is equivalent to
+    resampling indices, but costs O(K) instead of O(N) per replicate, and
+    K is small for edit counts and lengths.
+
+    Args:
+        np: The numpy module
+        rng: A numpy Generator
+        n (int): Number of replicates
+        columns: List of 1D integer arrays sharing the utterance axis
+
+    Returns:
+        List of arrays of shape (n,), one per column, with the resampled sums
+    """
+    size = len(columns[0])
+    values, counts = np.unique(np.stack(columns, axis=1), axis=0, return_counts=True)
+    probabilities = counts / size
+    block = max(1, BLOCK_ELEMENTS // len(values))
+    sums = [np.empty(n, dtype=np.int64) for _ in columns]
+
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        multiplicities = rng.multinomial(size, probabilities, size=stop - start)
+        for k, out in enumerate(sums):
+            out[start:stop] = multiplicities @ values[:, k]
+
+    return sums
+
+
+def _ratio(np, edits, lengths):
+    """Divide resampled edit sums by resampled lengths, mapping 0/0 to 1.0 like wer()."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(lengths > 0, edits / np.maximum(lengths, 1), 1.0)
+
+
+def bootstrap_wer(edit_counts: Sequence[int], ref_lengths: Sequence[int], n: int = 10000,
+                  confidence: float = 0.95, seed: Optional[int] = None) -> BootstrapResult:
+    """
+    Estimate a confidence interval for corpus WER (or CER) by bootstrap resampling.
+
+    Utterances are resampled with replacement and the corpus rate
+    sum(edits) / sum(lengths) is computed for every replicate. The interval
+    is given by the percentiles of the replicates.
+
+    Args:
+        edit_counts (Sequence[int]): Per-utterance edit distances
+        ref_lengths (Sequence[int]): Per-utterance reference lengths (words for WER,
+            characters for CER)
+        n (int): Number of bootstrap replicates
+        confidence (float): Confidence level of the interval, between 0 and 1
+        seed (Optional[int]): Seed for the random number generator
+
+    Returns:
+        BootstrapResult: The corpus rate with its confidence interval
+
+    Raises:
+        ValueError: If the inputs are empty or have different lengths
+        ImportError: If NumPy is not installed
+
+    Examples:
+        >>> scores = score_corpus(refs, hyps, metrics=["wer"])
+        >>> result = bootstrap_wer(scores["wer"].edits, scores["wer"].lengths, seed=0)
+        >>> result.low, result.high
+    """
+    np = _require_numpy()
+    lengths, (edits,) = _as_arrays(np, ref_lengths, edit_counts)
+    rng = np.random.default_rng(seed)
+
+    edit_sums, length_sums = _resampled_sums(np, rng, n, [edits, lengths])
+    replicates = _ratio(np, edit_sums, length_sums)
+
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(replicates, [alpha, 1.0 - alpha])
+
+    return BootstrapResult(
+        rate=float(edits.sum() / lengths.sum()),
+        low=float(low),
+        high=float(high),
+        std=float(replicates.std()),
+        confidence=confidence,
+        replicates=n,
+    )
+
+
+def paired_bootstrap_test(edit_counts_a: Sequence[int], edit_counts_b: Sequence[int],
+                          ref_lengths: Sequence[int], n: int = 10000, confidence: float = 0.95,
+                          seed: Optional[int] = None) -> PairedBootstrapResult:
+    """
+    Compare two systems scored on the same utterances with a paired bootstrap test.
+
+    Both systems are evaluated on the same resampled utterances in every
+    replicate, so the test accounts for the correlation between them. The
+    p-value is the fraction of replicates in which the difference of corpus
+    rates does not have the sign observed on the original sample.
+
+    Args:
+        edit_counts_a (Sequence[int]): Per-utterance edit distances of system A
+        edit_counts_b (Sequence[int]): Per-utterance edit distances of system B
+        ref_lengths (Sequence[int]): Per-utterance reference lengths, shared by both systems
+        n (int): Number of bootstrap replicates
+        confidence (float): Confidence level of the interval of the difference
+        seed (Optional[int]): Seed for the random number generator
+
+    Returns:
+        PairedBootstrapResult: Rates of both systems, their difference (B - A)
+            with its confidence interval, and the p-value
+
+    Raises:
+        ValueError: If the inputs are empty or have different lengths
+        ImportError: If NumPy is not installed
+    """
+    np = _require_numpy()
+    lengths, (edits_a, edits_b) = _as_arrays(np, ref_lengths, edit_counts_a, edit_counts_b)
+    rng = np.random.default_rng(seed)
+
+    # Resampling the per-utterance difference gives sum(b) - sum(a) directly
+    diff_sums, length_sums = _resampled_sums(np, rng, n, [edits_b - edits_a, lengths])
+    replicates = _ratio(np, diff_sums, length_sums)
+    replicates[length_sums == 0] = 0.0
+
+    total_length = lengths.sum()
+    rate_a = float(edits_a.sum() / total_length)
+    rate_b = float(edits_b.sum() / total_length)
+    delta = rate_b - rate_a
+
+    if delta > 0:
+        p_value = float(np.mean(replicates <= 0))
+    elif delta < 0:
+        p_value = float(np.mean(replicates >= 0))
+    else:
+        p_value = 1.0
+
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(replicates, [alpha, 1.0 - alpha])
+
+    return PairedBootstrapResult(
+        rate_a=rate_a,
+        rate_b=rate_b,
+        delta=delta,
+        low=float(low),
+        high=float(high),
+        p_value=p_value,
+        confidence=confidence,
+        replicates=n,
+    )
@@ -0,0 +1,129 @@
+"""
+Versioned, copy-on-write mappings for configuration that can change at runtime.
+
+Symbol and unit mappings can be extended while other threads are converting
+text. Instead of mutating a shared dictionary, every update builds a new
+immutable MappingSnapshot and publishes it with a single assignment. Readers
+take the current snapshot once and use it for the whole conversion, so they
+never see a half-applied update, and anything derived from a snapshot (e.g. a
+compiled regex) can be cached by its version.
+"""
+
+import threading
+
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Iterable, Iterator, Tuple, Union
+
+
+class MappingSnapshot(Mapping):
+    """
+    Read-only mapping with the version of the registry that published it.
+
+    Versions start at 0 and grow by one with every update of the registry.
+    """
+
+    __slots__ = ("_data", "version")
+
+    def __init__(self, data: Dict[Hashable, Any], version: int = 0):
+        """
+        Initialize the snapshot.
+
+        Args:
+            data (Dict[Hashable, Any]): The entries. The dictionary is owned by the
+                snapshot and must not be modified afterwards.
+            version (int): The version of the snapshot
+        """
+        self._data = data
+        self.version = version
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the snapshot."""
+        return f"MappingSnapshot(version={self.version}, {self._data!r})"
+
+
+class VersionedMapping:
+    """
+    Registry that publishes a new immutable snapshot on every update.
+
+    Updates are serialized by a lock; reads are a single attribute access and
+    need no lock.
+
+    Examples:
+        >>> units = VersionedMapping({"cm": "santimetre"})
+        >>> before = units.snapshot()
+        >>> units.set("mm", "milimetre").version
+        1
+        >>> "mm" in before
+        False
+    """
+
+    __slots__ = ("_snapshot", "_lock")
+
+    def __init__(self, initial: Union[Mapping, Iterable[Tuple[Hashable, Any]]] = ()):
+        """
+        Initialize the registry.
+
+        Args:
+            initial: The entries of the first snapshot (version 0)
+        """
+        self._snapshot = MappingSnapshot(dict(initial), 0)
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> MappingSnapshot:
+        """Get the current snapshot."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot."""
+        return self._snapshot.version
+
+    def update(self, entries: Union[Mapping, Iterable[Tuple[Hashable, Any]]]) -> MappingSnapshot:
+        """
+        Add or replace entries and publish the result as a new snapshot.
+
+        Args:
+            entries: The entries to add or replace
+
+        Returns:
+            MappingSnapshot: The published snapshot
+        """
+        with self._lock:
+            current = self._snapshot
+            data = dict(current._data)
+            data.update(entries)
+            snapshot = MappingSnapshot(data, current.version + 1)
+            self._snapshot = snapshot
+        return snapshot
+
+    def set(self, key: Hashable, value: Any) -> MappingSnapshot:
+        """
+        Add or replace a single entry and publish the result as a new snapshot.
+
+        Args:
+            key (Hashable): The key
+            value (Any): The value
+
+        Returns:
+            MappingSnapshot: The published snapshot
+        """
+        return self.update({key: value})
+
+    def __repr__(self) -> str:
+        """Return a string representation of the registry."""
+        return f"VersionedMapping(version={self.version}, entries={len(self._snapshot)})"
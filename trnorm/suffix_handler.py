@@ -8,6 +8,9 @@ It can identify and process the following Turkish suffixes:
 
 The module can process a single string or a list of strings, identifying and
 merging these suffixes with their preceding words according to Turkish grammar rules.
+When a context text is available (e.g. the reference when normalizing a hypothesis),
+context_aware_merge_suffixes keeps or merges all suffixes based on their counts in both
+texts, and aligned_merge_suffixes decides for each suffix based on a word alignment.
 
 Examples:
 - "Toros ile hamile" -> "Torosla hamile"
@@ -15,11 +18,105 @@ Examples:
 - "Hâl böyle iken böyle dedi adam." -> "Hâl böyleyken böyle dedi adam."
 """
 
-import re
-from typing import Union, List, Optional, Dict
+from functools import lru_cache
+from typing import Container, Dict, FrozenSet, List, Optional, Tuple, Union
 
+from trnorm.metrics import DELETION, MATCH, SUBSTITUTION, align
+from trnorm.patterns import lazy_pattern
 from trnorm.text_utils import ekle, turkish_lower
 
+# Particles that are merged with their preceding word
+_PARTICLES = ("ile", "ise", "iken")
+
+# Candidate particles: tokens delimited by whitespace or the punctuation used when counting,
+# spelled with any character that lowercases (with str.lower or turkish_lower) to a particle
+# letter. Whether a candidate is merged and/or counted is decided per match. The boundary
+# check follows the first letter so the scan can skip quickly to candidate positions.
+_PARTICLE_CANDIDATE = lazy_pattern(
+    r"[iIİ](?<![^\s,.;:?!].)(?:[lL][eE]|[sS][eE]|[kKK][eE][nN])(?![^\s,.;:?!])"
+)
+
+# Whitespace-delimited words, used to align a text with its context
+_WORD = lazy_pattern(r"\S+")
+
+
+def _scan_suffixes(text: str, counts: Optional[Dict[str, int]] = None, merge: bool = True,
+                   preserve: Optional[Container[int]] = None) -> str:
+    """
+    Merge all particles with their preceding words in a single pass over the text.
+
+    A single regex scan finds every particle. Particles delimited by whitespace
+    whose lowercase form is "ile", "ise" or "iken" are merged, left to right, so a
+    particle can merge with a word that already absorbed another particle (e.g.
+    "gelir ise ile" -> "gelirseyle"). When ekle cannot attach a particle
+    (abbreviations, words without vowels), both words are kept. Whitespace between
+    words that are not merged is kept as is.
+
+    Args:
+        text (str): The text to process
+        counts (Optional[Dict[str, int]]): If given, the particle counts of the text
+            (as computed by _count_suffixes) are added to it during the same scan
+        merge (bool): Whether to merge particles. If False, only counts are computed.
+        preserve (Optional[Container[int]]): Start offsets of particles that must be kept
+            separate from their preceding word
+
+    Returns:
+        str: The text with particles merged (or the original text if merge is False)
+    """
+    out = []
+    # The word before the current position, not written to out yet (None at the start)
+    previous = None
+    position = 0
+
+    for match in _PARTICLE_CANDIDATE.finditer(text):
+        token = match.group()
+        if counts is not None:
+            lowered = turkish_lower(token)
+            if lowered in counts:
+                counts[lowered] += 1
+
+        if not merge:
+            continue
+        start, end = match.span()
+        suffix = token.lower()
+        if (suffix not in _PARTICLES or (start > 0 and not text[start - 1].isspace())
+                or (end < len(text) and not text[end].isspace())):
+            continue
+
+        # Everything between the previous particle and this one; the word right before
+        # the whitespace preceding this particle becomes the candidate to merge with
+        gap = text[position:start]
+        body = gap.rstrip()
+        separator = gap[len(body):]
+        if body:
+            word_start = len(body) - len(body.rsplit(None, 1)[-1])
+            if previous is not None:
+                out.append(previous)
+            out.append(body[:word_start])
+            previous = body[word_start:]
+
+        if previous and not (preserve and start in preserve):
+            merged = ekle(previous, suffix)
+            if " " not in merged:
+                previous = merged
+                position = end
+                continue
+            # ekle could not attach the suffix: keep both words, with the particle lowercased
+            out.append(previous)
+            token = suffix
+        elif previous is not None:
+            out.append(previous)
+        out.append(separator)
+        previous = token
+        position = end
+
+    if not merge or not out and previous is None:
+        return text
+    if previous is not None:
+        out.append(previous)
+    out.append(text[position:])
+    return "".join(out)
+
 
 def merge_suffixes(text: Union[str, List[str]]) -> Union[str, List[str]]:
     """
@@ -38,12 +135,7 @@ def merge_suffixes(text: Union[str, List[str]]) -> Union[str, List[str]]:
     if isinstance(text, list):
         return [merge_suffixes(item) for item in text]
     
-    # Process each suffix type
-    text = _process_suffix(text, "ile")
-    text = _process_suffix(text, "ise")
-    text = _process_suffix(text, "iken")
-    
-    return text
+    return _scan_suffixes(text)
 
 
 def context_aware_merge_suffixes(text: Union[str, List[str]], 
@@ -82,8 +174,9 @@ def context_aware_merge_suffixes(text: Union[str, List[str]],
     if context_text is None:
         return merge_suffixes(text)
     
-    # Count suffixes in both texts
-    text_suffixes = _count_suffixes(text)
+    # Count suffixes in both texts, merging the text's suffixes in the same pass
+    text_suffixes = dict.fromkeys(_PARTICLES, 0)
+    merged_text = _scan_suffixes(text, text_suffixes)
     context_suffixes = _count_suffixes(context_text)
     
     # Compare suffix patterns
@@ -91,8 +184,93 @@ def context_aware_merge_suffixes(text: Union[str, List[str]],
         # If patterns match, preserve suffixes (don't merge)
         return text
     else:
-        # If patterns don't match, proceed with regular merging
-        return merge_suffixes(text)
+        # If patterns don't match, use the merged text
+        return merged_text
+
+
+# Characters stripped from word ends when words of a text and its context are aligned
+_ALIGNMENT_PUNCTUATION = ",.;:?!"
+
+# Maximum number of text/context word sequence pairs whose alignment is cached
+ALIGNMENT_CACHE_SIZE = 1024
+
+
+def aligned_merge_suffixes(text: Union[str, List[str]],
+                           context_text: Optional[Union[str, List[str]]] = None) -> Union[str, List[str]]:
+    """
+    Context-aware suffix merging that decides for each particle separately.
+
+    The words of the text are aligned with the words of the context text. A
+    particle ("ile", "ise", "iken") is kept separate when it is aligned with the
+    same particle in the context, and merged with its preceding word otherwise.
+    Unlike context_aware_merge_suffixes, which keeps or merges all particles
+    based on their total counts, this handles long utterances where only some
+    of the particles differ.
+
+    The alignment is computed once per text/context pair (and cached), and only
+    when both texts contain particles.
+
+    Args:
+        text (Union[str, List[str]]): A string or list of strings to process
+        context_text (Optional[Union[str, List[str]]]): Optional secondary text to align
+            with (e.g., reference text when normalizing hypothesis)
+
+    Returns:
+        Union[str, List[str]]: The processed text with each particle merged or preserved
+
+    Examples:
+        >>> aligned_merge_suffixes("Ali ile Veli ile gitti", "Ali ile Veliyle gitti")
+        'Ali ile Veliyle gitti'
+    """
+    # Handle list input recursively
+    if isinstance(text, list):
+        if context_text is not None and isinstance(context_text, list):
+            if len(text) == len(context_text):
+                return [aligned_merge_suffixes(item, ctx) for item, ctx in zip(text, context_text)]
+            # If lengths don't match, ignore context
+            return [aligned_merge_suffixes(item) for item in text]
+        return [aligned_merge_suffixes(item, context_text) for item in text]
+
+    # Without context, or without particles in the context, every particle is merged
+    if context_text is None or not _PARTICLE_CANDIDATE.search(context_text):
+        return _scan_suffixes(text)
+
+    if not _PARTICLE_CANDIDATE.search(text):
+        return text
+
+    words = [(match.start(), match.group()) for match in _WORD.finditer(text)]
+    preserved = _preserved_particles(
+        tuple(_alignment_key(word) for _, word in words),
+        tuple(_alignment_key(word) for word in context_text.split()),
+    )
+    return _scan_suffixes(text, preserve={words[i][0] for i in preserved})
+
+
+def _alignment_key(word: str) -> str:
+    """Get the form of a word used to align a text with its context."""
+    return turkish_lower(word).strip(_ALIGNMENT_PUNCTUATION)
+
+
+@lru_cache(maxsize=ALIGNMENT_CACHE_SIZE)
+def _preserved_particles(words: Tuple[str, ...], context_words: Tuple[str, ...]) -> FrozenSet[int]:
+    """
+    Find the particles of a text that are aligned with the same particle in its context.
+
+    Args:
+        words (Tuple[str, ...]): Alignment keys of the words of the text
+        context_words (Tuple[str, ...]): Alignment keys of the words of the context
+
+    Returns:
+        FrozenSet[int]: Indices (in words) of the particles to keep separate
+    """
+    preserved = set()
+    i = 0
+    for operation, word, _ in align(words, context_words):
+        if operation == MATCH and word in _PARTICLES:
+            preserved.add(i)
+        if operation in (MATCH, SUBSTITUTION, DELETION):
+            i += 1
+    return frozenset(preserved)
 
 
 def _count_suffixes(text: str) -> Dict[str, int]:
@@ -105,20 +283,11 @@ def _count_suffixes(text: str) -> Dict[str, int]:
     Returns:
         Dict[str, int]: Dictionary with suffix types as keys and counts as values
     """
-    suffixes = {"ile": 0, "ise": 0, "iken": 0}
-    
-    # Convert to lowercase using turkish_lower for proper handling of Turkish characters
-    text = turkish_lower(text)
+    suffixes = dict.fromkeys(_PARTICLES, 0)
     
-    # Split by whitespace and common punctuation
-    # This regex splits on spaces, commas, semicolons, question marks, etc.
-    words = re.split(r'[\s,.;:?!]+', text)
-    
-    # Filter out empty strings that might result from the split
-    words = [word for word in words if word]
-    
-    for suffix in suffixes:
-        suffixes[suffix] = words.count(suffix)
+    # Words are lowercased with turkish_lower and delimited by whitespace and common
+    # punctuation (commas, semicolons, question marks, etc.)
+    _scan_suffixes(text, suffixes, merge=False)
     
     return suffixes
 
@@ -138,40 +307,3 @@ def _suffixes_match(suffixes1: Dict[str, int], suffixes2: Dict[str, int]) -> boo
         if count != suffixes2.get(suffix, 0):
             return False
     return True
-
-
-def _process_suffix(text: str, suffix: str) -> str:
-    """
-    Process a specific Turkish suffix in text.
-    
-    Args:
-        text (str): The text to process
-        suffix (str): The suffix to process ("ile", "ise", or "iken")
-        
-    Returns:
-        str: The processed text with the specified suffix merged
-    """
-    # Split text into words
-    words = text.split()
-    
-    # Find all occurrences of the suffix
-    suffix_indices = [i for i, word in enumerate(words) if word.lower() == suffix]
-    
-    # Process each suffix occurrence
-    for idx in reversed(suffix_indices):  # Process in reverse to avoid index shifting
-        # Skip if suffix is at the beginning of text (no preceding word)
-        if idx == 0:
-            continue
-        
-        # Get the word before the suffix
-        preceding_word = words[idx - 1]
-        
-        # Merge the suffix with the preceding word
-        merged_word = ekle(preceding_word, suffix)
-        
-        # Replace the original word and suffix with the merged word
-        words[idx - 1] = merged_word
-        words.pop(idx)
-    
-    # Join words back into text
-    return " ".join(words)
@@ -3,8 +3,14 @@ Mappings for symbol conversion in Turkish text normalization.
 
 This module defines the mappings between symbols and their text representations
 in Turkish. Users can modify this file to add new mappings or change existing ones.
+
+SYMBOL_MAPPINGS holds the built-in mappings. Mappings added at runtime with
+add_mapping are published as a new immutable snapshot (see trnorm.snapshots),
+so threads converting text concurrently never see a half-applied update.
 """
 
+from trnorm.snapshots import MappingSnapshot, VersionedMapping
+
 # Dictionary of symbol mappings
 # Format: symbol: (text_representation, text_after)
 # If text_after is True, the text will be placed after the number (e.g., for currencies)
@@ -34,15 +40,18 @@ SYMBOL_MAPPINGS = {
     # Add more symbols as needed
 }
 
+# Registry of the current mappings, starting with the built-in ones
+symbol_registry = VersionedMapping(SYMBOL_MAPPINGS)
+
 # Function to get all symbol mappings
-def get_all_mappings():
+def get_all_mappings() -> MappingSnapshot:
     """
     Get all symbol mappings.
     
     Returns:
-        dict: Dictionary of symbol mappings
+        MappingSnapshot: Read-only snapshot of the symbol mappings, with its version
     """
-    return SYMBOL_MAPPINGS
+    return symbol_registry.snapshot()
 
 # Function to get a specific symbol mapping
 def get_mapping(symbol):
@@ -55,7 +64,7 @@ def get_mapping(symbol):
     Returns:
         tuple: (text_representation, text_after) or None if the symbol is not found
     """
-    return SYMBOL_MAPPINGS.get(symbol)
+    return symbol_registry.snapshot().get(symbol)
 
 # Function to add a new symbol mapping
 def add_mapping(symbol, text_representation, text_after=False):
@@ -68,4 +77,4 @@ def add_mapping(symbol, text_representation, text_after=False):
         text_after (bool): If True, the text will be placed after the number
                            (e.g., for currencies in Turkish)
     """
-    SYMBOL_MAPPINGS[symbol] = (text_representation, text_after)
+    symbol_registry.set(symbol, (text_representation, text_after))
@@ -6,6 +6,11 @@ to their text representation in Turkish.
 """
 
 import re
+import threading
+from functools import partial
+
+from trnorm.patterns import LazyPattern, compile_pattern, register_warmup
+from trnorm.snapshots import VersionedMapping
 from trnorm.symbol_mappings import get_all_mappings, get_mapping, add_mapping
 
 
@@ -14,7 +19,11 @@ class SymbolConverter:
     A class to convert special symbols to their text representation.
     
     This class can be extended to handle various symbols by adding new
-    symbol-to-text mappings to the symbols_map dictionary.
+    symbol-to-text mappings with add_symbol_mapping.
+    
+    The mappings are kept as immutable, versioned snapshots (see trnorm.snapshots).
+    A conversion uses the snapshot current when it starts, together with the
+    pattern compiled for it, so mappings can be added while other threads convert.
     """
     
     def __init__(self, load_defaults=True):
@@ -24,28 +33,48 @@ class SymbolConverter:
         Args:
             load_defaults (bool): If True, load the default symbol mappings from symbol_mappings.py
         """
-        # Dictionary mapping symbols to their text representation
-        self.symbols_map = {}
-        
-        # Dictionary to track which symbols should have text placed after the number
-        self.text_after_number = set()
+        # Symbols mapped to (text representation, whether the text goes after the number)
+        self.mappings = VersionedMapping()
         
         # Compile regex patterns for each symbol
         self.patterns = {}
         self.reverse_patterns = {}  # For symbols that appear after numbers (e.g., 500 $)
         
+        # (snapshot, pattern matching every symbol in both positions, symbol order),
+        # compiled on first use. The pattern is reused while the set of symbols is unchanged.
+        self._compiled = None
+        
         # Load default mappings if requested
         if load_defaults:
             self.load_default_mappings()
     
+    @property
+    def symbols_map(self):
+        """Dictionary mapping symbols to their text representation (a copy of the current snapshot)."""
+        return {symbol: text_repr for symbol, (text_repr, _) in self.mappings.snapshot().items()}
+    
+    @property
+    def text_after_number(self):
+        """Symbols whose text is placed after the number."""
+        return frozenset(symbol for symbol, (_, text_after) in self.mappings.snapshot().items() if text_after)
+    
+    @property
+    def version(self):
+        """Version of the current mappings snapshot, incremented by every added mapping."""
+        return self.mappings.version
+    
     def load_default_mappings(self):
         """Load the default symbol mappings from symbol_mappings.py."""
-        for symbol, (text_repr, text_after) in get_all_mappings().items():
-            self.add_symbol_mapping(symbol, text_repr, text_after)
+        defaults = get_all_mappings()
+        for symbol in defaults:
+            self._compile_patterns(symbol)
+        self.mappings.update(
+            (symbol, (text_repr, bool(text_after))) for symbol, (text_repr, text_after) in defaults.items()
+        )
     
     def _compile_patterns(self, symbol):
         """
-        Compile regex patterns for a symbol.
+        Create the regex patterns for a symbol, compiled on first use.
         
         Args:
             symbol (str): The symbol to compile patterns for
@@ -54,13 +83,13 @@ class SymbolConverter:
         
         # Pattern for symbol before number (e.g., $500)
         # Match: symbol + number + optional apostrophe with suffix
-        self.patterns[symbol] = re.compile(
+        self.patterns[symbol] = LazyPattern(
             rf'{escaped_symbol}(\d+(?:[.,]\d+)?)((\'[a-zA-ZçÇğĞıİöÖşŞüÜ]+)?)'
         )
         
         # Pattern for symbol after number (e.g., 500 $)
         # Match: number + optional apostrophe with suffix + symbol
-        self.reverse_patterns[symbol] = re.compile(
+        self.reverse_patterns[symbol] = LazyPattern(
             rf'(\d+(?:[.,]\d+)?)((\'[a-zA-ZçÇğĞıİöÖşŞüÜ]+)?)\s*{escaped_symbol}'
         )
     
@@ -68,17 +97,17 @@ class SymbolConverter:
         """
         Add a new symbol-to-text mapping.
         
+        The mapping is published as a new snapshot; conversions already running
+        finish with the previous one.
+        
         Args:
             symbol (str): The symbol to convert
             text_representation (str): The text representation of the symbol
             text_after (bool): If True, the text will be placed after the number
                                (e.g., for currencies in Turkish)
         """
-        self.symbols_map[symbol] = text_representation
-        if text_after:
-            self.text_after_number.add(symbol)
-            
         self._compile_patterns(symbol)
+        self.mappings.set(symbol, (text_representation, bool(text_after)))
     
     def convert_symbol(self, text, symbol):
         """
@@ -91,15 +120,16 @@ class SymbolConverter:
         Returns:
             str: The processed text with the symbol converted to its text representation
         """
-        if symbol not in self.symbols_map:
+        mapping = self.mappings.snapshot().get(symbol)
+        if mapping is None:
             return text
             
-        text_repr = self.symbols_map[symbol]
+        text_repr, text_after = mapping
         result = text
         
         # Handle symbol before number (e.g., $500)
         pattern = self.patterns[symbol]
-        if symbol in self.text_after_number:
+        if text_after:
             # For currencies and other symbols that should have text after the number
             # Preserve any apostrophe and suffix
             result = pattern.sub(lambda m: m.group(1) + m.group(2) + ' ' + text_repr, result)
@@ -115,24 +145,113 @@ class SymbolConverter:
         
         return result
     
+    def _compile_combined_pattern(self, snapshot):
+        """
+        Get the single pattern matching all symbols of a snapshot, before and after numbers.
+        
+        Symbols are tried longest first. A symbol after a number is only matched
+        when no number follows it, since the symbol-before-number form takes
+        precedence. A symbol before a number also takes a symbol that follows
+        the number, which the per-symbol passes used to convert as well.
+        
+        Args:
+            snapshot (MappingSnapshot): The mappings to compile
+            
+        Returns:
+            tuple: (snapshot, compiled pattern, position of each symbol in the mappings)
+        """
+        compiled = self._compiled
+        if compiled is not None and compiled[0] is snapshot:
+            return compiled
+        
+        if compiled is not None and compiled[0].keys() == snapshot.keys():
+            # Only texts changed, the pattern and the order of the symbols still apply
+            compiled = (snapshot, compiled[1], compiled[2])
+        else:
+            symbols = "|".join(re.escape(symbol) for symbol in sorted(snapshot, key=len, reverse=True))
+            number = r"\d+(?:[.,]\d+)?"
+            suffix = r"(?:'[a-zA-ZçÇğĞıİöÖşŞüÜ]+)?"
+            pattern = compile_pattern(
+                rf"(?P<symbol>{symbols})(?P<number>{number})(?P<suffix>{suffix})"
+                rf"(?:(?P<space>\s*)(?P<next_symbol>{symbols})(?!\d))?"
+                rf"|(?P<reverse_number>{number})(?P<reverse_suffix>{suffix})\s*(?P<reverse_symbol>{symbols})(?!\d)",
+                keep=False,
+            )
+            compiled = (snapshot, pattern, {symbol: i for i, symbol in enumerate(snapshot)})
+        self._compiled = compiled
+        return compiled
+    
+    @staticmethod
+    def _replace_symbol(snapshot, order, match):
+        """Replace a match of the combined pattern, dispatching on the matched symbols."""
+        symbol = match.group("symbol")
+        if symbol is None:
+            # Symbol after number (e.g., 500 $)
+            text_repr = snapshot[match.group("reverse_symbol")][0]
+            return match.group("reverse_number") + match.group("reverse_suffix") + " " + text_repr
+        
+        text_repr, text_after = snapshot[symbol]
+        number = match.group("number") + match.group("suffix")
+        next_symbol = match.group("next_symbol")
+        
+        if text_after:
+            result = number + " " + text_repr
+        else:
+            result = text_repr + " " + number
+        if next_symbol is None:
+            return result
+        
+        # The number is also followed by a symbol. It used to be converted when its
+        # pass ran first, or when the text was placed before the number.
+        if order[next_symbol] < order[symbol] or not text_after:
+            return result + " " + snapshot[next_symbol][0]
+        return result + match.group("space") + next_symbol
+    
     def convert_all_symbols(self, text):
         """
         Convert all known symbols in the text to their text representation.
         
+        All symbols are matched by a single pattern, so the text is scanned once
+        regardless of the number of mappings.
+        
         Args:
             text (str): The text to process
             
         Returns:
             str: The processed text with all known symbols converted to their text representation
         """
-        result = text
-        for symbol in self.symbols_map:
-            result = self.convert_symbol(result, symbol)
-        return result
+        snapshot = self.mappings.snapshot()
+        if not snapshot:
+            return text
+        snapshot, pattern, order = self._compile_combined_pattern(snapshot)
+        return pattern.sub(partial(self._replace_symbol, snapshot, order), text)
 
 
-# Create a default instance for easy import
-default_converter = SymbolConverter()
+# Default instance used by the module functions, created on first use
+_default_converter = None
+_default_converter_lock = threading.Lock()
+
+
+def get_default_converter():
+    """
+    Get the default SymbolConverter instance, creating it on first use.
+    
+    Returns:
+        SymbolConverter: The converter used by convert_symbols and add_symbol_mapping
+    """
+    global _default_converter
+    if _default_converter is None:
+        with _default_converter_lock:
+            if _default_converter is None:
+                _default_converter = SymbolConverter()
+    return _default_converter
+
+
+@register_warmup
+def _compile_default_pattern():
+    """Compile the combined pattern of the default converter."""
+    converter = get_default_converter()
+    converter._compile_combined_pattern(converter.mappings.snapshot())
 
 
 def convert_symbols(text):
@@ -147,7 +266,7 @@ def convert_symbols(text):
     Returns:
         str: The processed text with all known symbols converted to their text representation
     """
-    return default_converter.convert_all_symbols(text)
+    return get_default_converter().convert_all_symbols(text)
 
 
 def add_symbol_mapping(symbol, text_representation, text_after=False):
@@ -163,6 +282,13 @@ def add_symbol_mapping(symbol, text_representation, text_after=False):
         text_after (bool): If True, the text will be placed after the number
                            (e.g., for currencies in Turkish)
     """
-    default_converter.add_symbol_mapping(symbol, text_representation, text_after)
+    get_default_converter().add_symbol_mapping(symbol, text_representation, text_after)
     # Also update the symbol_mappings module for persistence
     add_mapping(symbol, text_representation, text_after)
+
+
+def __getattr__(name):
+    # default_converter used to be created when this module was imported
+    if name == "default_converter":
+        return get_default_converter()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,11 @@
+import unicodedata
+
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from trnorm.istisnalar import lookup as lookup_exception
+from trnorm.symbol_mappings import SYMBOL_MAPPINGS
+
 kalin_sesliler = "aıouûâ"
 ince_sesliler = "eiöüîêô"
 sesli_harfler = kalin_sesliler + ince_sesliler
@@ -21,23 +29,20 @@ turkce_kucuk_buyuk_mapping = {v: k for k, v in turkce_buyuk_kucuk_mapping.items(
 
 turkish_hatted = {"â": "a", "Â": "A", "î": "i", "Î": "İ", "û": "u", "Û": "U"}
 
-def sapkasiz(kelime):
-    for sapka, duz in turkish_hatted.items():
-        kelime = kelime.replace(sapka, duz)
+# Translation tables built once from the mappings above, so that each conversion
+# is a single str.translate pass instead of one str.replace pass per mapping entry
+_TURKISH_LOWER_TABLE = str.maketrans(turkce_buyuk_kucuk_mapping)
+_TURKISH_UPPER_TABLE = str.maketrans(turkce_kucuk_buyuk_mapping)
+_SAPKASIZ_TABLE = str.maketrans(turkish_hatted)
 
-    return kelime
+def sapkasiz(kelime):
+    return kelime.translate(_SAPKASIZ_TABLE)
 
 def turkish_upper(kelime):
-    for kucuk, buyuk in turkce_kucuk_buyuk_mapping.items():
-        kelime = kelime.replace(kucuk, buyuk)
-
-    return kelime.upper()
+    return kelime.translate(_TURKISH_UPPER_TABLE).upper()
 
 def turkish_lower(kelime):
-    for buyuk, kucuk in turkce_buyuk_kucuk_mapping.items():
-        kelime = kelime.replace(buyuk, kucuk)
-
-    return kelime.lower()
+    return kelime.translate(_TURKISH_LOWER_TABLE).lower()
 
 
 def son_harf(kelime):
@@ -64,97 +69,242 @@ def turkish_capitalize(s):
         return s
     return turkish_upper(s[0]) + s[1:]
 
+# Separator characters to replace with spaces
+_SEPARATORS = "-/|."
+
+# Characters always removed, based on corpus analysis. Most of them also fall in the
+# Unicode punctuation and symbol categories below; the others (apostrophe-like modifier
+# letters, fractions, invisible characters) are only covered by this list.
+_PUNCTUATION = (
+    # Common punctuation (frequency > 0.01%)
+    """.,;:!?()[]{}"'_\\@#$%^&*+=<>~`"""
+    # En/em dashes, ellipsis, quotes (frequency < 0.02%)
+    """–—…'"'"""""
+    # Special characters and symbols
+    """«»‹›§¶†‡•※¿¡‼⁇‽―−′″®©™¦¬°′‴‵‶‷½¼÷"""
+    # Various apostrophe types
+    """'''`´ʹʻʼʽʿˈ"""
+    # Invisible characters (soft hyphen, tab, zero width space, word joiner, byte order mark)
+    """\u00AD\u0009\u200B\u2060\uFEFF"""
+)
+
+# Symbols that convert_symbols turns into words (e.g. currencies) are kept, so they can
+# still be converted when remove_punctuation runs first. Characters listed above win.
+_KEPT_SYMBOLS = frozenset(SYMBOL_MAPPINGS) - frozenset(_PUNCTUATION)
+
+# No punctuation or symbol characters are assigned above the supplementary multilingual plane
+_PUNCTUATION_SCAN_LIMIT = 0x20000
+
+# Translation table shared by remove_punctuation and fold, built on first use
+_PUNCTUATION_TABLE = {}
+
+def _punctuation_table() -> dict:
+    """
+    Build (once) the translation table used to remove punctuation.
+
+    Characters of the Unicode punctuation (P*) and symbol (S*) categories and the
+    characters of _PUNCTUATION are deleted, except the symbols handled by
+    convert_symbols. Space separators (Zs, e.g. no-break space) and the separator
+    characters become spaces, so a sentence needs a single translation pass.
+    """
+    if not _PUNCTUATION_TABLE:
+        table = {}
+        spaces = []
+        for code in range(_PUNCTUATION_SCAN_LIMIT):
+            char = chr(code)
+            category = unicodedata.category(char)
+            if category == "Zs":
+                spaces.append(code)
+            elif category[0] == "P" or (category[0] == "S" and char not in _KEPT_SYMBOLS):
+                table[code] = None
+        table.update((ord(char), None) for char in _PUNCTUATION)
+        table.update((code, " ") for code in spaces if code != ord(" "))
+        table.update((ord(sep), " ") for sep in _SEPARATORS)
+        _PUNCTUATION_TABLE.update(table)
+    return _PUNCTUATION_TABLE
+
 def remove_punctuation(text: str = "") -> str:
     """
     Remove punctuation marks and special characters from text while preserving
     meaningful non-Turkish characters like numbers.
-    
-    Separator characters like hyphens and slashes are replaced with spaces
-    instead of being removed to preserve word boundaries.
-    
-    Based on character frequency analysis of a large Turkish corpus.
-    
+
+    Separator characters like hyphens and slashes, as well as Unicode space
+    characters such as the no-break space, are replaced with spaces instead of
+    being removed to preserve word boundaries.
+
+    Covers the Unicode punctuation and symbol categories, plus characters found
+    by frequency analysis of a large Turkish corpus. Symbols that convert_symbols
+    turns into words (e.g. currency signs) are kept.
+
     Args:
         text (str): Input text
-        
+
     Returns:
         str: Text with punctuation removed and separators replaced with spaces
     """
-    # Separator characters to replace with spaces
-    separators = "-/|."
-    
-    # Replace separators with spaces
-    for sep in separators:
-        text = text.replace(sep, " ")
-    
-    # Punctuation and special characters to remove, based on corpus analysis
-    punctuation = (
-        # Common punctuation (frequency > 0.01%)
-        """.,;:!?()[]{}"'_\\@#$%^&*+=<>~`"""
-        # En/em dashes, ellipsis, quotes (frequency < 0.02%)
-        """–—…'"'"""""
-        # Special characters and symbols
-        """«»‹›§¶†‡•※¿¡‼⁇‽―−′″®©™¦¬°′‴‵‶‷½¼÷"""
-        # Various apostrophe types
-        """'''`´ʹʻʼʽʿˈ"""
-        # Invisible/special whitespace characters
-        """\u00A0\u00AD\u0009"""
-    )
-    
-    # Create a translation table
-    translator = str.maketrans('', '', punctuation)
-    
-    # Apply translation
-    result = text.translate(translator)
-    
+    # Replace separators and remove punctuation in a single translation pass
+    result = text.translate(_punctuation_table())
+
     # Remove multiple spaces
     return ' '.join(result.split())
 
-def ekle(kelime: str = "", ek: str = ""):
-    ekler = ["ile", "ise", "iken"]
+# Translation tables used by fold, one per combination of enabled stages
+_FOLD_TABLES = {}
 
-    if len(kelime) == 0:
-        return ""
+def _fold_table(lower: bool, dehat: bool, strip_punct: bool) -> dict:
+    """
+    Build (once per combination of options) the table used by fold.
 
-    if ek == "" or ek not in ekler:
-        raise ValueError(f"Ek {ek} not in {ekler}")
+    Every character touched by an enabled stage is mapped to the result of running
+    it through the stages in pipeline order, so the whole tail is a single translation
+    pass followed by str.lower().
+    """
+    key = (lower, dehat, strip_punct)
+    if key not in _FOLD_TABLES:
+        chars = set()
+        if lower:
+            chars.update(turkce_buyuk_kucuk_mapping)
+        if dehat:
+            chars.update(turkish_hatted)
+        if strip_punct:
+            punctuation_table = _punctuation_table()
+            chars.update(map(chr, punctuation_table))
+
+        table = {}
+        for char in chars:
+            result = char
+            if lower:
+                result = turkish_lower(result)
+            if dehat:
+                result = sapkasiz(result)
+            if strip_punct:
+                result = result.translate(punctuation_table)
+            if result != char:
+                table[ord(char)] = result
+        _FOLD_TABLES[key] = table
+    return _FOLD_TABLES[key]
+
+def fold(text: str = "", lower: bool = True, dehat: bool = True, strip_punct: bool = True) -> str:
+    """
+    Lowercase, remove hats and strip punctuation from text in a single pass.
 
-    # Beklenen girdi tek kelime ancak bazı durumlarda birden fazla kelime verilebilir
-    kelime = kelime.split(" ")[-1]
+    This is equivalent to remove_punctuation(sapkasiz(turkish_lower(text))), the tail
+    of the default normalization pipeline, but uses one translation pass and one
+    whitespace collapse instead of running the three functions one after another.
+    Each stage can be disabled.
 
-    yeni_ek = ""
+    Args:
+        text (str): Input text
+        lower (bool): Convert to lowercase with Turkish rules (turkish_lower)
+        dehat (bool): Replace hatted characters with plain ones (sapkasiz)
+        strip_punct (bool): Remove punctuation and collapse whitespace (remove_punctuation)
 
-    if sesli_ile_bitiyor(kelime):
-        yeni_ek = yeni_ek + "y"
-    
-    # Hepsi büyük harf ise ve uzunluğu <= 3 ise ek oluşturulamaz
-    if is_turkish_upper(kelime) and len(kelime) <= 3:
-        return f"{kelime} {ek}"
+    Returns:
+        str: The folded text
+    """
+    if lower and "Σ" in text:
+        # Lowercasing Greek capital sigma depends on its neighbours, which removing
+        # punctuation first could change, so lowercase before translating
+        text = turkish_lower(text)
+        lower = False
+
+    result = text.translate(_fold_table(lower, dehat, strip_punct))
+    if lower:
+        result = result.lower()
+    if strip_punct:
+        return " ".join(result.split())
+    return result
+
+# Suffixes that ekle can attach
+_EKLER = ["ile", "ise", "iken"]
+
+# Character classes used by the vowel harmony analysis, covering both cases of every vowel
+_VOWEL_CHARS = frozenset(sesli_harfler + turkish_upper(sesli_harfler))
+_BACK_VOWEL_CHARS = frozenset(kalin_sesliler + turkish_upper(kalin_sesliler))
+
+# Maximum number of words whose analysis is cached. Word frequencies are Zipfian, so a
+# modest cache serves almost every lookup of a corpus.
+ANALYSIS_CACHE_SIZE = 1 << 16
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _analyze(kelime: str) -> Tuple[bool, bool, bool, bool, str]:
+    """
+    Analyze the vowel harmony of a word for suffix attachment.
+
+    Args:
+        kelime (str): A single, non-empty word
+
+    Returns:
+        Tuple of:
+            - whether the word ends with a vowel
+            - whether the word is an uppercase abbreviation of at most 3 letters
+            - whether the word contains a vowel
+            - whether the last vowel is a back vowel (kalın sesli)
+            - the lookup form of the word in the vowel harmony exception lexicon
+
+    Raises:
+        IndexError: If the word is empty
+    """
+    vowel_final = kelime[-1] in _VOWEL_CHARS
+    last_vowel = next((harf for harf in reversed(kelime) if harf in _VOWEL_CHARS), None)
+    return (
+        vowel_final,
+        is_turkish_upper(kelime) and len(kelime) <= 3,
+        last_vowel is not None,
+        last_vowel in _BACK_VOWEL_CHARS,
+        sapkasiz(turkish_lower(kelime)),
+    )
 
+def _ekle(kelime: str, ek: str) -> str:
+    """Attach a validated suffix to a single word using its cached analysis."""
+    sesli_ile_biter, kisa_buyuk, sesli_var, kalin, duz_kucuk_kelime = _analyze(kelime)
+
+    # Hepsi büyük harf ise ve uzunluğu <= 3 ise ek oluşturulamaz
     # Kelimede sesli harf yoksa ek oluşturulamaz, "kelime + \s + ile"
-    if not any(turkish_lower(harf) in sesli_harfler for harf in kelime):
+    if kisa_buyuk or not sesli_var:
         return f"{kelime} {ek}"
-    
-    if ek == "iken":
-        yeni_ek = yeni_ek + "ken"
-        return f"{kelime}{yeni_ek}"
 
-    duz_kucuk_kelime = sapkasiz(turkish_lower(kelime))
+    yeni_ek = "y" if sesli_ile_biter else ""
 
-    from trnorm.istisnalar import ek_istisnalar_unlu_uyumu, suffix_tuple
+    if ek == "iken":
+        return f"{kelime}{yeni_ek}ken"
 
-    if duz_kucuk_kelime in ek_istisnalar_unlu_uyumu.keys():
+    # The lexicon can change at runtime, so it is not part of the cached analysis
+    istisna = lookup_exception(duz_kucuk_kelime)
+    if istisna is not None:
         # Use index 0 for "ile" and index 1 for "ise"
-        if ek == "ile":
-            return f"{kelime}{ek_istisnalar_unlu_uyumu[duz_kucuk_kelime][0]}"
-        else:  # ek == "ise"
-            return f"{kelime}{ek_istisnalar_unlu_uyumu[duz_kucuk_kelime][1]}"
+        return f"{kelime}{istisna[0] if ek == 'ile' else istisna[1]}"
+
+    return f"{kelime}{yeni_ek}{ek[1]}{'a' if kalin else 'e'}"
 
-    yeni_ek = yeni_ek + ek[1]
+def ekle(kelime: str = "", ek: str = ""):
+    if len(kelime) == 0:
+        return ""
+
+    if ek == "" or ek not in _EKLER:
+        raise ValueError(f"Ek {ek} not in {_EKLER}")
+
+    # Beklenen girdi tek kelime ancak bazı durumlarda birden fazla kelime verilebilir
+    return _ekle(kelime.split(" ")[-1], ek)
+
+def ekle_many(kelimeler: Iterable[str], ek: str = "") -> List[str]:
+    """
+    Attach the same suffix to many words, as ekle does for each of them.
+
+    The suffix is validated once, and the vowel harmony analysis of repeated
+    words is served from the cache.
+
+    Args:
+        kelimeler (Iterable[str]): Words to attach the suffix to
+        ek (str): The suffix, one of "ile", "ise" and "iken"
 
-    if son_sesli_harf_kalin(kelime):
-        yeni_ek = yeni_ek + "a"
-    else:
-        yeni_ek = yeni_ek + "e"
+    Returns:
+        List[str]: The words with the suffix attached, in input order
+
+    Raises:
+        ValueError: If the suffix is not supported
+    """
+    if ek == "" or ek not in _EKLER:
+        raise ValueError(f"Ek {ek} not in {_EKLER}")
 
-    return f"{kelime}{yeni_ek}"
+    return [_ekle(kelime.split(" ")[-1], ek) if kelime else "" for kelime in kelimeler]
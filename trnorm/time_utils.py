@@ -5,7 +5,20 @@ This module provides functions to convert time expressions to their full text
 representations in Turkish before applying number-to-text conversion.
 """
 
-import re
+from trnorm.patterns import lazy_pattern
+
+# Pattern for times with "saat" prefix (e.g., "saat 22.00", "saat 9:45")
+# Group 1: "saat" prefix
+# Group 2: Hours
+# Group 3: Separator (. or :)
+# Group 4: Minutes
+_SAAT_PATTERN = lazy_pattern(r"(\bsaat\s+)(\d{1,2})([\.:])(\d{2})\b")
+
+# Pattern for standalone times (e.g., "22.00", "9:45")
+# Group 1: Hours
+# Group 2: Separator (. or :)
+# Group 3: Minutes
+_TIME_PATTERN = lazy_pattern(r"\b(\d{1,2})([\.:])(\d{2})\b")
 
 def normalize_times(text):
     """
@@ -25,19 +38,6 @@ def normalize_times(text):
     Returns:
         str: The text with time expressions converted to their text representations
     """
-    # Pattern for times with "saat" prefix (e.g., "saat 22.00", "saat 9:45")
-    # Group 1: "saat" prefix
-    # Group 2: Hours
-    # Group 3: Separator (. or :)
-    # Group 4: Minutes
-    saat_pattern = r'(\bsaat\s+)(\d{1,2})([\.:])(\d{2})\b'
-    
-    # Pattern for standalone times (e.g., "22.00", "9:45")
-    # Group 1: Hours
-    # Group 2: Separator (. or :)
-    # Group 3: Minutes
-    time_pattern = r'\b(\d{1,2})([\.:])(\d{2})\b'
-    
     # Process times with "saat" prefix first
     def replace_saat_time(match):
         saat_prefix = match.group(1)  # "saat "
@@ -57,7 +57,7 @@ def normalize_times(text):
         return f"{saat_prefix}{hours} {minutes}"
     
     # First process times with "saat" prefix
-    processed_text = re.sub(saat_pattern, replace_saat_time, text)
+    processed_text = _SAAT_PATTERN.sub(replace_saat_time, text)
     
     # Then process standalone times that might be time expressions
     # This is more complex as we need to determine if it's actually a time
@@ -89,4 +89,4 @@ def normalize_times(text):
         return match.group(0)
     
     # Process standalone times
-    return re.sub(time_pattern, replace_standalone_time, processed_text)
+    return _TIME_PATTERN.sub(replace_standalone_time, processed_text)
@@ -3,14 +3,24 @@ Utilities for handling unit abbreviations in Turkish text.
 
 This module provides functions to convert unit abbreviations to their full text
 representations in Turkish.
+
+The translations are kept as immutable, versioned snapshots (see
+trnorm.snapshots). Units added at runtime with add_unit_translation(s) are
+published as a new snapshot, so conversions running in other threads are not
+affected by the update.
 """
 
 import re
 
+from typing import Dict, Iterable, NamedTuple, Optional, Pattern
+
+from trnorm.patterns import compile_pattern, register_warmup
+from trnorm.snapshots import MappingSnapshot, VersionedMapping
+
 # TODO: 16.yy'da 
 
-# Dictionary of unit translations
-unit_translations = {
+# Built-in unit translations
+DEFAULT_UNIT_TRANSLATIONS = {
     "cc": "santilitre",
     "mm": "milimetre",
     "cm": "santimetre",
@@ -66,6 +76,108 @@ unit_translations = {
     "mmHg": "milimetre civa"
 }
 
+# Registry of the current unit translations, starting with the built-in ones
+unit_registry = VersionedMapping(DEFAULT_UNIT_TRANSLATIONS)
+
+def get_unit_translations() -> MappingSnapshot:
+    """
+    Get the current unit translations.
+    
+    Returns:
+        MappingSnapshot: Read-only snapshot of the unit translations, with its version
+    """
+    return unit_registry.snapshot()
+
+def add_unit_translation(unit: str, text: str) -> MappingSnapshot:
+    """
+    Add or replace a unit translation.
+    
+    Args:
+        unit (str): The unit abbreviation (e.g., 'nm')
+        text (str): Its full text representation (e.g., 'nanometre')
+        
+    Returns:
+        MappingSnapshot: The published snapshot
+    """
+    return unit_registry.set(unit, text)
+
+def add_unit_translations(translations: Dict[str, str]) -> MappingSnapshot:
+    """
+    Add or replace several unit translations at once, as a single new snapshot.
+    
+    Args:
+        translations (Dict[str, str]): Unit abbreviations mapped to their full text representations
+        
+    Returns:
+        MappingSnapshot: The published snapshot
+    """
+    return unit_registry.update(translations)
+
+def longest_match_pattern(units: Iterable[str]) -> str:
+    """
+    Build a regex that matches any of the given units, preferring the longest one.
+    
+    The units are arranged in a trie and the trie is written as nested groups,
+    e.g. "k(?:g|m(?:/(?:h|s))?)". At each position the regex engine follows a
+    single path instead of trying every unit in turn, and longer units are tried
+    before their prefixes, like an alternation sorted by length.
+    
+    Args:
+        units (Iterable[str]): The units
+        
+    Returns:
+        str: The regex, without capturing groups
+    """
+    trie = {}
+    for unit in units:
+        node = trie
+        for char in unit:
+            node = node.setdefault(char, {})
+        node[None] = True  # A unit ends here
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char is not None]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Where a unit ends but longer ones continue, the continuation is optional (greedy)
+        return f"(?:{body})?" if None in node else body
+    
+    return build(trie) or "(?!)"
+
+class UnitPatterns(NamedTuple):
+    """Patterns compiled from one snapshot of the unit translations."""
+    translations: MappingSnapshot
+    # Longest-match regex source of the units, shared with trnorm.dimension_utils
+    units: str
+    # Pattern used by normalize_units
+    normalize: Pattern
+
+# Patterns of the latest snapshot, replaced when the translations change
+_unit_patterns: Optional[UnitPatterns] = None
+
+@register_warmup
+def get_unit_patterns() -> UnitPatterns:
+    """
+    Get the unit patterns of the current translations, compiling them only after a change.
+    
+    Returns:
+        UnitPatterns: The patterns and the snapshot they were built from
+    """
+    global _unit_patterns
+    snapshot = unit_registry.snapshot()
+    patterns = _unit_patterns
+    if patterns is None or patterns.translations is not snapshot:
+        units = longest_match_pattern(snapshot)
+        # Pattern for units with or without spaces before them, and with or without periods after them
+        # Group 1: Space or digit before the unit
+        # Group 2: The unit itself
+        # Group 3: Period (optional) followed by word boundary
+        normalize = compile_pattern(r"((?:\s+)|(?<=\d))(" + units + r")(\.?)(\b)", keep=False)
+        patterns = UnitPatterns(snapshot, units, normalize)
+        _unit_patterns = patterns
+    return patterns
+
 def normalize_units(text):
     """
     Normalize unit abbreviations in text to their full text representations.
@@ -86,16 +198,9 @@ def normalize_units(text):
     Returns:
         str: The text with unit abbreviations replaced by their full text representations
     """
-    # Create a regex pattern for all unit abbreviations
-    # Sort by length (longest first) to avoid partial matches
-    sorted_units = sorted(unit_translations.keys(), key=len, reverse=True)
-    unit_pattern = '|'.join([re.escape(unit) for unit in sorted_units])
-    
-    # Pattern for units with or without spaces before them, and with or without periods after them
-    # Group 1: Space or digit before the unit
-    # Group 2: The unit itself
-    # Group 3: Period (optional) followed by word boundary
-    pattern = r'((?:\s+)|(?<=\d))(' + unit_pattern + r')(\.?)(\b)'
+    # Use the same snapshot for the pattern and the replacements
+    patterns = get_unit_patterns()
+    unit_translations = patterns.translations
     
     def replace_unit(match):
         prefix = match.group(1)
@@ -116,4 +221,11 @@ def normalize_units(text):
         return match.group(0)
     
     # Apply the replacement
-    return re.sub(pattern, replace_unit, text)
+    return patterns.normalize.sub(replace_unit, text)
+
+def __getattr__(name):
+    # unit_translations used to be a mutable dict in this module. It is now the
+    # current snapshot, read-only; use add_unit_translation(s) to change it.
+    if name == "unit_translations":
+        return unit_registry.snapshot()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")